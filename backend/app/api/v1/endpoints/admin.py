@@ -3,10 +3,26 @@ import subprocess
 import sys
 from pathlib import Path
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
 
+from ....core.bulkheads import BulkheadRegistry
 from ....core.config import PROJECT_ROOT, get_settings
-from ..schemas.admin import StopProjectResponse
+from ....core.draining import DrainController
+from ....core.live_events import LiveBroadcaster
+from ....core.request_metrics import RequestMetrics
+from ....core.settings_provider import SettingsProvider
+from ....core.user_agents import UserAgentParser
+from ..schemas.admin import (
+    BulkheadStats,
+    BulkheadStatsResponse,
+    DrainStatusResponse,
+    LiveStreamStats,
+    RequestStatsResponse,
+    RouteRequestStats,
+    SettingsReloadResponse,
+    StopProjectResponse,
+    UserAgentCacheStats,
+)
 
 router = APIRouter(tags=["admin"])
 logger = logging.getLogger("backend.api.admin")
@@ -23,12 +39,17 @@ def _request_project_shutdown() -> None:
         return
 
     creationflags = 0
+    start_new_session = False
     if sys.platform == "win32":
         creationflags = (
             subprocess.CREATE_NO_WINDOW
             | subprocess.CREATE_NEW_PROCESS_GROUP
             | getattr(subprocess, "DETACHED_PROCESS", 0)
         )
+    else:
+        # dev_down signals the backend's whole process group; inside that
+        # group it would kill itself before it got to the frontend.
+        start_new_session = True
 
     subprocess.Popen(
         [sys.executable, str(script_path)],
@@ -36,21 +57,28 @@ def _request_project_shutdown() -> None:
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         creationflags=creationflags,
+        start_new_session=start_new_session,
     )
 
 
+def _require_development(blocked_event: str, detail: str) -> None:
+    """403 outside development: these endpoints have no authentication."""
+    app_env = get_settings().app_env
+    if app_env.lower() != "development":
+        logger.warning(blocked_event + " | environment=%s", app_env)
+        raise HTTPException(status_code=403, detail=detail)
+
+
 @router.post("/admin/stop-project", response_model=StopProjectResponse)
 async def stop_project(background_tasks: BackgroundTasks) -> StopProjectResponse:
     settings = get_settings()
     logger.debug(
         "admin.stop_project.request.received | environment=%s", settings.app_env
     )
-
-    if settings.app_env.lower() != "development":
-        logger.warning("admin.stop_project.blocked | environment=%s", settings.app_env)
-        raise HTTPException(
-            status_code=403, detail="Project shutdown is allowed only in development"
-        )
+    _require_development(
+        "admin.stop_project.blocked",
+        "Project shutdown is allowed only in development",
+    )
 
     background_tasks.add_task(_request_project_shutdown)
     logger.warning("admin.stop_project.requested | environment=%s", settings.app_env)
@@ -58,3 +86,77 @@ async def stop_project(background_tasks: BackgroundTasks) -> StopProjectResponse
         status="stopping",
         message="Stop command accepted. Backend and frontend shutdown requested.",
     )
+
+
+@router.get("/admin/request-stats", response_model=RequestStatsResponse)
+async def request_stats(request: Request) -> RequestStatsResponse:
+    metrics: RequestMetrics = request.app.state.request_metrics
+    routes = [RouteRequestStats(**entry) for entry in metrics.snapshot()]
+    logger.debug("admin.request_stats.provided | routes=%s", len(routes))
+    return RequestStatsResponse(sample_rate=metrics.sample_rate, routes=routes)
+
+
+@router.get("/admin/bulkheads", response_model=BulkheadStatsResponse)
+async def bulkhead_stats(request: Request) -> BulkheadStatsResponse:
+    registry: BulkheadRegistry = request.app.state.bulkheads
+    groups = [BulkheadStats(**entry) for entry in registry.snapshot()]
+    logger.debug("admin.bulkheads.provided | groups=%s", len(groups))
+    return BulkheadStatsResponse(groups=groups)
+
+
+@router.get("/admin/user-agent-cache", response_model=UserAgentCacheStats)
+async def user_agent_cache_stats(request: Request) -> UserAgentCacheStats:
+    parser: UserAgentParser = request.app.state.user_agents
+    return UserAgentCacheStats(**parser.snapshot())
+
+
+@router.get("/admin/live", response_model=LiveStreamStats)
+async def live_stream_stats(request: Request) -> LiveStreamStats:
+    broadcaster: LiveBroadcaster = request.app.state.live
+    return LiveStreamStats(**broadcaster.snapshot())
+
+
+@router.post("/admin/drain", response_model=DrainStatusResponse, status_code=202)
+async def start_drain(request: Request, response: Response) -> DrainStatusResponse:
+    # Elsewhere a drain is started with DRAIN_SIGNAL by whoever runs the worker.
+    _require_development(
+        "admin.drain.blocked",
+        "Starting a drain over HTTP is allowed only in development",
+    )
+    drain: DrainController = request.app.state.drain
+    if not drain.begin(reason="admin"):
+        logger.info("admin.drain.already_started | state=%s", drain.state)
+        response.status_code = 200
+    return DrainStatusResponse(**drain.snapshot())
+
+
+@router.get("/admin/drain", response_model=DrainStatusResponse)
+async def drain_status(request: Request) -> DrainStatusResponse:
+    drain: DrainController = request.app.state.drain
+    logger.debug(
+        "admin.drain_status.provided | state=%s | in_flight=%s",
+        drain.state,
+        drain.in_flight,
+    )
+    return DrainStatusResponse(**drain.snapshot())
+
+
+@router.post("/admin/settings/reload", response_model=SettingsReloadResponse)
+async def reload_settings(request: Request) -> SettingsReloadResponse:
+    # Elsewhere SETTINGS_RELOAD_SIGNAL and the .env watcher trigger reloads.
+    _require_development(
+        "admin.settings_reload.blocked",
+        "Reloading settings over HTTP is allowed only in development",
+    )
+    provider: SettingsProvider = request.app.state.settings
+    try:
+        result = provider.reload(reason="admin")
+    except ValueError as exc:
+        logger.warning("admin.settings_reload.rejected | error=%s", exc)
+        raise HTTPException(status_code=422, detail=f"Invalid settings: {exc}") from exc
+    return SettingsReloadResponse(
+        version=result.version,
+        reason=result.reason,
+        changed=list(result.changed),
+        requires_restart=list(result.requires_restart),
+    )
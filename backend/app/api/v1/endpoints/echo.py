@@ -1,7 +1,9 @@
 import logging
+from typing import Literal
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
+from ....core.echo_stream import EchoStreamResponse, EchoStreamSummary
 from ..schemas.echo import EchoRequest, EchoResponse
 
 router = APIRouter(tags=["echo"])
@@ -10,9 +12,37 @@ logger = logging.getLogger("backend.api.echo")
 
 @router.post("/echo", response_model=EchoResponse)
 async def echo(payload: EchoRequest) -> EchoResponse:
-    logger.debug("echo.request.received | message=%s", payload.message)
+    logger.debug("echo.request.received | length=%s", len(payload.message))
     response = EchoResponse(echoed=payload.message, length=len(payload.message))
+    logger.info("echo.processed | length=%s", response.length)
+    return response
+
+
+def _log_stream_summary(summary: EchoStreamSummary) -> None:
     logger.info(
-        "echo.processed | echoed=%s | length=%s", response.echoed, response.length
+        "echo.stream.completed | bytes=%s | chunks=%s | max_chunk_bytes=%s | "
+        "checksum=%s | duration_ms=%.2f | mb_per_s=%.2f | client_disconnected=%s",
+        summary.bytes_total,
+        summary.chunks,
+        summary.max_chunk_bytes,
+        summary.checksum or "-",
+        summary.duration_ms,
+        summary.mb_per_s,
+        summary.client_disconnected,
+    )
+
+
+@router.post("/echo/stream", response_class=EchoStreamResponse)
+async def echo_stream(
+    request: Request, checksum: Literal["crc32", "sha256"] | None = None
+) -> EchoStreamResponse:
+    logger.debug(
+        "echo.stream.started | content_length=%s | checksum=%s",
+        request.headers.get("content-length", "-"),
+        checksum or "-",
+    )
+    return EchoStreamResponse(
+        checksum=checksum,
+        on_complete=_log_stream_summary,
+        media_type=request.headers.get("content-type", "application/octet-stream"),
     )
-    return response
@@ -0,0 +1,38 @@
+import logging
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from ....core.live_events import TOPICS, LiveBroadcaster, LiveEventResponse
+
+router = APIRouter(tags=["live"])
+logger = logging.getLogger("backend.api.live")
+
+
+@router.get("/live", response_class=LiveEventResponse)
+async def live_events(
+    request: Request,
+    topics: Annotated[
+        list[Literal["time", "status"]] | None,
+        Query(description="Topics to receive; all when omitted"),
+    ] = None,
+) -> LiveEventResponse:
+    broadcaster: LiveBroadcaster = request.app.state.live
+    subscriber = broadcaster.subscribe(topics or TOPICS)
+    if subscriber is None:
+        logger.warning(
+            "live.subscribe.rejected | subscribers=%s | accepting=%s",
+            len(broadcaster.subscribers),
+            broadcaster.accepting,
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="Live event stream is at capacity",
+            headers={"Retry-After": "5"},
+        )
+    logger.debug(
+        "live.subscribed | topics=%s | subscribers=%s",
+        ",".join(sorted(subscriber.topics)),
+        len(broadcaster.subscribers),
+    )
+    return LiveEventResponse(broadcaster, subscriber)
@@ -1,7 +1,8 @@
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
+from ....core.user_agents import UserAgentParser
 from ..schemas.logs import FrontendLogRequest, FrontendLogResponse
 
 router = APIRouter(tags=["logs"])
@@ -9,21 +10,34 @@ logger = logging.getLogger("frontend.client")
 
 
 @router.post("/logs/frontend", response_model=FrontendLogResponse)
-async def ingest_frontend_log(payload: FrontendLogRequest) -> FrontendLogResponse:
+async def ingest_frontend_log(
+    payload: FrontendLogRequest, request: Request
+) -> FrontendLogResponse:
     logger.debug(
         "frontend.log.received | level=%s | event=%s | page_path=%s",
         payload.level,
         payload.event,
         payload.page_path,
     )
+    # The browser-reported value wins; the header covers clients that omit it
+    # and is cut to the same length the schema allows.
+    user_agents: UserAgentParser = request.app.state.user_agents
+    agent = user_agents.parse(
+        payload.user_agent or request.headers.get("user-agent", "")[:500]
+    )
     log_method = getattr(logger, payload.level)
     log_method(
         "frontend.log.event | event=%s | message=%s | "
-        "page_path=%s | details=%s | trace_id=%s",
+        "page_path=%s | details=%s | trace_id=%s | "
+        "browser=%s | browser_version=%s | os=%s | device=%s",
         payload.event,
         payload.message,
         payload.page_path,
         payload.details,
         payload.trace_id,
+        agent.browser,
+        agent.browser_version,
+        agent.os,
+        agent.device,
     )
     return FrontendLogResponse(status="accepted")
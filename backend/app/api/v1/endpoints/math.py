@@ -1,8 +1,17 @@
 import logging
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
-from ..schemas.math import MathAddQuery, MathAddResponse
+from ....core.bulkheads import run_in_bulkhead_threadpool
+from ....core.config import get_settings
+from ....core.deadlines import remaining_budget_ms
+from ....core.expressions import ExpressionCache, ExpressionError, ExpressionTooLarge
+from ..schemas.math import (
+    MathAddQuery,
+    MathAddResponse,
+    MathEvalRequest,
+    MathEvalResponse,
+)
 
 router = APIRouter(tags=["math"])
 logger = logging.getLogger("backend.api.math")
@@ -23,3 +32,49 @@ async def math_add(
         response.result,
     )
     return response
+
+
+@router.post("/math/eval", response_model=MathEvalResponse)
+async def math_eval(payload: MathEvalRequest, request: Request) -> MathEvalResponse:
+    logger.debug(
+        "math.eval.request.received | expression=%s | variables=%s",
+        payload.expression,
+        ",".join(sorted(payload.variables)),
+    )
+    settings = get_settings()
+    # Cancelling the request cannot stop the worker thread, so the evaluation
+    # also stops itself once the request deadline would have passed.
+    cpu_budget_ms = settings.math_eval_cpu_budget_ms
+    remaining_ms = remaining_budget_ms()
+    if remaining_ms is not None:
+        cpu_budget_ms = min(cpu_budget_ms, remaining_ms)
+    expression_cache: ExpressionCache = request.app.state.expression_cache
+    try:
+        plan, cached = expression_cache.get_or_compile(payload.expression)
+        result = await run_in_bulkhead_threadpool(
+            plan.evaluate,
+            payload.variables,
+            max_elements=settings.math_eval_max_elements,
+            cpu_budget_ms=cpu_budget_ms,
+        )
+    except ExpressionTooLarge as exc:
+        logger.warning(
+            "math.eval.rejected | expression=%s | reason=%s", payload.expression, exc
+        )
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ExpressionError as exc:
+        logger.warning(
+            "math.eval.rejected | expression=%s | reason=%s", payload.expression, exc
+        )
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    size = len(result) if isinstance(result, list) else 1
+    logger.info(
+        "math.eval.executed | expression=%s | size=%s | cached=%s",
+        payload.expression,
+        size,
+        cached,
+    )
+    return MathEvalResponse(
+        expression=payload.expression, result=result, size=size, cached=cached
+    )
@@ -0,0 +1,47 @@
+import logging
+
+from fastapi import APIRouter, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+
+from ....core.client_telemetry import ClientTelemetry
+from ....core.request_metrics import RequestMetrics
+from ..schemas.telemetry import (
+    FrontendTelemetryBatch,
+    FrontendTelemetryResponse,
+    FrontendTelemetrySummary,
+)
+
+router = APIRouter(tags=["telemetry"])
+logger = logging.getLogger("backend.api.telemetry")
+
+
+@router.post(
+    "/telemetry/frontend", response_model=FrontendTelemetryResponse, status_code=202
+)
+async def ingest_frontend_telemetry(request: Request) -> FrontendTelemetryResponse:
+    # The browser sends batches as text/plain (a CORS "simple" request, so no
+    # preflight and usable from sendBeacon); the body is JSON regardless.
+    try:
+        batch = FrontendTelemetryBatch.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+    telemetry: ClientTelemetry = request.app.state.client_telemetry
+    navigation = batch.navigation.model_dump() if batch.navigation is not None else {}
+    recorded = telemetry.record_batch(
+        batch.page_path, navigation, batch.resources, batch.api
+    )
+    logger.debug(
+        "telemetry.batch.recorded | page_path=%s | timings=%s",
+        batch.page_path,
+        recorded,
+    )
+    return FrontendTelemetryResponse(status="accepted", recorded=recorded)
+
+
+@router.get("/telemetry/frontend", response_model=FrontendTelemetrySummary)
+async def frontend_telemetry_summary(request: Request) -> FrontendTelemetrySummary:
+    telemetry: ClientTelemetry = request.app.state.client_telemetry
+    metrics: RequestMetrics = request.app.state.request_metrics
+    return FrontendTelemetrySummary(**telemetry.snapshot(metrics.latency_snapshot()))
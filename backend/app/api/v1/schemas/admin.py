@@ -1,6 +1,91 @@
 from pydantic import BaseModel
 
+from .telemetry import LatencySummary
+
 
 class StopProjectResponse(BaseModel):
     status: str
     message: str
+
+
+class RouteRequestStats(BaseModel):
+    route: str
+    count: int
+    errors: int
+    avg_duration_ms: float
+    max_duration_ms: float
+    p95_duration_ms: float | None
+    avg_cpu_ms: float
+    avg_wait_ms: float
+    total_bytes_in: int
+    total_bytes_out: int
+    max_alloc_peak_kb: float | None
+    avg_log_records: float
+
+
+class RequestStatsResponse(BaseModel):
+    sample_rate: float
+    routes: list[RouteRequestStats]
+
+
+class DrainStatusResponse(BaseModel):
+    state: str
+    reason: str | None
+    in_flight: int
+    in_flight_at_start: int
+    completed_while_draining: int
+    rejected_while_draining: int
+    abandoned: int
+    elapsed_ms: float
+    timeout_seconds: float
+    remaining_seconds: float | None
+
+
+class SettingsReloadResponse(BaseModel):
+    version: int
+    reason: str
+    changed: list[str]
+    requires_restart: list[str]
+
+
+class BulkheadStats(BaseModel):
+    group: str
+    max_concurrent: int
+    max_queue: int
+    queue_timeout_ms: float
+    max_threads: int
+    active: int
+    waiting: int
+    threads_busy: int
+    peak_active: int
+    peak_waiting: int
+    admitted: int
+    queued: int
+    rejected_full: int
+    rejected_timeout: int
+    saturation_ratio: float
+    queue_ms: LatencySummary
+
+
+class BulkheadStatsResponse(BaseModel):
+    groups: list[BulkheadStats]
+
+
+class UserAgentCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class LiveStreamStats(BaseModel):
+    subscribers: int
+    peak_subscribers: int
+    max_subscribers: int
+    rejected: int
+    events_published: int
+    chunks_dropped: int
+    slow_disconnects: int
+    slow_consumer: str
+    client_buffer: int
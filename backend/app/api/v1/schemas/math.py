@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class MathAddQuery(BaseModel):
@@ -12,3 +14,20 @@ class MathAddResponse(BaseModel):
     a: float
     b: float
     result: float
+
+
+MathVariable = float | Annotated[list[float], Field(max_length=100_000)]
+
+
+class MathEvalRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    expression: str = Field(min_length=1, max_length=500)
+    variables: dict[str, MathVariable] = Field(default_factory=dict, max_length=32)
+
+
+class MathEvalResponse(BaseModel):
+    expression: str
+    result: float | list[float]
+    size: int
+    cached: bool
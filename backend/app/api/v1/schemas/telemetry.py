@@ -0,0 +1,73 @@
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Anything slower than ten minutes is a broken clock, not a latency.
+DurationMs = Annotated[float, Field(ge=0, le=600_000)]
+
+
+class NavigationTimings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    ttfb: DurationMs | None = None
+    dom_content_loaded: DurationMs | None = None
+    load: DurationMs | None = None
+
+
+ResourceTiming = tuple[Annotated[str, Field(max_length=32)], DurationMs]
+ApiCallTiming = tuple[
+    Annotated[str, Field(min_length=1, max_length=10)],
+    Annotated[str, Field(min_length=1, max_length=200)],
+    Annotated[int, Field(ge=0, le=599)],
+    DurationMs,
+]
+
+
+class FrontendTelemetryBatch(BaseModel):
+    """Compact batch: resources are `[initiator, ms]` and API calls are
+    `[method, path, status, ms]`."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    page_path: str = Field(min_length=1, max_length=200)
+    navigation: NavigationTimings | None = None
+    resources: list[ResourceTiming] = Field(default_factory=list, max_length=200)
+    api: list[ApiCallTiming] = Field(default_factory=list, max_length=200)
+
+
+class FrontendTelemetryResponse(BaseModel):
+    status: str
+    recorded: int
+
+
+class LatencySummary(BaseModel):
+    count: int
+    avg_ms: float | None
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    max_ms: float
+
+
+class PageLatency(BaseModel):
+    page: str
+    metrics: dict[str, LatencySummary]
+
+
+class ServerLatency(BaseModel):
+    count: int
+    avg_ms: float
+    p95_ms: float | None
+
+
+class EndpointLatency(BaseModel):
+    endpoint: str
+    errors: int
+    client: LatencySummary
+    server: ServerLatency | None
+
+
+class FrontendTelemetrySummary(BaseModel):
+    batches: int
+    pages: list[PageLatency]
+    endpoints: list[EndpointLatency]
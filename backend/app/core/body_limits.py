@@ -0,0 +1,230 @@
+import json
+import logging
+import re
+from collections.abc import Callable, Mapping
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("backend.http")
+
+_JSON_TOKENS = re.compile(rb'[\\"{}\[\]:,]')
+_BACKSLASH = ord("\\")
+_QUOTE = ord('"')
+_OPEN_OBJECT = ord("{")
+_OPEN_ARRAY = ord("[")
+_CLOSE_OBJECT = ord("}")
+_CLOSE_ARRAY = ord("]")
+_COLON = ord(":")
+_COMMA = ord(",")
+_MAX_KEY_CAPTURE = 64
+
+
+class JsonLimitExceeded(ValueError):
+    pass
+
+
+def _decode_key(raw: bytes) -> bytes:
+    # The parser decodes escapes, so "detail\u0073" has to match "details"
+    # here too. A capture cut short cannot decode, but at _MAX_KEY_CAPTURE
+    # raw bytes it is also too long to be any field name the guard protects.
+    if _BACKSLASH not in raw:
+        return raw
+    try:
+        return str(json.loads(b'"' + raw + b'"')).encode("utf-8")
+    except ValueError:
+        return raw
+
+
+class JsonStructureGuard:
+    # Scans raw JSON bytes chunk by chunk and enforces depth, key count and
+    # byte size on one top-level field without building any Python objects.
+    # Malformed JSON is left for the real parser to reject.
+    def __init__(
+        self, *, field: str, max_depth: int, max_keys: int, max_bytes: int
+    ) -> None:
+        self._field = field.encode("utf-8")
+        self._max_depth = max_depth
+        self._max_keys = max_keys
+        self._max_bytes = max_bytes
+        self._stack: list[int] = []
+        self._offset = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._capturing_key = False
+        self._key_buffer = bytearray()
+        self._last_key = b""
+        self._field_start: int | None = None
+        self._field_keys = 0
+
+    def _end_field(self, position: int) -> None:
+        if self._field_start is None:
+            return
+        self._check_field_size(position)
+        self._field_start = None
+
+    def _check_field_size(self, position: int) -> None:
+        if self._field_start is None:
+            return
+        if position - self._field_start > self._max_bytes:
+            raise JsonLimitExceeded(
+                f"'{self._field.decode()}' exceeds {self._max_bytes} bytes"
+            )
+
+    def _capture_key(self, fragment: bytes) -> None:
+        remaining = _MAX_KEY_CAPTURE - len(self._key_buffer)
+        if remaining > 0:
+            self._key_buffer.extend(fragment[:remaining])
+
+    def feed(self, chunk: bytes) -> None:
+        skip_until = 0
+        if self._escape and chunk:
+            self._escape = False
+            skip_until = 1
+        key_start = 0
+
+        for match in _JSON_TOKENS.finditer(chunk):
+            position = match.start()
+            if position < skip_until:
+                continue
+            char = chunk[position]
+
+            if self._in_string:
+                if char == _BACKSLASH:
+                    skip_until = position + 2
+                    if skip_until > len(chunk):
+                        self._escape = True
+                elif char == _QUOTE:
+                    self._in_string = False
+                    if self._capturing_key:
+                        self._capture_key(chunk[key_start:position])
+                        self._capturing_key = False
+                        self._last_key = _decode_key(bytes(self._key_buffer))
+                continue
+
+            if char == _QUOTE:
+                self._in_string = True
+                if len(self._stack) == 1 and self._expect_key:
+                    self._capturing_key = True
+                    self._key_buffer.clear()
+                    key_start = position + 1
+            elif char == _OPEN_OBJECT or char == _OPEN_ARRAY:
+                self._stack.append(char)
+                if len(self._stack) - 1 > self._max_depth:
+                    raise JsonLimitExceeded(
+                        f"'{self._field.decode()}' exceeds depth {self._max_depth}"
+                    )
+                self._expect_key = char == _OPEN_OBJECT
+            elif char == _CLOSE_OBJECT or char == _CLOSE_ARRAY:
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self._end_field(self._offset + position)
+            elif char == _COLON:
+                self._expect_key = False
+                if len(self._stack) == 1:
+                    if self._last_key == self._field:
+                        self._field_start = self._offset + position + 1
+                elif self._field_start is not None:
+                    self._field_keys += 1
+                    if self._field_keys > self._max_keys:
+                        raise JsonLimitExceeded(
+                            f"'{self._field.decode()}' exceeds "
+                            f"{self._max_keys} keys"
+                        )
+            elif char == _COMMA:
+                in_object = bool(self._stack) and self._stack[-1] == _OPEN_OBJECT
+                self._expect_key = in_object
+                if len(self._stack) == 1:
+                    self._end_field(self._offset + position)
+
+        if self._capturing_key:
+            self._capture_key(chunk[key_start:])
+        self._offset += len(chunk)
+        self._check_field_size(self._offset)
+
+
+def _body_too_large(limit: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=413,
+        content={"detail": f"Request body exceeds {limit} bytes"},
+    )
+
+
+class RequestBodyLimitMiddleware:
+    # A route limit of 0 disables the size check for that path.
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_bytes: int,
+        route_limits: Mapping[str, int],
+        json_guards: Mapping[str, Callable[[], JsonStructureGuard]],
+    ) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.route_limits = dict(route_limits)
+        self.json_guards = dict(json_guards)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        limit = self.route_limits.get(path, self.max_bytes)
+        content_length = Headers(scope=scope).get("content-length")
+        if (
+            limit > 0
+            and content_length is not None
+            and content_length.isdigit()
+            and int(content_length) > limit
+        ):
+            logger.warning(
+                "http.request.body_rejected | path=%s | limit_bytes=%s | "
+                "content_length=%s",
+                path,
+                limit,
+                content_length,
+            )
+            await _body_too_large(limit)(scope, receive, send)
+            return
+
+        guard_factory = self.json_guards.get(path)
+        guard = guard_factory() if guard_factory is not None else None
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+
+            body = message.get("body", b"")
+            received += len(body)
+            if limit > 0 and received > limit:
+                logger.warning(
+                    "http.request.body_rejected | path=%s | limit_bytes=%s | "
+                    "received_bytes=%s",
+                    path,
+                    limit,
+                    received,
+                )
+                raise HTTPException(
+                    status_code=413, detail=f"Request body exceeds {limit} bytes"
+                )
+            if guard is not None:
+                try:
+                    guard.feed(body)
+                except JsonLimitExceeded as exc:
+                    logger.warning(
+                        "http.request.body_rejected | path=%s | reason=%s",
+                        path,
+                        exc,
+                    )
+                    raise HTTPException(status_code=422, detail=str(exc)) from exc
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,250 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .histograms import LatencyHistogram
+
+logger = logging.getLogger("backend.bulkhead")
+
+_current_bulkhead: contextvars.ContextVar["Bulkhead | None"] = contextvars.ContextVar(
+    "current_bulkhead", default=None
+)
+
+
+class BulkheadRejected(Exception):
+    def __init__(self, group: str, reason: str) -> None:
+        super().__init__(f"Bulkhead {group} rejected the request: {reason}")
+        self.group = group
+        self.reason = reason
+
+
+class Bulkhead:
+    """Concurrency limit with a short wait queue for one route group.
+
+    Up to `max_concurrent` requests run at once. Arrivals beyond that wait in
+    a FIFO queue of at most `max_queue` entries for `queue_timeout_seconds`;
+    a full queue or an expired wait is rejected. A released slot is handed
+    straight to the oldest waiter, so queued requests cannot be overtaken.
+    Counters are only touched from the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        max_threads: int,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max(max_concurrent, 1)
+        self.max_queue = max(max_queue, 0)
+        self.queue_timeout_seconds = max(queue_timeout_seconds, 0.0)
+        self.max_threads = max(max_threads, 1)
+        self.active = 0
+        self.peak_active = 0
+        self.peak_waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.queue_ms = LatencyHistogram()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._thread_limiter: CapacityLimiter | None = None
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def thread_limiter(self) -> CapacityLimiter:
+        # Created lazily: the limiter binds to the running event loop.
+        if self._thread_limiter is None:
+            self._thread_limiter = CapacityLimiter(self.max_threads)
+        return self._thread_limiter
+
+    def _admit(self) -> None:
+        self.admitted += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+    async def acquire(self) -> float:
+        """Takes a slot and returns the time spent queued, in ms."""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self._admit()
+            return 0.0
+        if len(self._waiters) >= self.max_queue or self.queue_timeout_seconds <= 0:
+            self.rejected_full += 1
+            raise BulkheadRejected(self.name, "full")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.peak_waiting = max(self.peak_waiting, len(self._waiters))
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.queue_timeout_seconds):
+                await waiter
+        except TimeoutError:
+            # The slot may have been handed over just as the timeout fired.
+            if not waiter.done() or waiter.cancelled():
+                self._discard(waiter)
+                self.rejected_timeout += 1
+                raise BulkheadRejected(self.name, "timeout") from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.queue_ms.add(waited_ms)
+        self._admit()
+        return waited_ms
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, waiter: asyncio.Future[None]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def snapshot(self) -> dict[str, Any]:
+        arrivals = self.admitted + self.rejected_full + self.rejected_timeout
+        saturated = self.queued + self.rejected_full
+        limiter = self._thread_limiter
+        return {
+            "group": self.name,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": round(self.queue_timeout_seconds * 1000, 3),
+            "max_threads": self.max_threads,
+            "active": self.active,
+            "waiting": self.waiting,
+            "threads_busy": 0 if limiter is None else int(limiter.borrowed_tokens),
+            "peak_active": self.peak_active,
+            "peak_waiting": self.peak_waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_full": self.rejected_full,
+            "rejected_timeout": self.rejected_timeout,
+            "saturation_ratio": round(saturated / arrivals, 4) if arrivals else 0.0,
+            "queue_ms": self.queue_ms.summary(),
+        }
+
+
+class BulkheadRegistry:
+    """Maps request paths to bulkheads by longest matching path prefix."""
+
+    def __init__(
+        self,
+        limits: Iterable[tuple[str, int, int, float, int]],
+        routes: Mapping[str, str],
+    ) -> None:
+        self.bulkheads = {
+            name: Bulkhead(
+                name,
+                max_concurrent=max_concurrent,
+                max_queue=max_queue,
+                queue_timeout_seconds=queue_timeout_ms / 1000,
+                max_threads=max_threads,
+            )
+            for name, max_concurrent, max_queue, queue_timeout_ms, max_threads in limits
+        }
+        self._routes: list[tuple[str, Bulkhead]] = []
+        for prefix, group in routes.items():
+            bulkhead = self.bulkheads.get(group)
+            if bulkhead is None:
+                # With no groups configured at all, bulkheads are just off.
+                if self.bulkheads:
+                    logger.warning(
+                        "bulkhead.unknown_group | prefix=%s | group=%s", prefix, group
+                    )
+                continue
+            self._routes.append((prefix.rstrip("/"), bulkhead))
+        self._routes.sort(key=lambda route: len(route[0]), reverse=True)
+
+    def match(self, path: str) -> Bulkhead | None:
+        for prefix, bulkhead in self._routes:
+            if path == prefix or path.startswith(f"{prefix}/"):
+                return bulkhead
+        return None
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [self.bulkheads[name].snapshot() for name in sorted(self.bulkheads)]
+
+
+async def run_in_bulkhead_threadpool(
+    func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    """Runs sync work in a thread, capped by the current group's thread limit.
+
+    Outside a bulkhead this behaves like Starlette's `run_in_threadpool`,
+    which shares the process-wide limiter.
+    """
+    bulkhead = _current_bulkhead.get()
+    limiter = None if bulkhead is None else bulkhead.thread_limiter
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=limiter
+    )
+
+
+class BulkheadMiddleware:
+    def __init__(self, app: ASGIApp, registry: BulkheadRegistry) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        bulkhead = self.registry.match(scope["path"])
+        if bulkhead is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await bulkhead.acquire()
+        except BulkheadRejected as exc:
+            logger.warning(
+                "bulkhead.rejected | group=%s | reason=%s | method=%s | path=%s | "
+                "active=%s | waiting=%s",
+                exc.group,
+                exc.reason,
+                scope["method"],
+                scope["path"],
+                bulkhead.active,
+                bulkhead.waiting,
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Service busy: {exc.group} is saturated"},
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        token = _current_bulkhead.set(bulkhead)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_bulkhead.reset(token)
+            bulkhead.release()
@@ -0,0 +1,117 @@
+from collections.abc import Iterable, Mapping
+from typing import Any, Final
+
+from .histograms import LatencyHistogram
+
+OTHER_KEY: Final[str] = "(other)"
+NAVIGATION_METRICS: Final[tuple[str, ...]] = ("ttfb", "dom_content_loaded", "load")
+RESOURCE_TYPES: Final[frozenset[str]] = frozenset(
+    {"script", "link", "css", "img", "font", "other"}
+)
+
+
+class _EndpointStats:
+    __slots__ = ("latency", "errors")
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.errors = 0
+
+
+class ClientTelemetry:
+    """Client-side latency histograms per page and per API endpoint.
+
+    Memory is bounded: at most `max_pages` pages and `max_endpoints`
+    endpoints get their own histograms, and anything seen after that is
+    folded into a single `(other)` entry. Every histogram is a fixed set of
+    bucket counters, so the total size does not grow with traffic.
+    """
+
+    def __init__(self, max_pages: int, max_endpoints: int) -> None:
+        self.max_pages = max(max_pages, 1)
+        self.max_endpoints = max(max_endpoints, 1)
+        self.batches = 0
+        self._pages: dict[str, dict[str, LatencyHistogram]] = {}
+        self._endpoints: dict[str, _EndpointStats] = {}
+
+    def _page(self, page: str) -> dict[str, LatencyHistogram]:
+        metrics = self._pages.get(page)
+        if metrics is None:
+            if len(self._pages) >= self.max_pages:
+                page = OTHER_KEY
+            metrics = self._pages.setdefault(page, {})
+        return metrics
+
+    def _endpoint(self, key: str) -> _EndpointStats:
+        stats = self._endpoints.get(key)
+        if stats is None:
+            if len(self._endpoints) >= self.max_endpoints:
+                key = OTHER_KEY
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats()
+        return stats
+
+    def record_batch(
+        self,
+        page: str,
+        navigation: Mapping[str, float | None],
+        resources: Iterable[tuple[str, float]],
+        api_calls: Iterable[tuple[str, str, int, float]],
+    ) -> int:
+        """Adds one client batch and returns the number of timings recorded."""
+        self.batches += 1
+        recorded = 0
+        metrics = self._page(page)
+        for name in NAVIGATION_METRICS:
+            value = navigation.get(name)
+            if value is not None:
+                metrics.setdefault(name, LatencyHistogram()).add(value)
+                recorded += 1
+
+        for initiator, duration_ms in resources:
+            kind = initiator if initiator in RESOURCE_TYPES else "other"
+            metrics.setdefault(f"resource.{kind}", LatencyHistogram()).add(duration_ms)
+            recorded += 1
+
+        for method, path, status_code, duration_ms in api_calls:
+            stats = self._endpoint(f"{method.upper()} {path}")
+            stats.latency.add(duration_ms)
+            # Status 0 is a request that never got a response.
+            if status_code == 0 or status_code >= 500:
+                stats.errors += 1
+            recorded += 1
+        return recorded
+
+    def snapshot(
+        self, server_routes: Mapping[str, Mapping[str, Any]] | None = None
+    ) -> dict[str, Any]:
+        """Summaries per page and endpoint.
+
+        `server_routes` maps `"METHOD /path"` to the server-side latency
+        from `RequestMetrics.latency_snapshot`, shown next to the client
+        numbers.
+        """
+        server_routes = server_routes or {}
+        pages = [
+            {
+                "page": page,
+                "metrics": {
+                    name: histogram.summary()
+                    for name, histogram in sorted(metrics.items())
+                },
+            }
+            for page, metrics in sorted(self._pages.items())
+        ]
+        endpoints = []
+        for key, stats in sorted(self._endpoints.items()):
+            server = server_routes.get(key)
+            endpoints.append(
+                {
+                    "endpoint": key,
+                    "errors": stats.errors,
+                    "client": stats.latency.summary(),
+                    "server": None if server is None else dict(server),
+                }
+            )
+        return {"batches": self.batches, "pages": pages, "endpoints": endpoints}
@@ -1,17 +1,73 @@
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-load_dotenv()
+from dotenv import dotenv_values
 
 DEFAULT_CORS_ORIGINS = (
     "http://127.0.0.1:5500",
     "http://localhost:5500",
 )
+DEFAULT_CAPTURE_REDACT_HEADERS = ("authorization", "cookie", "x-api-key")
+DEFAULT_CAPTURE_REDACT_FIELDS = ("password", "token", "secret")
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
+ENV_FILE = PROJECT_ROOT / ".env"
+
+_env_file_values: dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class EnvFilePlan:
+    environ: dict[str, str]
+    loaded: dict[str, str]
+
+
+def plan_env_file(path: Path) -> EnvFilePlan:
+    """The environment `path` would produce, without touching `os.environ`.
+
+    The file only owns the variables it set itself: a variable is (re)written
+    when it is unset or still holds the value of the previous load, and it is
+    removed again once it disappears from the file. Exported variables and
+    runtime overrides always win.
+    """
+    values: dict[str, str] = {}
+    if path.is_file():
+        values = {
+            key: value
+            for key, value in dotenv_values(path).items()
+            if value is not None
+        }
+
+    environ = dict(os.environ)
+    for key, previous in _env_file_values.items():
+        if key not in values and environ.get(key) == previous:
+            del environ[key]
+
+    loaded: dict[str, str] = {}
+    for key, value in values.items():
+        current = environ.get(key)
+        if current is None or current == _env_file_values.get(key):
+            environ[key] = value
+            loaded[key] = value
+    return EnvFilePlan(environ=environ, loaded=loaded)
+
+
+def apply_env_file(plan: EnvFilePlan) -> None:
+    for key in _env_file_values.keys() - plan.environ.keys():
+        os.environ.pop(key, None)
+    os.environ.update(plan.loaded)
+    _env_file_values.clear()
+    _env_file_values.update(plan.loaded)
+
+
+def load_env_file(path: Path) -> None:
+    """Applies `path` to `os.environ`; see `plan_env_file`."""
+    apply_env_file(plan_env_file(path))
+
+
+load_env_file(ENV_FILE)
 
 
 def _parse_cors_origins(raw_value: str | None) -> tuple[str, ...]:
@@ -25,6 +81,93 @@ def _parse_cors_origins(raw_value: str | None) -> tuple[str, ...]:
     return parsed
 
 
+def _parse_route_limits(
+    raw_value: str | None, default: tuple[tuple[str, int], ...]
+) -> tuple[tuple[str, int], ...]:
+    if raw_value is None:
+        return default
+
+    parsed: list[tuple[str, int]] = []
+    for entry in raw_value.split(","):
+        path, separator, limit = entry.partition("=")
+        if not separator or not path.strip() or not limit.strip().isdigit():
+            continue
+        parsed.append((path.strip(), int(limit.strip())))
+
+    return tuple(parsed)
+
+
+def _parse_route_deadlines(
+    raw_value: str | None, default: tuple[tuple[str, float], ...]
+) -> tuple[tuple[str, float], ...]:
+    if raw_value is None:
+        return default
+
+    parsed: list[tuple[str, float]] = []
+    for entry in raw_value.split(","):
+        path, separator, seconds = entry.partition("=")
+        if not separator or not path.strip():
+            continue
+        try:
+            parsed.append((path.strip(), max(float(seconds), 0.0)))
+        except ValueError:
+            continue
+
+    return tuple(parsed)
+
+
+def _parse_bulkhead_routes(
+    raw_value: str | None, default: tuple[tuple[str, str], ...]
+) -> tuple[tuple[str, str], ...]:
+    if raw_value is None:
+        return default
+
+    parsed: list[tuple[str, str]] = []
+    for entry in raw_value.split(","):
+        prefix, separator, group = entry.partition("=")
+        if not separator or not prefix.strip() or not group.strip():
+            continue
+        parsed.append((prefix.strip(), group.strip()))
+
+    return tuple(parsed)
+
+
+def _parse_bulkhead_limits(
+    raw_value: str | None, default: tuple[tuple[str, int, int, float, int], ...]
+) -> tuple[tuple[str, int, int, float, int], ...]:
+    # Entries look like group=max_concurrent:max_queue:queue_timeout_ms:max_threads.
+    if raw_value is None:
+        return default
+
+    parsed: list[tuple[str, int, int, float, int]] = []
+    for entry in raw_value.split(","):
+        group, separator, spec = entry.partition("=")
+        parts = spec.split(":")
+        if not separator or not group.strip() or len(parts) != 4:
+            continue
+        try:
+            parsed.append(
+                (
+                    group.strip(),
+                    int(parts[0]),
+                    int(parts[1]),
+                    float(parts[2]),
+                    int(parts[3]),
+                )
+            )
+        except ValueError:
+            continue
+
+    return tuple(parsed)
+
+
+def _parse_csv(raw_value: str | None, default: tuple[str, ...]) -> tuple[str, ...]:
+    if raw_value is None:
+        return default
+
+    return tuple(item.strip() for item in raw_value.split(",") if item.strip())
+
+
 def _parse_bool(raw_value: str | None, default: bool) -> bool:
     if raw_value is None:
         return default
@@ -45,27 +188,204 @@ class Settings:
     log_level: str
     log_file_path: str
     log_retention_days: int
+    log_retention_max_bytes: int
+    log_retention_interval_seconds: float
     log_use_utc: bool
+    request_metrics_sample_rate: float
+    request_metrics_trace_allocations: bool
+    request_body_max_bytes: int
+    request_body_route_limits: tuple[tuple[str, int], ...]
+    frontend_log_details_max_depth: int
+    frontend_log_details_max_keys: int
+    frontend_log_details_max_bytes: int
+    log_writer_mode: str
+    log_writer_socket_path: str
+    log_writer_queue_size: int
+    log_writer_overflow: str
+    traffic_capture_path: str
+    traffic_capture_sample_rate: float
+    traffic_capture_redact_headers: tuple[str, ...]
+    traffic_capture_redact_fields: tuple[str, ...]
+    traffic_capture_max_body_bytes: int
+    math_eval_cache_size: int
+    math_eval_max_elements: int
+    math_eval_cpu_budget_ms: float
+    drain_timeout_seconds: float
+    drain_signal: str
+    request_deadline_seconds: float
+    request_deadline_routes: tuple[tuple[str, float], ...]
+    request_budget_header: str
+    settings_reload_signal: str
+    settings_watch_interval_seconds: float
+    readiness_interval_seconds: float
+    readiness_max_loop_lag_ms: float
+    readiness_min_free_bytes: int
+    client_telemetry_max_pages: int
+    client_telemetry_max_endpoints: int
+    user_agent_cache_size: int
+    live_tick_interval_seconds: float
+    live_heartbeat_seconds: float
+    live_client_buffer: int
+    live_slow_consumer: str
+    live_max_subscribers: int
+    bulkhead_limits: tuple[tuple[str, int, int, float, int], ...]
+    bulkhead_routes: tuple[tuple[str, str], ...]
 
 
-@lru_cache
-def get_settings() -> Settings:
-    configured_log_file_path = Path(os.getenv("LOG_FILE_PATH", "logs/backend.log"))
+def load_settings(environ: Mapping[str, str] | None = None) -> Settings:
+    """Builds and validates settings from `environ` (the process environment)."""
+    env = os.environ if environ is None else environ
+    configured_log_file_path = Path(env.get("LOG_FILE_PATH", "logs/backend.log"))
     if not configured_log_file_path.is_absolute():
         configured_log_file_path = (PROJECT_ROOT / configured_log_file_path).resolve()
 
-    log_retention_days = int(os.getenv("LOG_RETENTION_DAYS", "30"))
+    log_retention_days = int(env.get("LOG_RETENTION_DAYS", "30"))
+    log_writer_socket_path = Path(
+        env.get("LOG_WRITER_SOCKET_PATH", ".run/log-writer.sock")
+    )
+    if not log_writer_socket_path.is_absolute():
+        log_writer_socket_path = (PROJECT_ROOT / log_writer_socket_path).resolve()
+    request_metrics_sample_rate = float(env.get("REQUEST_METRICS_SAMPLE_RATE", "0"))
+    traffic_capture_path = env.get("TRAFFIC_CAPTURE_PATH", "").strip()
+    if traffic_capture_path and not Path(traffic_capture_path).is_absolute():
+        traffic_capture_path = str((PROJECT_ROOT / traffic_capture_path).resolve())
+    drain_signal = env.get("DRAIN_SIGNAL", "SIGTERM").strip().upper()
+    if drain_signal == "NONE":
+        drain_signal = ""
+    settings_reload_signal = env.get("SETTINGS_RELOAD_SIGNAL", "SIGHUP").strip().upper()
+    if settings_reload_signal == "NONE":
+        settings_reload_signal = ""
+    api_prefix = env.get("API_PREFIX", "/api")
+    api_v1_prefix = env.get("API_V1_PREFIX", "/v1")
+    default_route_limits = (
+        (f"{api_prefix}{api_v1_prefix}/logs/frontend", 64 * 1024),
+        (f"{api_prefix}{api_v1_prefix}/telemetry/frontend", 64 * 1024),
+        (f"{api_prefix}{api_v1_prefix}/echo", 16 * 1024),
+        (f"{api_prefix}{api_v1_prefix}/echo/stream", 0),
+    )
+    default_route_deadlines = (
+        (f"{api_prefix}{api_v1_prefix}/echo/stream", 0.0),
+        (f"{api_prefix}{api_v1_prefix}/math/eval", 5.0),
+        (f"{api_prefix}{api_v1_prefix}/live", 0.0),
+    )
+    default_bulkhead_limits = (
+        ("core", 64, 64, 250.0, 1),
+        ("echo", 32, 32, 250.0, 2),
+        ("math", 8, 16, 250.0, 4),
+        ("ingest", 16, 32, 100.0, 2),
+    )
+    default_bulkhead_routes = (
+        (f"{api_prefix}{api_v1_prefix}/health", "core"),
+        (f"{api_prefix}{api_v1_prefix}/time", "core"),
+        (f"{api_prefix}{api_v1_prefix}/echo", "echo"),
+        (f"{api_prefix}{api_v1_prefix}/math", "math"),
+        (f"{api_prefix}{api_v1_prefix}/logs", "ingest"),
+        (f"{api_prefix}{api_v1_prefix}/telemetry", "ingest"),
+    )
 
     return Settings(
-        service_name=os.getenv("SERVICE_NAME", "fullstack-template-backend"),
-        app_version=os.getenv("APP_VERSION", "0.1.0"),
-        app_name=os.getenv("APP_NAME", "Fullstack Template"),
-        app_env=os.getenv("APP_ENV", "development"),
-        api_prefix=os.getenv("API_PREFIX", "/api"),
-        api_v1_prefix=os.getenv("API_V1_PREFIX", "/v1"),
-        cors_origins=_parse_cors_origins(os.getenv("CORS_ORIGINS")),
-        log_level=os.getenv("LOG_LEVEL", "DEBUG").upper(),
+        service_name=env.get("SERVICE_NAME", "fullstack-template-backend"),
+        app_version=env.get("APP_VERSION", "0.1.0"),
+        app_name=env.get("APP_NAME", "Fullstack Template"),
+        app_env=env.get("APP_ENV", "development"),
+        api_prefix=api_prefix,
+        api_v1_prefix=api_v1_prefix,
+        cors_origins=_parse_cors_origins(env.get("CORS_ORIGINS")),
+        log_level=env.get("LOG_LEVEL", "DEBUG").upper(),
         log_file_path=str(configured_log_file_path),
         log_retention_days=log_retention_days,
-        log_use_utc=_parse_bool(os.getenv("LOG_USE_UTC"), True),
+        log_retention_max_bytes=int(
+            env.get("LOG_RETENTION_MAX_BYTES", str(1024 * 1024 * 1024))
+        ),
+        log_retention_interval_seconds=float(
+            env.get("LOG_RETENTION_INTERVAL_SECONDS", "300")
+        ),
+        log_use_utc=_parse_bool(env.get("LOG_USE_UTC"), True),
+        request_metrics_sample_rate=request_metrics_sample_rate,
+        request_metrics_trace_allocations=_parse_bool(
+            env.get("REQUEST_METRICS_TRACE_ALLOCATIONS"), False
+        ),
+        request_body_max_bytes=int(env.get("REQUEST_BODY_MAX_BYTES", "1048576")),
+        request_body_route_limits=_parse_route_limits(
+            env.get("REQUEST_BODY_ROUTE_LIMITS"), default_route_limits
+        ),
+        frontend_log_details_max_depth=int(
+            env.get("FRONTEND_LOG_DETAILS_MAX_DEPTH", "8")
+        ),
+        frontend_log_details_max_keys=int(
+            env.get("FRONTEND_LOG_DETAILS_MAX_KEYS", "256")
+        ),
+        frontend_log_details_max_bytes=int(
+            env.get("FRONTEND_LOG_DETAILS_MAX_BYTES", "16384")
+        ),
+        log_writer_mode=env.get("LOG_WRITER_MODE", "local").lower(),
+        log_writer_socket_path=str(log_writer_socket_path),
+        log_writer_queue_size=int(env.get("LOG_WRITER_QUEUE_SIZE", "10000")),
+        log_writer_overflow=env.get("LOG_WRITER_OVERFLOW", "drop_newest").lower(),
+        traffic_capture_path=traffic_capture_path,
+        traffic_capture_sample_rate=float(env.get("TRAFFIC_CAPTURE_SAMPLE_RATE", "1")),
+        traffic_capture_redact_headers=_parse_csv(
+            env.get("TRAFFIC_CAPTURE_REDACT_HEADERS"), DEFAULT_CAPTURE_REDACT_HEADERS
+        ),
+        traffic_capture_redact_fields=_parse_csv(
+            env.get("TRAFFIC_CAPTURE_REDACT_FIELDS"), DEFAULT_CAPTURE_REDACT_FIELDS
+        ),
+        traffic_capture_max_body_bytes=int(
+            env.get("TRAFFIC_CAPTURE_MAX_BODY_BYTES", "65536")
+        ),
+        math_eval_cache_size=int(env.get("MATH_EVAL_CACHE_SIZE", "256")),
+        math_eval_max_elements=int(env.get("MATH_EVAL_MAX_ELEMENTS", "100000")),
+        math_eval_cpu_budget_ms=float(env.get("MATH_EVAL_CPU_BUDGET_MS", "50")),
+        drain_timeout_seconds=float(env.get("DRAIN_TIMEOUT_SECONDS", "30")),
+        drain_signal=drain_signal,
+        request_deadline_seconds=float(env.get("REQUEST_DEADLINE_SECONDS", "30")),
+        request_deadline_routes=_parse_route_deadlines(
+            env.get("REQUEST_DEADLINE_ROUTES"), default_route_deadlines
+        ),
+        request_budget_header=env.get("REQUEST_BUDGET_HEADER", "X-Request-Budget-Ms"),
+        settings_reload_signal=settings_reload_signal,
+        settings_watch_interval_seconds=float(
+            env.get("SETTINGS_WATCH_INTERVAL_SECONDS", "2")
+        ),
+        readiness_interval_seconds=float(env.get("READINESS_INTERVAL_SECONDS", "2")),
+        readiness_max_loop_lag_ms=float(env.get("READINESS_MAX_LOOP_LAG_MS", "250")),
+        readiness_min_free_bytes=int(
+            env.get("READINESS_MIN_FREE_BYTES", str(100 * 1024 * 1024))
+        ),
+        client_telemetry_max_pages=int(env.get("CLIENT_TELEMETRY_MAX_PAGES", "50")),
+        client_telemetry_max_endpoints=int(
+            env.get("CLIENT_TELEMETRY_MAX_ENDPOINTS", "100")
+        ),
+        user_agent_cache_size=int(env.get("USER_AGENT_CACHE_SIZE", "512")),
+        live_tick_interval_seconds=float(env.get("LIVE_TICK_INTERVAL_SECONDS", "1")),
+        live_heartbeat_seconds=float(env.get("LIVE_HEARTBEAT_SECONDS", "15")),
+        live_client_buffer=int(env.get("LIVE_CLIENT_BUFFER", "32")),
+        live_slow_consumer=env.get("LIVE_SLOW_CONSUMER", "disconnect").lower(),
+        live_max_subscribers=int(env.get("LIVE_MAX_SUBSCRIBERS", "1000")),
+        bulkhead_limits=_parse_bulkhead_limits(
+            env.get("BULKHEAD_LIMITS"), default_bulkhead_limits
+        ),
+        bulkhead_routes=_parse_bulkhead_routes(
+            env.get("BULKHEAD_ROUTES"), default_bulkhead_routes
+        ),
     )
+
+
+_installing: Settings | None = None
+
+
+@lru_cache
+def get_settings() -> Settings:
+    # The cache is the hot path; SettingsProvider.reload swaps its content.
+    return _installing if _installing is not None else load_settings()
+
+
+def install_settings(settings: Settings) -> None:
+    """Makes `get_settings()` return `settings` without parsing them again."""
+    global _installing
+    _installing = settings
+    get_settings.cache_clear()
+    try:
+        get_settings()
+    finally:
+        _installing = None
@@ -0,0 +1,46 @@
+from collections.abc import Sequence
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import Settings
+from .settings_provider import SettingsProvider
+
+
+class ReloadableCORSMiddleware:
+    """`CORSMiddleware` whose allowed origins follow the settings provider.
+
+    Starlette's middleware precomputes its headers at construction, so a
+    settings change builds a fresh instance and swaps the reference; requests
+    already inside the old one finish with the old origins.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        provider: SettingsProvider,
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+    ) -> None:
+        self.app = app
+        self.allow_methods = allow_methods
+        self.allow_headers = allow_headers
+        self.allow_credentials = allow_credentials
+        self._cors = self._build(provider.current)
+        provider.subscribe(self._apply, fields=("cors_origins",))
+
+    def _build(self, settings: Settings) -> CORSMiddleware:
+        return CORSMiddleware(
+            self.app,
+            allow_origins=list(settings.cors_origins),
+            allow_methods=self.allow_methods,
+            allow_headers=self.allow_headers,
+            allow_credentials=self.allow_credentials,
+        )
+
+    def _apply(self, previous: Settings, current: Settings) -> None:
+        self._cors = self._build(current)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._cors(scope, receive, send)
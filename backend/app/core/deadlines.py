@@ -0,0 +1,128 @@
+import asyncio
+import contextvars
+import logging
+import math
+import time
+from collections.abc import Mapping
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("backend.http")
+
+_deadline_var: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def set_deadline(value: float | None) -> contextvars.Token[float | None]:
+    return _deadline_var.set(value)
+
+
+def reset_deadline(token: contextvars.Token[float | None]) -> None:
+    _deadline_var.reset(token)
+
+
+def remaining_budget_ms() -> float | None:
+    """Milliseconds left before the current request's deadline, if it has one."""
+    deadline = _deadline_var.get()
+    if deadline is None:
+        return None
+    return max((deadline - time.monotonic()) * 1000, 0.0)
+
+
+def _client_budget_seconds(headers: Headers, header_name: str) -> float | None:
+    raw_value = headers.get(header_name)
+    if raw_value is None:
+        return None
+    try:
+        budget_ms = float(raw_value)
+    except ValueError:
+        return None
+    if math.isnan(budget_ms):
+        return None
+    return max(budget_ms, 0.0) / 1000
+
+
+class DeadlineMiddleware:
+    # A route deadline of 0 disables the server-side budget for that path; a
+    # client budget header can still shorten, but never extend, the deadline.
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_seconds: float,
+        route_deadlines: Mapping[str, float],
+        budget_header: str,
+    ) -> None:
+        self.app = app
+        self.default_seconds = default_seconds
+        self.route_deadlines = dict(route_deadlines)
+        self.budget_header = budget_header
+
+    def _budget(self, scope: Scope) -> tuple[float | None, str]:
+        route_seconds = self.route_deadlines.get(scope["path"], self.default_seconds)
+        client_seconds = _client_budget_seconds(
+            Headers(scope=scope), self.budget_header
+        )
+        if client_seconds is not None and (
+            route_seconds <= 0 or client_seconds < route_seconds
+        ):
+            return client_seconds, "client"
+        if route_seconds > 0:
+            return route_seconds, "route"
+        return None, "none"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget_seconds, source = self._budget(scope)
+        if budget_seconds is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        deadline = started + budget_seconds
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = set_deadline(deadline)
+        try:
+            # An already spent client budget is refused without running the
+            # handler, since cancellation only lands at its next await.
+            if budget_seconds > 0:
+                loop_deadline = asyncio.get_running_loop().time() + budget_seconds
+                async with asyncio.timeout_at(loop_deadline) as timeout:
+                    await self.app(scope, receive, tracking_send)
+                return
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+        finally:
+            reset_deadline(token)
+
+        logger.warning(
+            "http.request.timeout | method=%s | path=%s | budget_ms=%.0f | "
+            "budget_source=%s | elapsed_ms=%.2f | response_started=%s",
+            scope["method"],
+            scope["path"],
+            budget_seconds * 1000,
+            source,
+            (time.monotonic() - started) * 1000,
+            response_started,
+        )
+        if response_started:
+            # Headers are already on the wire; the truncated body tells the
+            # client the response is incomplete.
+            return
+        response = JSONResponse(
+            status_code=504, content={"detail": "Request deadline exceeded"}
+        )
+        await response(scope, receive, send)
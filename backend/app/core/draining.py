@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterable
+from types import FrameType
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .log_writer import SocketLogHandler
+
+logger = logging.getLogger("backend.drain")
+
+SERVING = "serving"
+DRAINING = "draining"
+DRAINED = "drained"
+
+_SignalHandler = Callable[[int, FrameType | None], Any] | int | None
+
+
+def flush_logging(timeout: float = 2.0) -> None:
+    for handler in logging.getLogger().handlers:
+        try:
+            if isinstance(handler, SocketLogHandler):
+                handler.flush(timeout)
+            else:
+                handler.flush()
+        except Exception:
+            logger.exception("drain.flush_failed | handler=%s", type(handler).__name__)
+
+
+class DrainController:
+    """Tracks in-flight requests and sequences a graceful drain.
+
+    All counters are touched from the event loop only; the signal handler
+    hops onto the loop with call_soon_threadsafe before changing state.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        on_drained: Callable[[], None] | None = None,
+    ) -> None:
+        self.timeout_seconds = max(timeout_seconds, 0.0)
+        self.on_drained = on_drained
+        self.state = SERVING
+        self.reason: str | None = None
+        self.in_flight = 0
+        self.completed_while_draining = 0
+        self.rejected_while_draining = 0
+        self.in_flight_at_start = 0
+        self.in_flight_at_deadline: int | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._idle: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._signal: signal.Signals | None = None
+        self._previous_handler: _SignalHandler = None
+
+    @property
+    def accepting(self) -> bool:
+        return self.state == SERVING
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+        if self.state == SERVING:
+            return
+        self.completed_while_draining += 1
+        if self.in_flight == 0 and self._idle is not None:
+            self._idle.set()
+
+    def begin(self, reason: str) -> bool:
+        if self.state != SERVING:
+            return False
+
+        self.state = DRAINING
+        self.reason = reason
+        self.in_flight_at_start = self.in_flight
+        self._started_at = time.monotonic()
+        self._idle = asyncio.Event()
+        if self.in_flight == 0:
+            self._idle.set()
+        logger.warning(
+            "drain.started | reason=%s | in_flight=%s | timeout_seconds=%s",
+            reason,
+            self.in_flight,
+            self.timeout_seconds,
+        )
+        self._task = asyncio.get_running_loop().create_task(self._drain())
+        return True
+
+    async def _drain(self) -> None:
+        assert self._idle is not None
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.timeout_seconds)
+        except TimeoutError:
+            self.in_flight_at_deadline = self.in_flight
+            logger.error(
+                "drain.deadline_exceeded | in_flight=%s | timeout_seconds=%s",
+                self.in_flight,
+                self.timeout_seconds,
+            )
+
+        self._finished_at = time.monotonic()
+        self.state = DRAINED
+        logger.warning(
+            "drain.completed | reason=%s | completed=%s | rejected=%s | "
+            "abandoned=%s | duration_ms=%.2f",
+            self.reason,
+            self.completed_while_draining,
+            self.rejected_while_draining,
+            self.in_flight_at_deadline or 0,
+            self.elapsed_ms,
+        )
+        await asyncio.to_thread(flush_logging)
+        if self.on_drained is not None:
+            self.on_drained()
+
+    @property
+    def elapsed_ms(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        finished = self._finished_at or time.monotonic()
+        return (finished - self._started_at) * 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        remaining: float | None = None
+        if self.state == DRAINING:
+            remaining = max(self.timeout_seconds - self.elapsed_ms / 1000, 0.0)
+        return {
+            "state": self.state,
+            "reason": self.reason,
+            "in_flight": self.in_flight,
+            "in_flight_at_start": self.in_flight_at_start,
+            "completed_while_draining": self.completed_while_draining,
+            "rejected_while_draining": self.rejected_while_draining,
+            "abandoned": self.in_flight_at_deadline or 0,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "timeout_seconds": self.timeout_seconds,
+            "remaining_seconds": (
+                round(remaining, 3) if remaining is not None else None
+            ),
+        }
+
+    def install_signal_handler(self, signal_name: str) -> bool:
+        # signal.signal only works on the main thread; test clients run the
+        # lifespan elsewhere and simply go without a signal trigger.
+        if not signal_name or threading.current_thread() is not threading.main_thread():
+            return False
+
+        self._signal = signal.Signals[signal_name]
+        self._loop = asyncio.get_running_loop()
+        self._previous_handler = signal.signal(self._signal, self._handle_signal)
+        if self.on_drained is None:
+            self.on_drained = self.exit_process
+        return True
+
+    def remove_signal_handler(self) -> None:
+        if self._signal is not None and self._previous_handler is not None:
+            signal.signal(self._signal, self._previous_handler)
+            self._signal = None
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        assert self._loop is not None
+        if self.state == SERVING:
+            self._loop.call_soon_threadsafe(self.begin, signal.Signals(signum).name)
+            return
+        # A second signal while draining skips the wait.
+        self.exit_process()
+
+    def exit_process(self) -> None:
+        """Hands the signal back to the server's own handler to stop it."""
+        if self._signal is None:
+            return
+        signum = self._signal
+        self.remove_signal_handler()
+        signal.raise_signal(signum)
+
+
+class DrainMiddleware:
+    def __init__(
+        self, app: ASGIApp, controller: DrainController, exempt_paths: Iterable[str]
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Progress and probe routes stay reachable and are not counted, so
+        # polling them never holds a drain open.
+        if scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        if not controller.accepting:
+            controller.rejected_while_draining += 1
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is draining"},
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        controller.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.request_finished()
@@ -0,0 +1,134 @@
+import hashlib
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHECKSUM_ALGORITHMS = ("crc32", "sha256")
+
+
+class _Checksum(Protocol):
+    def update(self, data: bytes) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+class _Crc32:
+    def __init__(self) -> None:
+        self.value = 0
+
+    def update(self, data: bytes) -> None:
+        self.value = zlib.crc32(data, self.value)
+
+    def hexdigest(self) -> str:
+        return f"{self.value:08x}"
+
+
+def new_checksum(algorithm: str) -> _Checksum:
+    if algorithm == "crc32":
+        return _Crc32()
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    raise ValueError(f"unsupported checksum algorithm: {algorithm}")
+
+
+@dataclass(frozen=True)
+class EchoStreamSummary:
+    bytes_total: int
+    chunks: int
+    max_chunk_bytes: int
+    checksum: str | None
+    duration_ms: float
+    client_disconnected: bool
+
+    @property
+    def mb_per_s(self) -> float:
+        if self.duration_ms <= 0:
+            return 0.0
+        return self.bytes_total / 1_000_000 / (self.duration_ms / 1000)
+
+
+class EchoStreamResponse(Response):
+    """Writes each request body chunk back as soon as it is received.
+
+    Reading and writing alternate on a single coroutine, so at most one chunk
+    is held in memory and a slow reader pauses the upload through the
+    server's flow control. Starlette's StreamingResponse is not used because
+    it consumes `receive` itself to watch for disconnects.
+    """
+
+    def __init__(
+        self,
+        checksum: str | None,
+        on_complete: Callable[[EchoStreamSummary], None],
+        media_type: str = "application/octet-stream",
+    ) -> None:
+        super().__init__(media_type=media_type)
+        # The length is unknown until the upload ends.
+        self.raw_headers = [
+            (name, value)
+            for name, value in self.raw_headers
+            if name != b"content-length"
+        ]
+        self.checksum_algorithm = checksum
+        self.on_complete = on_complete
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started = time.perf_counter()
+        checksum = (
+            new_checksum(self.checksum_algorithm) if self.checksum_algorithm else None
+        )
+        bytes_total = 0
+        chunks = 0
+        max_chunk_bytes = 0
+        disconnected = False
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        try:
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    break
+                chunk = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if not chunk:
+                    continue
+                bytes_total += len(chunk)
+                chunks += 1
+                max_chunk_bytes = max(max_chunk_bytes, len(chunk))
+                if checksum is not None:
+                    checksum.update(chunk)
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            if not disconnected:
+                await send({"type": "http.response.body", "body": b""})
+        except OSError:
+            disconnected = True
+        finally:
+            self.on_complete(
+                EchoStreamSummary(
+                    bytes_total=bytes_total,
+                    chunks=chunks,
+                    max_chunk_bytes=max_chunk_bytes,
+                    checksum=(
+                        f"{self.checksum_algorithm}:{checksum.hexdigest()}"
+                        if checksum is not None
+                        else None
+                    ),
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    client_disconnected=disconnected,
+                )
+            )
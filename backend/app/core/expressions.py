@@ -0,0 +1,243 @@
+import ast
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import islice, repeat
+from typing import Any
+
+MAX_EXPRESSION_NODES = 256
+MAX_CALL_ARGS = 8
+EVAL_CHUNK_SIZE = 1024
+
+FUNCTIONS: dict[str, Callable[..., float]] = {
+    "abs": abs,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "floor": lambda value: float(math.floor(value)),
+    "ceil": lambda value: float(math.ceil(value)),
+    "min": min,
+    "max": max,
+    "hypot": math.hypot,
+}
+CONSTANTS: dict[str, float] = {"pi": math.pi, "e": math.e}
+
+_BINARY_OPERATORS = (
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+)
+_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+class ExpressionTooLarge(ExpressionError):
+    pass
+
+
+class EvaluationBudgetExceeded(ExpressionError):
+    pass
+
+
+class _Validator(ast.NodeTransformer):
+    def __init__(self) -> None:
+        self.variables: set[str] = set()
+        self.nodes = 0
+
+    def visit(self, node: ast.AST) -> Any:
+        self.nodes += 1
+        if self.nodes > MAX_EXPRESSION_NODES:
+            raise ExpressionTooLarge(
+                f"expression exceeds {MAX_EXPRESSION_NODES} syntax nodes"
+            )
+        return super().visit(node)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        raise ExpressionError(f"unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node: ast.Expression) -> ast.Expression:
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.BinOp:
+        if not isinstance(node.op, _BINARY_OPERATORS):
+            raise ExpressionError(f"unsupported operator: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.UnaryOp:
+        if not isinstance(node.op, _UNARY_OPERATORS):
+            raise ExpressionError(f"unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant:
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            raise ExpressionError(f"unsupported constant: {value!r}")
+        # Integer literals are promoted so `9 ** 9 ** 9` overflows instead of
+        # building an enormous integer.
+        return ast.copy_location(ast.Constant(value=float(value)), node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in CONSTANTS:
+            return ast.copy_location(ast.Constant(value=CONSTANTS[node.id]), node)
+        if node.id in FUNCTIONS:
+            raise ExpressionError(f"'{node.id}' is a function and must be called")
+        if node.id.startswith("_"):
+            raise ExpressionError(f"invalid variable name: {node.id}")
+        self.variables.add(node.id)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.Call:
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("only whitelisted functions may be called")
+        if node.keywords or not node.args or len(node.args) > MAX_CALL_ARGS:
+            raise ExpressionError(f"invalid arguments for '{node.func.id}'")
+        node.args = [self.visit(argument) for argument in node.args]
+        return node
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    text: str
+    variables: tuple[str, ...]
+    function: Callable[..., float]
+
+    def evaluate(
+        self,
+        values: Mapping[str, float | Sequence[float]],
+        max_elements: int,
+        cpu_budget_ms: float,
+    ) -> float | list[float]:
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise ExpressionError(f"missing variables: {', '.join(missing)}")
+
+        length: int | None = None
+        for name in self.variables:
+            value = values[name]
+            if isinstance(value, int | float):
+                continue
+            if length is None:
+                length = len(value)
+            elif len(value) != length:
+                raise ExpressionError("array variables must have the same length")
+
+        try:
+            if length is None:
+                scalar = float(
+                    self.function(*(values[name] for name in self.variables))
+                )
+                _ensure_finite((scalar,))
+                return scalar
+            if length * max(len(self.variables), 1) > max_elements:
+                raise ExpressionTooLarge(f"inputs exceed {max_elements} elements")
+            return self._evaluate_vector(values, length, cpu_budget_ms)
+        except (ArithmeticError, ValueError, TypeError) as exc:
+            if isinstance(exc, ExpressionError):
+                raise
+            raise ExpressionError(f"evaluation failed: {exc}") from exc
+
+    def _evaluate_vector(
+        self,
+        values: Mapping[str, float | Sequence[float]],
+        length: int,
+        cpu_budget_ms: float,
+    ) -> list[float]:
+        columns: list[Iterator[float]] = []
+        for name in self.variables:
+            value = values[name]
+            if isinstance(value, int | float):
+                columns.append(repeat(value, length))
+            else:
+                columns.append(iter(value))
+
+        function = self.function
+        rows = zip(*columns, strict=False)
+        result: list[float] = []
+        started = time.thread_time()
+        while len(result) < length:
+            chunk = [function(*row) for row in islice(rows, EVAL_CHUNK_SIZE)]
+            _ensure_finite(chunk)
+            result.extend(chunk)
+            if (time.thread_time() - started) * 1000 > cpu_budget_ms:
+                raise EvaluationBudgetExceeded(
+                    f"evaluation exceeded {cpu_budget_ms:g} ms of CPU time"
+                )
+        return result
+
+
+def _ensure_finite(values: Sequence[float]) -> None:
+    if not all(map(math.isfinite, values)):
+        raise ExpressionError("result is not a finite number")
+
+
+def compile_expression(text: str) -> CompiledExpression:
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ExpressionError(f"invalid expression: {exc.msg}") from exc
+
+    validator = _Validator()
+    body = validator.visit(tree).body
+    variables = tuple(sorted(validator.variables))
+    lambda_node = ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=body,
+    )
+    code = compile(
+        ast.fix_missing_locations(ast.Expression(body=lambda_node)),
+        "<math-expression>",
+        "eval",
+    )
+    # The tree only contains arithmetic, float constants, argument names and
+    # calls to FUNCTIONS, so evaluating it with empty builtins is safe.
+    function = eval(code, {"__builtins__": {}, **FUNCTIONS})
+    return CompiledExpression(text=text, variables=variables, function=function)
+
+
+class ExpressionCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(maxsize, 0)
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[str, CompiledExpression] = OrderedDict()
+
+    def get_or_compile(self, text: str) -> tuple[CompiledExpression, bool]:
+        plan = self._plans.get(text)
+        if plan is not None:
+            self._plans.move_to_end(text)
+            self.hits += 1
+            return plan, True
+
+        self.misses += 1
+        plan = compile_expression(text)
+        if self.maxsize:
+            self._plans[text] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan, False
+
+    def __len__(self) -> int:
+        return len(self._plans)
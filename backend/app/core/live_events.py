@@ -0,0 +1,335 @@
+import asyncio
+import json
+import logging
+import signal
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from types import FrameType
+from typing import Any, Final
+
+from starlette.responses import Response
+from starlette.types import Message, Receive, Scope, Send
+
+from .draining import SERVING, DrainController
+from .probes import ReadinessMonitor
+
+logger = logging.getLogger("backend.live")
+
+TOPICS: Final[tuple[str, ...]] = ("time", "status")
+SLOW_CONSUMER_POLICIES: Final[tuple[str, ...]] = ("drop", "disconnect")
+HEARTBEAT_CHUNK: Final[bytes] = b": ping\n\n"
+# Sent first on every stream: how long EventSource waits before reconnecting.
+RETRY_CHUNK: Final[bytes] = b"retry: 3000\n\n"
+
+# The signals uvicorn stops on. It waits for open connections before running
+# the lifespan shutdown, so streams have to end as soon as one arrives.
+SHUTDOWN_SIGNALS: Final[tuple[str, ...]] = ("SIGINT", "SIGTERM")
+
+StatusSource = Callable[[], dict[str, Any]]
+_SignalHandler = Callable[[int, FrameType | None], Any] | int | None
+
+
+def service_status(
+    readiness: ReadinessMonitor, drain: DrainController, environment: Callable[[], str]
+) -> StatusSource:
+    """Status as pushed on the `status` topic, from the cached probe results."""
+
+    def status() -> dict[str, Any]:
+        failing = sorted(
+            name for name, result in readiness.results.items() if not result.ok
+        )
+        if drain.state != SERVING:
+            state = "draining"
+        elif readiness.ready is None:
+            state = "starting"
+        else:
+            state = "ok" if readiness.ready else "degraded"
+        return {"status": state, "environment": environment(), "failing": failing}
+
+    return status
+
+
+def encode_event(event_id: int, topic: str, data: dict[str, Any]) -> bytes:
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {topic}\ndata: {payload}\n\n".encode()
+
+
+class LiveSubscriber:
+    __slots__ = ("topics", "buffer", "close_reason", "task", "_wakeup")
+
+    def __init__(self, topics: frozenset[str]) -> None:
+        self.topics = topics
+        self.buffer: deque[bytes] = deque()
+        self.close_reason: str | None = None
+        self.task: asyncio.Task[Any] | None = None
+        self._wakeup = asyncio.Event()
+
+    def push(self, chunk: bytes) -> None:
+        self.buffer.append(chunk)
+        self._wakeup.set()
+
+    def close(self, reason: str) -> None:
+        if self.close_reason is None:
+            self.close_reason = reason
+            self._wakeup.set()
+
+    async def next_chunk(self) -> bytes | None:
+        """Everything buffered so far as one write; None once closed and empty."""
+        while not self.buffer:
+            if self.close_reason is not None:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        if len(self.buffer) == 1:
+            return self.buffer.popleft()
+        chunk = b"".join(self.buffer)
+        self.buffer.clear()
+        return chunk
+
+
+class LiveBroadcaster:
+    """One producer that pushes server time and status to every subscriber.
+
+    Each event is serialized once and the same bytes object is appended to
+    every interested subscriber's buffer, so a tick costs one encode plus one
+    deque append per connection. Buffers hold at most `client_buffer` chunks.
+    A subscriber that falls that far behind either loses its oldest chunks
+    (`drop`) or is disconnected (`disconnect`); EventSource clients reconnect
+    on their own and get the current status again.
+    """
+
+    def __init__(
+        self,
+        status: StatusSource,
+        tick_interval_seconds: float,
+        heartbeat_seconds: float,
+        client_buffer: int,
+        slow_consumer: str,
+        max_subscribers: int,
+    ) -> None:
+        if slow_consumer not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"unsupported slow consumer policy: {slow_consumer}")
+        self.status = status
+        self.tick_interval_seconds = max(tick_interval_seconds, 0.01)
+        self.heartbeat_seconds = max(heartbeat_seconds, 0.0)
+        self.client_buffer = max(client_buffer, 1)
+        self.slow_consumer = slow_consumer
+        self.max_subscribers = max(max_subscribers, 0)
+        self.subscribers: set[LiveSubscriber] = set()
+        self.accepting = True
+        self.peak_subscribers = 0
+        self.rejected = 0
+        self.events_published = 0
+        self.chunks_dropped = 0
+        self.slow_disconnects = 0
+        self._next_id = 0
+        self._last_status: dict[str, Any] | None = None
+        self._status_chunk: bytes | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._previous_handlers: dict[signal.Signals, _SignalHandler] = {}
+
+    def subscribe(self, topics: Iterable[str]) -> LiveSubscriber | None:
+        if not self.accepting or len(self.subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            return None
+        subscriber = LiveSubscriber(frozenset(topics))
+        if "status" in subscriber.topics:
+            # New subscribers start from the current status, not the next change.
+            if self._status_chunk is None:
+                self.refresh_status()
+            if self._status_chunk is not None:
+                subscriber.push(self._status_chunk)
+        self.subscribers.add(subscriber)
+        self.peak_subscribers = max(self.peak_subscribers, len(self.subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def _deliver(self, subscriber: LiveSubscriber, chunk: bytes) -> None:
+        if len(subscriber.buffer) < self.client_buffer:
+            subscriber.push(chunk)
+            return
+        if self.slow_consumer == "drop":
+            subscriber.buffer.popleft()
+            subscriber.push(chunk)
+            self.chunks_dropped += 1
+            return
+        self.slow_disconnects += 1
+        subscriber.buffer.clear()
+        subscriber.close("slow")
+        self.subscribers.discard(subscriber)
+        # The writer is most likely stuck in a send to a client that stopped
+        # reading, so waking it is not enough.
+        if subscriber.task is not None:
+            subscriber.task.cancel()
+
+    def broadcast(self, chunk: bytes, topic: str | None = None) -> None:
+        """Appends `chunk` to every subscriber of `topic` (all when None)."""
+        for subscriber in list(self.subscribers):
+            if topic is None or topic in subscriber.topics:
+                self._deliver(subscriber, chunk)
+
+    def publish(self, topic: str, data: dict[str, Any]) -> bytes:
+        self._next_id += 1
+        self.events_published += 1
+        chunk = encode_event(self._next_id, topic, data)
+        self.broadcast(chunk, topic)
+        return chunk
+
+    def publish_time(self) -> None:
+        self.publish("time", {"utc": datetime.now(UTC).isoformat()})
+
+    def refresh_status(self) -> bool:
+        """Publishes the status when it changed; returns whether it did."""
+        current = self.status()
+        if current == self._last_status:
+            return False
+        if self._last_status is not None:
+            logger.info(
+                "live.status.changed | status=%s | failing=%s",
+                current["status"],
+                ",".join(current["failing"]) or "-",
+            )
+        self._last_status = current
+        self._status_chunk = self.publish("status", current)
+        return True
+
+    def _status_is(self, state: str) -> bool:
+        return self._last_status is not None and self._last_status["status"] == state
+
+    def close_all(self, reason: str) -> None:
+        self.accepting = False
+        for subscriber in list(self.subscribers):
+            subscriber.close(reason)
+        self.subscribers.clear()
+
+    def install_shutdown_hook(self, signal_names: Iterable[str]) -> bool:
+        """Closes every stream when the server is told to stop.
+
+        Chains to the handler already installed (the server's own), so the
+        signal still stops the server; the streams just no longer hold it up.
+        """
+        # signal.signal only works on the main thread, as in DrainController.
+        if threading.current_thread() is not threading.main_thread():
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        for name in signal_names:
+            signum = signal.Signals[name]
+            self._previous_handlers[signum] = signal.signal(
+                signum, self._handle_shutdown_signal
+            )
+        return bool(self._previous_handlers)
+
+    def remove_shutdown_hook(self) -> None:
+        for signum, previous in self._previous_handlers.items():
+            if previous is not None:
+                signal.signal(signum, previous)
+        self._previous_handlers.clear()
+
+    def _handle_shutdown_signal(self, signum: int, frame: FrameType | None) -> None:
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self.close_all, "shutdown")
+        previous = self._previous_handlers.get(signal.Signals(signum))
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            self.remove_shutdown_hook()
+            signal.raise_signal(signum)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_heartbeat = loop.time() + self.heartbeat_seconds
+        while True:
+            if self.subscribers:
+                self.publish_time()
+            self.refresh_status()
+            if self.accepting and self._status_is("draining"):
+                # Open streams would otherwise hold the drain until its deadline.
+                self.close_all("draining")
+            if self.heartbeat_seconds > 0 and loop.time() >= next_heartbeat:
+                self.broadcast(HEARTBEAT_CHUNK)
+                next_heartbeat = loop.time() + self.heartbeat_seconds
+            await asyncio.sleep(self.tick_interval_seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "peak_subscribers": self.peak_subscribers,
+            "max_subscribers": self.max_subscribers,
+            "rejected": self.rejected,
+            "events_published": self.events_published,
+            "chunks_dropped": self.chunks_dropped,
+            "slow_disconnects": self.slow_disconnects,
+            "slow_consumer": self.slow_consumer,
+            "client_buffer": self.client_buffer,
+        }
+
+
+class LiveEventResponse(Response):
+    """Streams one subscriber's buffer as `text/event-stream`.
+
+    Written against ASGI directly, like EchoStreamResponse: Starlette's
+    StreamingResponse would add a task group and an extra task per
+    connection. A single watcher task reads `receive` to notice disconnects.
+    """
+
+    def __init__(self, broadcaster: LiveBroadcaster, subscriber: LiveSubscriber):
+        super().__init__(
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.raw_headers = [
+            (name, value)
+            for name, value in self.raw_headers
+            if name != b"content-length"
+        ]
+        self.broadcaster = broadcaster
+        self.subscriber = subscriber
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        subscriber = self.subscriber
+        subscriber.task = asyncio.current_task()
+
+        async def watch_disconnect() -> None:
+            while True:
+                message: Message = await receive()
+                if message["type"] == "http.disconnect":
+                    subscriber.close("client")
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {"type": "http.response.body", "body": RETRY_CHUNK, "more_body": True}
+            )
+            while (chunk := await subscriber.next_chunk()) is not None:
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+            if subscriber.close_reason != "client":
+                await send({"type": "http.response.body", "body": b""})
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if subscriber.close_reason != "slow" or task is None:
+                raise
+            # Returning without finishing the body makes the server drop the
+            # connection.
+            task.uncancel()
+            logger.warning("live.subscriber.disconnected | reason=slow")
+        except OSError:
+            subscriber.close("client")
+        finally:
+            subscriber.task = None
+            watcher.cancel()
+            self.broadcaster.unsubscribe(subscriber)
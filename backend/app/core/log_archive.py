@@ -0,0 +1,600 @@
+import calendar
+import json
+import math
+import operator
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import accumulate, compress, repeat
+from pathlib import Path
+from typing import Any, BinaryIO
+
+ARCHIVE_MAGIC = b"FTLOGA1\n"
+ARCHIVE_SUFFIX = ".ftla"
+ARCHIVE_VERSION = 1
+BLOCK_ROWS = 16_384
+DICTIONARY_COLUMNS = ("level", "logger", "event", "path", "method")
+GROUP_KEYS = (*DICTIONARY_COLUMNS, "status", "hour", "day")
+DURATION_METRICS = ("avg", "max", "p50", "p90", "p95", "p99")
+METRICS = ("count", *DURATION_METRICS)
+NO_STATUS = -1
+# Anything else in a status_code field (client-supplied text can contain one)
+# is stored as NO_STATUS; the column is a 16-bit array.
+HTTP_STATUS_RANGE = range(100, 600)
+NO_VALUE = "-"
+
+_FOOTER_SIZE = struct.Struct("<Q")
+_EVENT_PATTERN = re.compile(r"[a-z0-9_]+(?:\.[a-z0-9_]+)+")
+_TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+_RECORD_SEPARATOR = "\x1e"
+_WHERE_PATTERN = re.compile(r"^(\w+)(>=|<=|!=|=|>|<)(.*)$")
+# Operands are flipped so the literal comes first and the column can be
+# mapped with repeat(): `status>=500` is evaluated as `500 <= status`.
+_FLIPPED_OPERATORS: dict[str, Callable[[int, int], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.le,
+    ">": operator.lt,
+    "<=": operator.ge,
+    "<": operator.gt,
+}
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class _Dictionary:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+
+@dataclass
+class _BlockBuffer:
+    timestamps: list[int] = field(default_factory=list)
+    codes: dict[str, list[int]] = field(
+        default_factory=lambda: {name: [] for name in DICTIONARY_COLUMNS}
+    )
+    statuses: list[int] = field(default_factory=list)
+    durations: list[float] = field(default_factory=list)
+    messages: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+@dataclass(frozen=True)
+class CompactionSummary:
+    source: Path
+    archive: Path
+    rows: int
+    blocks: int
+    source_bytes: int
+    archive_bytes: int
+
+
+def _day_epoch(day: str) -> int:
+    return calendar.timegm(
+        (int(day[0:4]), int(day[5:7]), int(day[8:10]), 0, 0, 0, 0, 0, 0)
+    )
+
+
+class ArchiveWriter:
+    """Streams parsed log records into column blocks followed by a JSON footer.
+
+    Layout: magic, then per block one zlib-compressed buffer per column, then
+    the footer (dictionaries and per-block stats and column offsets), then the
+    footer length. Timestamps are the log's wall clock seconds, delta-encoded
+    against the previous row.
+    """
+
+    def __init__(self, stream: BinaryIO, source: str) -> None:
+        self._stream = stream
+        self._source = source
+        self._dictionaries = {name: _Dictionary() for name in DICTIONARY_COLUMNS}
+        self._blocks: list[dict[str, Any]] = []
+        self._buffer = _BlockBuffer()
+        self._day_epochs: dict[str, int] = {}
+        self.rows = 0
+        stream.write(ARCHIVE_MAGIC)
+
+    def _timestamp(self, asctime: str) -> int:
+        day = asctime[:10]
+        base = self._day_epochs.get(day)
+        if base is None:
+            base = self._day_epochs[day] = _day_epoch(day)
+        return (
+            base
+            + int(asctime[11:13]) * 3600
+            + int(asctime[14:16]) * 60
+            + int(asctime[17:19])
+        )
+
+    def add_line(self, line: str) -> None:
+        parts = line.rstrip("\n").split(" | ", 7)
+        buffer = self._buffer
+        if len(parts) < 8 or not _TIMESTAMP_PATTERN.fullmatch(parts[0]):
+            # Traceback and other continuation lines belong to the previous
+            # record's message.
+            if buffer.messages:
+                buffer.messages[-1] += "\n" + line.rstrip("\n")
+            return
+
+        asctime, level, logger_name, _request_id, _, _, _, message = parts
+        fields = message.split(" | ")
+        event = fields[0] if _EVENT_PATTERN.fullmatch(fields[0]) else NO_VALUE
+        path = method = NO_VALUE
+        status = NO_STATUS
+        duration = math.nan
+        for item in fields[1:]:
+            key, _, value = item.partition("=")
+            if key == "path":
+                path = value
+            elif key == "method":
+                method = value
+            elif key == "status_code" and value.isdigit() and len(value) == 3:
+                if int(value) in HTTP_STATUS_RANGE:
+                    status = int(value)
+            elif key == "duration_ms":
+                try:
+                    duration = float(value)
+                except ValueError:
+                    pass
+
+        if len(buffer) >= BLOCK_ROWS:
+            self._flush_block()
+            buffer = self._buffer
+        buffer.timestamps.append(self._timestamp(asctime))
+        for name, value in (
+            ("level", level),
+            ("logger", logger_name),
+            ("event", event),
+            ("path", path),
+            ("method", method),
+        ):
+            buffer.codes[name].append(self._dictionaries[name].encode(value))
+        buffer.statuses.append(status)
+        buffer.durations.append(duration)
+        buffer.messages.append(message)
+        self.rows += 1
+
+    @property
+    def block_count(self) -> int:
+        return len(self._blocks)
+
+    def _write_column(self, payload: bytes, typecode: str | None) -> list[Any]:
+        offset = self._stream.tell()
+        compressed = zlib.compress(payload, 6)
+        self._stream.write(compressed)
+        return [offset, len(compressed), typecode]
+
+    def _flush_block(self) -> None:
+        buffer = self._buffer
+        if not buffer:
+            return
+
+        timestamps = buffer.timestamps
+        deltas = array("i", [0])
+        deltas.extend(map(operator.sub, timestamps[1:], timestamps[:-1]))
+        columns = {"ts": self._write_column(deltas.tobytes(), "i")}
+        stats: dict[str, Any] = {
+            "rows": len(buffer),
+            "ts_base": timestamps[0],
+            "ts_min": min(timestamps),
+            "ts_max": max(timestamps),
+            "codes": {},
+        }
+        for name in DICTIONARY_COLUMNS:
+            codes = buffer.codes[name]
+            typecode = (
+                "B" if max(codes) < 0x100 else "H" if max(codes) < 0x10000 else "I"
+            )
+            columns[name] = self._write_column(
+                array(typecode, codes).tobytes(), typecode
+            )
+            stats["codes"][name] = sorted(set(codes))
+
+        columns["status"] = self._write_column(
+            array("h", buffer.statuses).tobytes(), "h"
+        )
+        present_statuses = [value for value in buffer.statuses if value != NO_STATUS]
+        stats["status_min"] = min(present_statuses, default=None)
+        stats["status_max"] = max(present_statuses, default=None)
+
+        columns["duration_ms"] = self._write_column(
+            array("f", buffer.durations).tobytes(), "f"
+        )
+        present_durations = [value for value in buffer.durations if value == value]
+        stats["duration_min"] = min(present_durations, default=None)
+        stats["duration_max"] = max(present_durations, default=None)
+
+        columns["message"] = self._write_column(
+            _RECORD_SEPARATOR.join(buffer.messages).encode("utf-8"), None
+        )
+        stats["columns"] = columns
+        self._blocks.append(stats)
+        self._buffer = _BlockBuffer()
+
+    def close(self) -> None:
+        self._flush_block()
+        footer = json.dumps(
+            {
+                "version": ARCHIVE_VERSION,
+                "source": self._source,
+                "rows": self.rows,
+                "byteorder": sys.byteorder,
+                "dictionaries": {
+                    name: dictionary.values
+                    for name, dictionary in self._dictionaries.items()
+                },
+                "blocks": self._blocks,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._stream.write(footer)
+        self._stream.write(_FOOTER_SIZE.pack(len(footer)))
+
+
+def compact_log(source: Path, archive: Path) -> CompactionSummary:
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    partial = archive.with_suffix(archive.suffix + ".tmp")
+    with source.open("r", encoding="utf-8", errors="replace") as lines:
+        with partial.open("wb") as stream:
+            writer = ArchiveWriter(stream, source.name)
+            for line in lines:
+                writer.add_line(line)
+            writer.close()
+    partial.replace(archive)
+    return CompactionSummary(
+        source=source,
+        archive=archive,
+        rows=writer.rows,
+        blocks=writer.block_count,
+        source_bytes=source.stat().st_size,
+        archive_bytes=archive.stat().st_size,
+    )
+
+
+def closed_log_files(log_dir: Path, prefix: str, today: str) -> list[Path]:
+    start = len(prefix) + 1
+    return sorted(
+        path
+        for path in log_dir.glob(f"{prefix}-*.log")
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", path.stem[start:])
+        and path.stem[start:] < today
+    )
+
+
+class LogArchive:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._stream = path.open("rb")
+        if self._stream.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            self._stream.close()
+            raise ArchiveError(f"{path} is not a log archive")
+        self._stream.seek(-_FOOTER_SIZE.size, 2)
+        (footer_size,) = _FOOTER_SIZE.unpack(self._stream.read(_FOOTER_SIZE.size))
+        self._stream.seek(-_FOOTER_SIZE.size - footer_size, 2)
+        footer = json.loads(self._stream.read(footer_size))
+        if footer.get("version") != ARCHIVE_VERSION:
+            self._stream.close()
+            raise ArchiveError(f"{path} has unsupported archive version")
+        self.rows: int = footer["rows"]
+        self.blocks: list[dict[str, Any]] = footer["blocks"]
+        self.dictionaries: dict[str, list[str]] = footer["dictionaries"]
+        self._swap = footer["byteorder"] != sys.byteorder
+        self._codes = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in self.dictionaries.items()
+        }
+
+    def code(self, column: str, value: str) -> int | None:
+        return self._codes[column].get(value)
+
+    def _read(self, block: dict[str, Any], column: str) -> tuple[bytes, str | None]:
+        offset, length, typecode = block["columns"][column]
+        self._stream.seek(offset)
+        return zlib.decompress(self._stream.read(length)), typecode
+
+    def column(self, block: dict[str, Any], column: str) -> Sequence[Any]:
+        payload, typecode = self._read(block, column)
+        if typecode is None:
+            return payload.decode("utf-8").split(_RECORD_SEPARATOR)
+        if typecode == "B":
+            return payload
+        values = array(typecode)
+        values.frombytes(payload)
+        if self._swap:
+            values.byteswap()
+        if column == "ts":
+            return list(accumulate(values, initial=block["ts_base"]))[1:]
+        return values
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "LogArchive":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class Condition:
+    column: str
+    op: str
+    value: str
+
+    @classmethod
+    def parse(cls, expression: str) -> "Condition":
+        match = _WHERE_PATTERN.match(expression.strip())
+        if match is None:
+            raise ArchiveError(f"invalid condition: {expression}")
+        column, op, value = match.groups()
+        if column in DICTIONARY_COLUMNS:
+            if op not in {"=", "!="}:
+                raise ArchiveError(f"{column} supports only = and !=")
+        elif column == "status":
+            if not value.isdigit():
+                raise ArchiveError("status conditions need an integer")
+        else:
+            raise ArchiveError(f"unknown column in condition: {column}")
+        return cls(column, op, value)
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    group_by: tuple[str, ...] = ()
+    metrics: tuple[str, ...] = ("count",)
+    where: tuple[Condition, ...] = ()
+    since: int | None = None
+    until: int | None = None
+
+    def __post_init__(self) -> None:
+        unknown = [key for key in self.group_by if key not in GROUP_KEYS]
+        if unknown:
+            raise ArchiveError(f"unknown group-by keys: {', '.join(unknown)}")
+        unknown = [metric for metric in self.metrics if metric not in METRICS]
+        if unknown:
+            raise ArchiveError(f"unknown metrics: {', '.join(unknown)}")
+
+
+@dataclass
+class QueryStats:
+    archives: int = 0
+    blocks_total: int = 0
+    blocks_scanned: int = 0
+    rows_scanned: int = 0
+
+
+def _block_may_match(
+    archive: LogArchive, block: dict[str, Any], query: LogQuery
+) -> bool:
+    if query.since is not None and block["ts_max"] < query.since:
+        return False
+    if query.until is not None and block["ts_min"] >= query.until:
+        return False
+    for condition in query.where:
+        if condition.column == "status":
+            low, high = block["status_min"], block["status_max"]
+            if low is None:
+                return False
+            literal = int(condition.value)
+            if condition.op == "=" and not low <= literal <= high:
+                return False
+            if condition.op in {">=", ">"} and not _FLIPPED_OPERATORS[condition.op](
+                literal, high
+            ):
+                return False
+            if condition.op in {"<=", "<"} and not _FLIPPED_OPERATORS[condition.op](
+                literal, low
+            ):
+                return False
+        elif condition.op == "=":
+            code = archive.code(condition.column, condition.value)
+            if code is None or code not in block["codes"][condition.column]:
+                return False
+    return True
+
+
+def _combine(mask: bytes | None, flags: bytes) -> bytes:
+    if mask is None:
+        return flags
+    # One big-integer AND instead of a per-row loop.
+    combined = int.from_bytes(mask, "little") & int.from_bytes(flags, "little")
+    return combined.to_bytes(len(flags), "little")
+
+
+def _code_flags(values: Sequence[int], code: int, equal: bool) -> bytes:
+    if isinstance(values, bytes):
+        # Single-byte codes are matched with a translation table in C.
+        table = bytearray(256) if equal else bytearray(b"\x01" * 256)
+        table[code] = 1 if equal else 0
+        return values.translate(table)
+    return bytes(map(code.__eq__ if equal else code.__ne__, values))
+
+
+def _block_mask(
+    archive: LogArchive,
+    block: dict[str, Any],
+    query: LogQuery,
+    columns: dict[str, Sequence[Any]],
+) -> bytes | None:
+    mask: bytes | None = None
+    for condition in query.where:
+        values = columns[condition.column]
+        if condition.column == "status":
+            literal = int(condition.value)
+            compare = _FLIPPED_OPERATORS[condition.op]
+            mask = _combine(mask, bytes(map(compare, repeat(literal), values)))
+            if condition.op == "!=":
+                mask = _combine(mask, bytes(map(NO_STATUS.__ne__, values)))
+            continue
+        code = archive.code(condition.column, condition.value)
+        if code is None:
+            continue  # `!=` a value the archive never saw matches every row
+        mask = _combine(mask, _code_flags(values, code, condition.op == "="))
+
+    timestamps = columns.get("ts")
+    if query.since is not None and block["ts_min"] < query.since:
+        assert timestamps is not None
+        mask = _combine(mask, bytes(map(query.since.__le__, timestamps)))
+    if query.until is not None and block["ts_max"] >= query.until:
+        assert timestamps is not None
+        mask = _combine(mask, bytes(map(query.until.__gt__, timestamps)))
+    return mask
+
+
+def _format_key(key: str, value: Any, dictionaries: Mapping[str, list[str]]) -> Any:
+    if key in DICTIONARY_COLUMNS:
+        return dictionaries[key][value]
+    if key == "status":
+        return None if value == NO_STATUS else value
+    if key == "hour":
+        return _format_epoch(value * 3600)[:13] + ":00"
+    return _format_epoch(value * 86400)[:10]
+
+
+def _format_epoch(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def _selected(values: Sequence[Any], mask: bytes | None) -> Iterable[Any]:
+    return values if mask is None else compress(values, mask)
+
+
+def _key_column(
+    key: str, columns: dict[str, Sequence[Any]], mask: bytes | None
+) -> Iterable[Any]:
+    if key == "hour":
+        return map((3600).__rfloordiv__, _selected(columns["ts"], mask))
+    if key == "day":
+        return map((86400).__rfloordiv__, _selected(columns["ts"], mask))
+    return _selected(columns[key], mask)
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def iter_archives(paths: Iterable[Path]) -> Iterator[LogArchive]:
+    for path in paths:
+        with LogArchive(path) as archive:
+            yield archive
+
+
+def run_query(
+    paths: Iterable[Path], query: LogQuery, stats: QueryStats | None = None
+) -> list[dict[str, Any]]:
+    stats = stats if stats is not None else QueryStats()
+    counts: Counter[tuple[Any, ...]] = Counter()
+    durations: defaultdict[tuple[Any, ...], list[float]] = defaultdict(list)
+    wants_durations = any(metric in DURATION_METRICS for metric in query.metrics)
+
+    needed = {condition.column for condition in query.where}
+    needed.update(key for key in query.group_by if key in DICTIONARY_COLUMNS)
+    if "status" in query.group_by:
+        needed.add("status")
+    if query.since is not None or query.until is not None:
+        needed.add("ts")
+    if {"hour", "day"} & set(query.group_by):
+        needed.add("ts")
+    if wants_durations:
+        needed.add("duration_ms")
+
+    for archive in iter_archives(paths):
+        stats.archives += 1
+        for block in archive.blocks:
+            stats.blocks_total += 1
+            if not _block_may_match(archive, block, query):
+                continue
+            stats.blocks_scanned += 1
+            stats.rows_scanned += block["rows"]
+
+            columns = {name: archive.column(block, name) for name in needed}
+            mask = _block_mask(archive, block, query, columns)
+            # Filters only select rows; keys are built for the survivors.
+            selected_rows = block["rows"] if mask is None else mask.count(1)
+            if query.group_by:
+                rows: Iterable[tuple[Any, ...]] = zip(
+                    *(_key_column(key, columns, mask) for key in query.group_by),
+                    strict=False,
+                )
+            else:
+                rows = repeat((), selected_rows)
+
+            block_durations: defaultdict[tuple[Any, ...], list[float]] = defaultdict(
+                list
+            )
+            if wants_durations:
+                block_counts: Counter[tuple[Any, ...]] = Counter()
+                for key, duration in zip(
+                    rows, _selected(columns["duration_ms"], mask), strict=False
+                ):
+                    block_counts[key] += 1
+                    if duration == duration:
+                        block_durations[key].append(duration)
+            elif query.group_by:
+                block_counts = Counter(rows)
+            else:
+                block_counts = Counter({(): selected_rows} if selected_rows else {})
+
+            # Codes are per archive, so keys are decoded before merging.
+            for key, count in block_counts.items():
+                decoded = tuple(
+                    _format_key(name, value, archive.dictionaries)
+                    for name, value in zip(query.group_by, key, strict=True)
+                )
+                counts[decoded] += count
+                if key in block_durations:
+                    durations[decoded].extend(block_durations[key])
+
+    results: list[tuple[int, dict[str, Any]]] = []
+    for key, count in counts.items():
+        row: dict[str, Any] = dict(zip(query.group_by, key, strict=True))
+        values = sorted(durations.get(key, ()))
+        for metric in query.metrics:
+            if metric == "count":
+                row["count"] = count
+            elif not values:
+                row[metric] = None
+            elif metric == "avg":
+                row[metric] = round(sum(values) / len(values), 3)
+            elif metric == "max":
+                row[metric] = round(values[-1], 3)
+            else:
+                row[metric] = round(_percentile(values, float(metric[1:])), 3)
+        results.append((count, row))
+
+    results.sort(key=lambda item: (-item[0], str(item[1])))
+    return [row for _, row in results]
+
+
+def parse_time(value: str) -> int:
+    """Parses `YYYY-MM-DD` or `YYYY-MM-DDTHH:MM[:SS]` as log wall-clock seconds."""
+    text = value.strip().replace("T", " ")
+    if not re.fullmatch(r"\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}(?::\d{2})?)?", text):
+        raise ArchiveError(f"invalid time: {value}")
+    seconds = _day_epoch(text[:10])
+    if len(text) > 10:
+        seconds += int(text[11:13]) * 3600 + int(text[14:16]) * 60
+        if len(text) > 16:
+            seconds += int(text[17:19])
+    return seconds
@@ -0,0 +1,319 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger("backend.log_retention")
+
+MANIFEST_VERSION = 1
+_DATE_FORMAT = "%Y-%m-%d"
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+@dataclass
+class RetentionReport:
+    files: int = 0
+    total_bytes: int = 0
+    active_bytes: int = 0
+    deleted: list[tuple[str, int, str]] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    @property
+    def freed_bytes(self) -> int:
+        return sum(size for _, size, _ in self.deleted)
+
+
+class LogRetentionManager:
+    """Enforces age and total-size limits on the daily `<prefix>-<date>.log` files.
+
+    Closed files never change size, so their sizes are recorded once in a
+    manifest next to the logs. A pass only stats the active file and any days
+    closed since the previous pass; the directory itself is listed only when
+    the manifest is missing or unreadable, and the manifest is read again
+    when another process (the archive compactor) has rewritten it.
+    """
+
+    def __init__(
+        self,
+        log_dir: str | Path,
+        prefix: str,
+        retention_days: int,
+        max_total_bytes: int,
+        use_utc: bool,
+    ) -> None:
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+        self.use_utc = use_utc
+        self.manifest_path = self.log_dir / f".{prefix}-retention.json"
+        self.passes = 0
+        self.last_report: RetentionReport | None = None
+        self._closed: OrderedDict[str, int] | None = None
+        self._closed_bytes = 0
+        self._checked_through = ""
+        self._manifest_stamp: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, day: str) -> Path:
+        return self.log_dir / f"{self.prefix}-{day}.log"
+
+    def _load_manifest(self) -> bool:
+        try:
+            payload = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(payload, dict) or payload.get("version") != MANIFEST_VERSION:
+            return False
+
+        files = payload.get("files")
+        checked_through = payload.get("checked_through")
+        if not isinstance(files, dict) or not isinstance(checked_through, str):
+            return False
+        if not _DATE_PATTERN.fullmatch(checked_through):
+            return False
+        self._closed = OrderedDict(
+            (day, int(size)) for day, size in sorted(files.items())
+        )
+        self._closed_bytes = sum(self._closed.values())
+        self._checked_through = checked_through
+        self._manifest_stamp = self._manifest_stat()
+        return True
+
+    def _manifest_stat(self) -> tuple[int, int] | None:
+        # Every save replaces the file, so the inode changes even where
+        # timestamps are too coarse to tell two writes apart.
+        try:
+            stat = self.manifest_path.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _rebuild_manifest(self, today: str) -> None:
+        closed: dict[str, int] = {}
+        start = len(self.prefix) + 1
+        try:
+            entries = list(os.scandir(self.log_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            name = entry.name
+            if not name.startswith(f"{self.prefix}-") or not name.endswith(".log"):
+                continue
+            day = name[start:-4]
+            if day >= today or not _DATE_PATTERN.fullmatch(day):
+                continue
+            try:
+                closed[day] = entry.stat().st_size
+            except FileNotFoundError:
+                continue
+
+        self._closed = OrderedDict(sorted(closed.items()))
+        self._closed_bytes = sum(closed.values())
+        self._checked_through = _previous_day(today)
+        logger.info(
+            "log.retention.manifest_rebuilt | log_dir=%s | files=%s | total_bytes=%s",
+            self.log_dir,
+            len(closed),
+            self._closed_bytes,
+        )
+
+    def _save_manifest(self) -> None:
+        assert self._closed is not None
+        payload = {
+            "version": MANIFEST_VERSION,
+            "checked_through": self._checked_through,
+            "files": dict(self._closed),
+        }
+        temporary = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(temporary, self.manifest_path)
+        self._manifest_stamp = self._manifest_stat()
+
+    def _ensure_manifest(self, today: str) -> bool:
+        """Loads or rebuilds the closed-file sizes; True when they must be saved."""
+        if self._closed is not None:
+            stamp = self._manifest_stat()
+            if stamp is None or stamp == self._manifest_stamp:
+                return False
+            self._closed = None
+        if self._load_manifest():
+            return False
+        self._rebuild_manifest(today)
+        return True
+
+    def _absorb_closed_days(self, today: str) -> bool:
+        # Days that ended since the last pass. The loop is bounded by elapsed
+        # calendar days, not by the number of files in the directory.
+        assert self._closed is not None
+        changed = False
+        day = _next_day(self._checked_through)
+        while day < today:
+            try:
+                size = self._path(day).stat().st_size
+            except FileNotFoundError:
+                size = -1
+            if size >= 0:
+                self._closed[day] = size
+                self._closed_bytes += size
+                changed = True
+            day = _next_day(day)
+        # Every absorbed day is newer than the manifest entries, so appending
+        # keeps the manifest ordered oldest first.
+        if self._checked_through != _previous_day(today):
+            self._checked_through = _previous_day(today)
+            changed = True
+        return changed
+
+    def _delete_oldest(self, reason: str, report: RetentionReport) -> bool:
+        assert self._closed is not None
+        day, recorded_size = next(iter(self._closed.items()))
+        path = self._path(day)
+        size = recorded_size
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            size = 0
+        except OSError:
+            logger.exception("log.retention.delete_failed | file=%s", path.name)
+            return False
+        del self._closed[day]
+        self._closed_bytes -= recorded_size
+        report.deleted.append((path.name, size, reason))
+        logger.info(
+            "log.retention.deleted | file=%s | bytes=%s | reason=%s",
+            path.name,
+            size,
+            reason,
+        )
+        return True
+
+    def discard(self, path: str | Path) -> None:
+        """Deletes a closed log file outside of a pass, keeping the manifest in step."""
+        path = Path(path)
+        with self._lock:
+            today = datetime.now().strftime(_DATE_FORMAT)
+            changed = self._ensure_manifest(today)
+            assert self._closed is not None
+            path.unlink(missing_ok=True)
+            day = path.name[len(self.prefix) + 1 : -4]
+            if (
+                day in self._closed
+                and self._path(day).name == path.name
+                and path.parent.resolve() == self.log_dir.resolve()
+            ):
+                self._closed_bytes -= self._closed.pop(day)
+                changed = True
+            if changed:
+                self._save_manifest()
+
+    def update_limits(
+        self, retention_days: int, max_total_bytes: int, use_utc: bool
+    ) -> None:
+        # Takes effect from the next pass; one in progress keeps its limits.
+        with self._lock:
+            self.retention_days = retention_days
+            self.max_total_bytes = max_total_bytes
+            self.use_utc = use_utc
+
+    def run_once(self) -> RetentionReport:
+        with self._lock:
+            return self._run_once()
+
+    def _run_once(self) -> RetentionReport:
+        started = time.perf_counter()
+        # File names follow the handler's local date; the age cut-off follows
+        # LOG_USE_UTC like the rest of the logging settings.
+        today = datetime.now().strftime(_DATE_FORMAT)
+        report = RetentionReport()
+
+        changed = self._ensure_manifest(today)
+        changed = self._absorb_closed_days(today) or changed
+        assert self._closed is not None
+
+        try:
+            report.active_bytes = self._path(today).stat().st_size
+        except FileNotFoundError:
+            report.active_bytes = 0
+
+        if self.retention_days > 0:
+            now = datetime.now(UTC if self.use_utc else None).date()
+            cutoff = (now - timedelta(days=self.retention_days)).strftime(_DATE_FORMAT)
+            while self._closed and next(iter(self._closed)) < cutoff:
+                if not self._delete_oldest("age", report):
+                    break
+
+        if self.max_total_bytes > 0:
+            while (
+                self._closed
+                and self._closed_bytes + report.active_bytes > self.max_total_bytes
+            ):
+                if not self._delete_oldest("quota", report):
+                    break
+            if report.active_bytes > self.max_total_bytes:
+                logger.warning(
+                    "log.retention.quota_exceeded | file=%s | active_bytes=%s | "
+                    "max_total_bytes=%s",
+                    self._path(today).name,
+                    report.active_bytes,
+                    self.max_total_bytes,
+                )
+
+        if changed or report.deleted:
+            try:
+                self._save_manifest()
+            except OSError:
+                logger.exception(
+                    "log.retention.manifest_write_failed | manifest=%s",
+                    self.manifest_path,
+                )
+
+        report.files = len(self._closed) + (1 if report.active_bytes else 0)
+        report.total_bytes = self._closed_bytes + report.active_bytes
+        report.duration_ms = (time.perf_counter() - started) * 1000
+        self.passes += 1
+        self.last_report = report
+        logger.log(
+            logging.INFO if report.deleted else logging.DEBUG,
+            "log.retention.pass_completed | files=%s | total_bytes=%s | "
+            "deleted=%s | freed_bytes=%s | duration_ms=%.2f",
+            report.files,
+            report.total_bytes,
+            len(report.deleted),
+            report.freed_bytes,
+            report.duration_ms,
+        )
+        return report
+
+    def _run_logged(self) -> None:
+        try:
+            self.run_once()
+        except Exception:
+            logger.exception("log.retention.pass_failed | log_dir=%s", self.log_dir)
+
+    async def run_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.to_thread(self._run_logged)
+            await asyncio.sleep(interval_seconds)
+
+    def run_until(self, stop: threading.Event, interval_seconds: float) -> None:
+        while not stop.is_set():
+            self._run_logged()
+            stop.wait(interval_seconds)
+
+
+def _next_day(day: str) -> str:
+    parsed = datetime.strptime(day, _DATE_FORMAT).date()
+    return (parsed + timedelta(days=1)).strftime(_DATE_FORMAT)
+
+
+def _previous_day(day: str) -> str:
+    parsed = datetime.strptime(day, _DATE_FORMAT).date()
+    return (parsed - timedelta(days=1)).strftime(_DATE_FORMAT)
@@ -0,0 +1,300 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Literal
+
+from .config import get_settings
+from .log_retention import LogRetentionManager
+
+MAX_DATAGRAM_BYTES = 60 * 1024
+OverflowPolicy = Literal["drop_newest", "drop_oldest"]
+
+
+class SocketLogHandler(logging.Handler):
+    # Formats records in the worker and hands them to a background sender
+    # thread, so emit() never waits on the socket. When the writer process
+    # falls behind, the sender blocks and the bounded queue absorbs the burst;
+    # once it is full, records are dropped according to the overflow policy.
+    def __init__(
+        self,
+        socket_path: str,
+        queue_size: int = 10_000,
+        overflow: OverflowPolicy = "drop_newest",
+    ) -> None:
+        super().__init__()
+        self._socket_path = socket_path
+        self._queue_size = max(queue_size, 1)
+        self._overflow = overflow
+        self._queue: deque[bytes] = deque()
+        self._condition = threading.Condition()
+        self._pending_drops = 0
+        self._in_flight = 0
+        self._closed = False
+        self.dropped_total = 0
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer-client", daemon=True
+        )
+        self._thread.start()
+
+    def _encode(self, record: logging.LogRecord) -> bytes:
+        payload = (self.format(record) + "\n").encode("utf-8", "replace")
+        if len(payload) > MAX_DATAGRAM_BYTES:
+            payload = payload[: MAX_DATAGRAM_BYTES - 1] + b"\n"
+        return payload
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            payload = self._encode(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= self._queue_size:
+                self._pending_drops += 1
+                self.dropped_total += 1
+                if self._overflow == "drop_newest":
+                    return
+                self._queue.popleft()
+            self._queue.append(payload)
+            self._condition.notify()
+
+    def _drop_notice(self, count: int) -> bytes | None:
+        record = logging.makeLogRecord(
+            {
+                "name": "backend.log_writer",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "log.writer.records_dropped | count=%s | policy=%s",
+                "args": (count, self._overflow),
+            }
+        )
+        if not self.filter(record):
+            return None
+        try:
+            return self._encode(record)
+        except Exception:
+            return None
+
+    def _take_batch(self) -> tuple[list[bytes], int] | None:
+        with self._condition:
+            while not self._queue and not self._pending_drops and not self._closed:
+                self._condition.wait()
+            if self._closed and not self._queue:
+                return None
+            batch = list(self._queue)
+            self._queue.clear()
+            self._in_flight = len(batch)
+            # Left pending until the notice for them has actually been sent.
+            drops = self._pending_drops
+        return batch, drops
+
+    def _send(self, batch: list[bytes]) -> int:
+        delivered = 0
+        datagram = bytearray()
+        datagram_records = 0
+        for payload in batch:
+            if datagram and len(datagram) + len(payload) > MAX_DATAGRAM_BYTES:
+                if self._send_datagram(bytes(datagram)):
+                    delivered += datagram_records
+                datagram.clear()
+                datagram_records = 0
+            datagram.extend(payload)
+            datagram_records += 1
+        if datagram and self._send_datagram(bytes(datagram)):
+            delivered += datagram_records
+        return delivered
+
+    def _send_datagram(self, datagram: bytes) -> bool:
+        try:
+            self._socket.sendto(datagram, self._socket_path)
+        except OSError:
+            return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            taken = self._take_batch()
+            if taken is None:
+                return
+            batch, drops = taken
+            # The notice goes out as its own datagram, so whether it arrived
+            # does not depend on which of the records around it got lost.
+            reported = 0
+            if drops:
+                notice = self._drop_notice(drops)
+                # A notice the filters reject is not retried either.
+                if notice is None or self._send_datagram(notice):
+                    reported = drops
+
+            delivered = self._send(batch)
+            lost = len(batch) - delivered
+            with self._condition:
+                self._in_flight = 0
+                self.dropped_total += lost
+                self._pending_drops += lost - reported
+                self._condition.notify_all()
+            if lost or reported < drops:
+                time.sleep(0.1)
+
+    def flush(self, timeout: float = 1.0) -> None:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+        self._socket.close()
+        super().close()
+
+
+class DailyLogSink:
+    def __init__(
+        self,
+        log_dir: Path,
+        prefix: str,
+        retention_days: int,
+        use_utc: bool,
+        max_total_bytes: int = 0,
+    ) -> None:
+        self._log_dir = log_dir
+        self._prefix = prefix
+        self.retention = LogRetentionManager(
+            log_dir=log_dir,
+            prefix=prefix,
+            retention_days=retention_days,
+            max_total_bytes=max_total_bytes,
+            use_utc=use_utc,
+        )
+        self._current_date = ""
+        self._stream: IO[bytes] | None = None
+
+    def _ensure_stream(self) -> IO[bytes]:
+        today = datetime.now().strftime("%Y-%m-%d")
+        if today == self._current_date and self._stream is not None:
+            return self._stream
+
+        if self._stream is not None:
+            self._stream.close()
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        self.retention.run_once()
+        self._current_date = today
+        filename = self._log_dir / f"{self._prefix}-{today}.log"
+        self._stream = filename.open("ab")
+        return self._stream
+
+    def write_batch(self, chunks: list[bytes]) -> None:
+        stream = self._ensure_stream()
+        stream.write(b"".join(chunks))
+        stream.flush()
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class LogWriterServer:
+    def __init__(
+        self,
+        socket_path: str,
+        sink: DailyLogSink,
+        max_batch: int = 512,
+        poll_interval: float = 0.5,
+    ) -> None:
+        self._socket_path = socket_path
+        self.sink = sink
+        self._max_batch = max_batch
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+
+        Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        self._socket.bind(socket_path)
+        self._socket.settimeout(poll_interval)
+
+    def _drain(self, first: bytes) -> list[bytes]:
+        batch = [first]
+        self._socket.setblocking(False)
+        try:
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(self._socket.recv(MAX_DATAGRAM_BYTES))
+                except BlockingIOError:
+                    break
+        finally:
+            self._socket.settimeout(self._poll_interval)
+        return batch
+
+    def serve_forever(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    first = self._socket.recv(MAX_DATAGRAM_BYTES)
+                except TimeoutError:
+                    continue
+                self.sink.write_batch(self._drain(first))
+        finally:
+            self._socket.close()
+            self.sink.close()
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def main() -> None:
+    settings = get_settings()
+    log_path = Path(settings.log_file_path)
+    server = LogWriterServer(
+        socket_path=settings.log_writer_socket_path,
+        sink=DailyLogSink(
+            log_dir=log_path.parent,
+            prefix=log_path.stem,
+            retention_days=settings.log_retention_days,
+            use_utc=settings.log_use_utc,
+            max_total_bytes=settings.log_retention_max_bytes,
+        ),
+    )
+    stop_retention = threading.Event()
+    retention_thread = threading.Thread(
+        target=server.sink.retention.run_until,
+        args=(stop_retention, settings.log_retention_interval_seconds),
+        name="log-retention",
+        daemon=True,
+    )
+
+    def _handle_stop(signum: int, _frame: object) -> None:
+        stop_retention.set()
+        server.stop()
+
+    signal.signal(signal.SIGTERM, _handle_stop)
+    signal.signal(signal.SIGINT, _handle_stop)
+    print(f"log writer listening on {settings.log_writer_socket_path}", flush=True)
+    retention_thread.start()
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
+import contextlib
 import contextvars
 import logging
 import logging.config
 import time
-from datetime import UTC, datetime
+from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from .config import Settings
 
+LOG_FORMAT = (
+    "%(asctime)s | %(levelname)s | %(name)s | %(request_id)s | "
+    "service=%(service)s | version=%(version)s | environment=%(environment)s | "
+    "%(message)s"
+)
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Settings that apply_logging_settings can change on a running process.
+LOGGING_FIELDS = (
+    "log_level",
+    "log_use_utc",
+    "log_file_path",
+    "service_name",
+    "app_version",
+    "app_env",
+)
+
 _request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
     "request_id", default="-"
 )
@@ -29,6 +47,9 @@ class RequestIdFilter(logging.Filter):
 class StaticFieldsFilter(logging.Filter):
     def __init__(self, service: str, version: str, environment: str) -> None:
         super().__init__()
+        self.update(service, version, environment)
+
+    def update(self, service: str, version: str, environment: str) -> None:
         self._service = service
         self._version = version
         self._environment = environment
@@ -71,6 +92,18 @@ class DailyPrefixFileHandler(logging.Handler):
         filename = self._log_dir / f"{self._prefix}-{today}.log"
         self._handler = logging.FileHandler(filename, encoding="utf-8")
 
+    def retarget(self, log_dir: str | Path, prefix: str) -> None:
+        with self.lock or contextlib.nullcontext():
+            if Path(log_dir) == self._log_dir and prefix == self._prefix:
+                return
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            self._log_dir = Path(log_dir)
+            self._prefix = prefix
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+            self._current_date = ""
+
     def emit(self, record: logging.LogRecord) -> None:
         self._ensure_handler()
         if self._handler is None:
@@ -84,41 +117,32 @@ class DailyPrefixFileHandler(logging.Handler):
         super().close()
 
 
-def _cleanup_old_logs(
-    log_dir: Path, prefix: str, retention_days: int, use_utc: bool
-) -> None:
-    if retention_days <= 0:
-        return
-
-    now = datetime.now(UTC if use_utc else None)
-    today = now.date()
-
-    for file in log_dir.glob(f"{prefix}-*.log"):
-        date_str = file.stem[len(prefix) + 1 :]
-        try:
-            file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            continue
-
-        if (today - file_date).days > retention_days:
-            try:
-                file.unlink()
-            except OSError:
-                continue
-
-
 def setup_logging(settings: Settings) -> None:
     log_path = Path(settings.log_file_path)
     log_path.parent.mkdir(parents=True, exist_ok=True)
     log_dir = log_path.parent
     log_prefix = log_path.stem
 
-    _cleanup_old_logs(
-        log_dir=log_dir,
-        prefix=log_prefix,
-        retention_days=settings.log_retention_days,
-        use_utc=settings.log_use_utc,
-    )
+    file_handler: dict[str, Any]
+    if settings.log_writer_mode == "socket":
+        # The log-writer process owns the daily files, rotation and retention;
+        # otherwise the app's lifespan runs the retention manager.
+        file_handler = {
+            "()": "backend.app.core.log_writer.SocketLogHandler",
+            "formatter": "default",
+            "filters": ["request_id", "static_fields"],
+            "socket_path": settings.log_writer_socket_path,
+            "queue_size": settings.log_writer_queue_size,
+            "overflow": settings.log_writer_overflow,
+        }
+    else:
+        file_handler = {
+            "()": "backend.app.core.logging.DailyPrefixFileHandler",
+            "formatter": "default",
+            "filters": ["request_id", "static_fields"],
+            "log_dir": str(log_dir),
+            "prefix": log_prefix,
+        }
 
     formatter_class = (
         "backend.app.core.logging.UTCFormatter"
@@ -133,13 +157,8 @@ def setup_logging(settings: Settings) -> None:
             "formatters": {
                 "default": {
                     "()": formatter_class,
-                    "format": (
-                        "%(asctime)s | %(levelname)s | %(name)s | "
-                        "%(request_id)s | service=%(service)s | "
-                        "version=%(version)s | environment=%(environment)s | "
-                        "%(message)s"
-                    ),
-                    "datefmt": "%Y-%m-%d %H:%M:%S",
+                    "format": LOG_FORMAT,
+                    "datefmt": LOG_DATE_FORMAT,
                 },
             },
             "filters": {
@@ -157,13 +176,7 @@ def setup_logging(settings: Settings) -> None:
                     "formatter": "default",
                     "filters": ["request_id", "static_fields"],
                 },
-                "file": {
-                    "()": "backend.app.core.logging.DailyPrefixFileHandler",
-                    "formatter": "default",
-                    "filters": ["request_id", "static_fields"],
-                    "log_dir": str(log_dir),
-                    "prefix": log_prefix,
-                },
+                "file": file_handler,
             },
             "root": {
                 "handlers": ["console", "file"],
@@ -171,3 +184,26 @@ def setup_logging(settings: Settings) -> None:
             },
         }
     )
+
+
+def apply_logging_settings(settings: Settings) -> None:
+    """Re-applies level, fields, clock and file target to the live handlers.
+
+    Unlike `setup_logging` this keeps the existing handler objects, so open
+    files, the socket sender's queue and records in flight are not disturbed.
+    """
+    root = logging.getLogger()
+    root.setLevel(settings.log_level)
+    formatter_class = UTCFormatter if settings.log_use_utc else logging.Formatter
+    formatter = formatter_class(LOG_FORMAT, LOG_DATE_FORMAT)
+    log_path = Path(settings.log_file_path)
+
+    for handler in root.handlers:
+        handler.setFormatter(formatter)
+        for log_filter in handler.filters:
+            if isinstance(log_filter, StaticFieldsFilter):
+                log_filter.update(
+                    settings.service_name, settings.app_version, settings.app_env
+                )
+        if isinstance(handler, DailyPrefixFileHandler):
+            handler.retarget(log_path.parent, log_path.stem)
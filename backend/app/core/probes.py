@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .draining import DrainController
+from .log_retention import LogRetentionManager
+
+logger = logging.getLogger("backend.probes")
+
+LIVENESS_PATH = "/livez"
+READINESS_PATH = "/readyz"
+
+CheckFunction = Callable[[], tuple[bool, str]]
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    ok: bool
+    detail: str
+    duration_ms: float
+
+
+def _json_response(status: int, body: bytes) -> tuple[Message, Message]:
+    start: Message = {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"cache-control", b"no-store"),
+        ],
+    }
+    return start, {"type": "http.response.body", "body": body}
+
+
+_LIVE = _json_response(200, b'{"status":"ok"}')
+_PENDING = _json_response(503, b'{"status":"pending","checks":{}}')
+_DRAINING = _json_response(503, b'{"status":"draining","checks":{}}')
+_EMPTY_BODY: Message = {"type": "http.response.body", "body": b""}
+
+
+class ReadinessMonitor:
+    """Runs the registered readiness checks in the background and caches the verdict.
+
+    A probe only reads the prebuilt response, so however often it is polled
+    it never runs a check itself. Blocking checks run in a worker thread;
+    the event-loop lag is measured by how late the monitor's own sleep
+    wakes up.
+    """
+
+    def __init__(self, interval_seconds: float, max_loop_lag_ms: float) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.loop_lag_ms = 0.0
+        self.ready: bool | None = None
+        self.results: dict[str, CheckResult] = {}
+        self.response = _PENDING
+        self._checks: dict[str, tuple[CheckFunction, bool]] = {}
+        self.register("event_loop_lag", self._loop_lag_check, blocking=False)
+
+    def register(self, name: str, check: CheckFunction, blocking: bool = True) -> None:
+        self._checks[name] = (check, blocking)
+
+    def _loop_lag_check(self) -> tuple[bool, str]:
+        return (
+            self.loop_lag_ms <= self.max_loop_lag_ms,
+            f"lag_ms={self.loop_lag_ms:.1f}",
+        )
+
+    async def _run_check(self, check: CheckFunction, blocking: bool) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            if blocking:
+                ok, detail = await asyncio.to_thread(check)
+            else:
+                ok, detail = check()
+        except Exception as exc:
+            ok, detail = False, f"error={exc}"
+        return CheckResult(ok, detail, round((time.perf_counter() - started) * 1000, 2))
+
+    async def run_once(self) -> bool:
+        results = {
+            name: await self._run_check(check, blocking)
+            for name, (check, blocking) in list(self._checks.items())
+        }
+        ready = all(result.ok for result in results.values())
+        body = json.dumps(
+            {
+                "status": "ready" if ready else "not_ready",
+                "checks": {name: asdict(result) for name, result in results.items()},
+            },
+            separators=(",", ":"),
+        ).encode()
+        self.results = results
+        self.response = _json_response(200 if ready else 503, body)
+
+        if ready != self.ready:
+            failing = [name for name, result in results.items() if not result.ok]
+            if ready:
+                logger.info("readiness.changed | ready=true")
+            else:
+                logger.warning(
+                    "readiness.changed | ready=false | failing=%s", ",".join(failing)
+                )
+        self.ready = ready
+        return ready
+
+    async def run_periodically(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.run_once()
+            scheduled = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self.loop_lag_ms = max((loop.time() - scheduled) * 1000, 0.0)
+
+
+def log_dir_writable_check(log_dir: Path) -> CheckFunction:
+    def check() -> tuple[bool, str]:
+        try:
+            with tempfile.TemporaryFile(dir=log_dir, prefix=".readyz-") as probe:
+                probe.write(b"ok")
+                os.fsync(probe.fileno())
+        except OSError as exc:
+            return False, f"error={exc.strerror or exc}"
+        return True, "writable"
+
+    return check
+
+
+def disk_quota_check(
+    log_dir: Path, min_free_bytes: int, retention: LogRetentionManager | None
+) -> CheckFunction:
+    def check() -> tuple[bool, str]:
+        free = shutil.disk_usage(log_dir).free
+        if free < min_free_bytes:
+            return False, f"free_bytes={free} | min_free_bytes={min_free_bytes}"
+        # Retention keeps the logs under their quota; staying above it means
+        # deletion is failing and the disk will fill up.
+        report = retention.last_report if retention is not None else None
+        if (
+            report is not None
+            and retention is not None
+            and retention.max_total_bytes
+            and report.total_bytes > retention.max_total_bytes
+        ):
+            return False, (
+                f"log_bytes={report.total_bytes} | "
+                f"max_log_bytes={retention.max_total_bytes}"
+            )
+        return True, f"free_bytes={free}"
+
+    return check
+
+
+def drain_check(controller: DrainController) -> CheckFunction:
+    def check() -> tuple[bool, str]:
+        return controller.accepting, f"state={controller.state}"
+
+    return check
+
+
+class ProbeMiddleware:
+    """Answers `/livez` and `/readyz` before any other middleware runs.
+
+    Both are served from prebuilt messages: no logging, no request id, no
+    routing or validation. Liveness stays `200` while draining; readiness
+    switches to `503` as soon as a drain starts, without waiting for the
+    next background pass.
+    """
+
+    def __init__(
+        self, app: ASGIApp, monitor: ReadinessMonitor, drain: DrainController
+    ) -> None:
+        self.app = app
+        self.monitor = monitor
+        self.drain = drain
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path == LIVENESS_PATH:
+                response = _LIVE
+            elif path == READINESS_PATH:
+                response = self.monitor.response if self.drain.accepting else _DRAINING
+            else:
+                await self.app(scope, receive, send)
+                return
+            start, body = response
+            await send(start)
+            await send(body if scope["method"] != "HEAD" else _EMPTY_BODY)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,132 @@
+import logging
+from time import perf_counter
+from uuid import uuid4
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .logging import reset_request_id, set_request_id
+from .request_metrics import RequestMetrics, RequestResourceTracker, ResourceSample
+
+logger = logging.getLogger("backend.http")
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_key(scope: Scope) -> str:
+    # Requests that matched no route (404s, scanners) share one key: keying
+    # them by raw path would grow the stats table without bound.
+    route = scope.get("route")
+    route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+    return f"{scope['method']} {route_path}"
+
+
+def _format_sample(sample: ResourceSample) -> tuple[str, tuple[object, ...]]:
+    alloc_peak_kb = "-" if sample.alloc_peak_kb is None else sample.alloc_peak_kb
+    return (
+        " | cpu_ms=%.2f | wait_ms=%.2f | bytes_in=%s | bytes_out=%s | "
+        "alloc_peak_kb=%s | log_records=%s",
+        (
+            sample.cpu_ms,
+            sample.wait_ms,
+            sample.bytes_in,
+            sample.bytes_out,
+            alloc_peak_kb,
+            sample.log_records,
+        ),
+    )
+
+
+class RequestLoggingMiddleware:
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    def _finish(
+        self,
+        tracker: RequestResourceTracker | None,
+        scope: Scope,
+        status_code: int,
+        elapsed_ms: float,
+    ) -> tuple[str, tuple[object, ...]]:
+        route = route_key(scope)
+        self.metrics.record_latency(route, elapsed_ms)
+        if tracker is None:
+            return "", ()
+        sample = tracker.finish()
+        self.metrics.record(route, status_code, elapsed_ms, sample)
+        return _format_sample(sample)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = headers.get("X-Request-Id", uuid4().hex)
+        token = set_request_id(request_id)
+        start_time = perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client is not None else None
+        tracker = self.metrics.start()
+        status_code = 500
+
+        logger.debug(
+            "http.request.started | method=%s | path=%s | client_ip=%s",
+            method,
+            path,
+            client_host,
+        )
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if tracker is not None and message["type"] == "http.request":
+                tracker.bytes_in += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-Id"] = request_id
+            elif tracker is not None and message["type"] == "http.response.body":
+                tracker.bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            elapsed_ms = round((perf_counter() - start_time) * 1000, 2)
+            sample_format, sample_args = self._finish(tracker, scope, 500, elapsed_ms)
+            logger.exception(
+                "http.request.failed | method=%s | path=%s | "
+                "duration_ms=%.2f | client_ip=%s" + sample_format,
+                method,
+                path,
+                elapsed_ms,
+                client_host,
+                *sample_args,
+            )
+            raise
+        else:
+            elapsed_ms = round((perf_counter() - start_time) * 1000, 2)
+            sample_format, sample_args = self._finish(
+                tracker, scope, status_code, elapsed_ms
+            )
+            logger.info(
+                "http.request.completed | method=%s | path=%s | "
+                "status_code=%s | duration_ms=%.2f | client_ip=%s" + sample_format,
+                method,
+                path,
+                status_code,
+                elapsed_ms,
+                client_host,
+                *sample_args,
+            )
+        finally:
+            if tracker is not None:
+                self.metrics.release(tracker)
+            reset_request_id(token)
@@ -0,0 +1,222 @@
+import contextvars
+import logging
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Final
+
+from .histograms import LatencyHistogram
+
+# Routes beyond this many are folded into one entry, so the table stays
+# bounded however many distinct keys show up.
+MAX_ROUTES: Final[int] = 256
+OVERFLOW_ROUTE: Final[str] = "<other>"
+
+_log_record_counter_var: contextvars.ContextVar[list[int] | None] = (
+    contextvars.ContextVar("log_record_counter", default=None)
+)
+_log_record_counter_installed = False
+
+
+def install_log_record_counter() -> None:
+    global _log_record_counter_installed
+    if _log_record_counter_installed:
+        return
+
+    base_factory = logging.getLogRecordFactory()
+
+    def counting_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        counter = _log_record_counter_var.get()
+        if counter is not None:
+            counter[0] += 1
+        return base_factory(*args, **kwargs)
+
+    logging.setLogRecordFactory(counting_factory)
+    _log_record_counter_installed = True
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    cpu_ms: float
+    wait_ms: float
+    bytes_in: int
+    bytes_out: int
+    alloc_peak_kb: float | None
+    log_records: int
+
+
+class RequestResourceTracker:
+    # CPU time is read from the event-loop thread, so under concurrency it
+    # includes work done for other requests interleaved with this one. The
+    # same goes for the allocation peak: tracemalloc keeps one process-wide
+    # peak, so RequestMetrics lets only one request at a time reset and read
+    # it, and the result covers everything allocated during that request.
+    def __init__(self, trace_allocations: bool) -> None:
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.thread_time()
+        self._trace_allocations = trace_allocations and tracemalloc.is_tracing()
+        self._start_alloc = 0
+        if self._trace_allocations:
+            tracemalloc.reset_peak()
+            self._start_alloc = tracemalloc.get_traced_memory()[0]
+        self._log_records = [0]
+        self._token = _log_record_counter_var.set(self._log_records)
+
+    @property
+    def traces_allocations(self) -> bool:
+        return self._trace_allocations
+
+    def finish(self) -> ResourceSample:
+        _log_record_counter_var.reset(self._token)
+        elapsed_ms = (time.perf_counter() - self._start_wall) * 1000
+        cpu_ms = (time.thread_time() - self._start_cpu) * 1000
+
+        alloc_peak_kb: float | None = None
+        if self._trace_allocations:
+            peak = tracemalloc.get_traced_memory()[1]
+            alloc_peak_kb = round(max(peak - self._start_alloc, 0) / 1024, 2)
+
+        return ResourceSample(
+            cpu_ms=round(cpu_ms, 2),
+            wait_ms=round(max(elapsed_ms - cpu_ms, 0.0), 2),
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            alloc_peak_kb=alloc_peak_kb,
+            log_records=self._log_records[0],
+        )
+
+
+class _RouteStats:
+    __slots__ = (
+        "count",
+        "errors",
+        "total_duration_ms",
+        "max_duration_ms",
+        "durations",
+        "total_cpu_ms",
+        "total_wait_ms",
+        "total_bytes_in",
+        "total_bytes_out",
+        "max_alloc_peak_kb",
+        "total_log_records",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_duration_ms = 0.0
+        self.max_duration_ms = 0.0
+        self.durations = LatencyHistogram()
+        self.total_cpu_ms = 0.0
+        self.total_wait_ms = 0.0
+        self.total_bytes_in = 0
+        self.total_bytes_out = 0
+        self.max_alloc_peak_kb: float | None = None
+        self.total_log_records = 0
+
+    def add(self, status_code: int, duration_ms: float, sample: ResourceSample) -> None:
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.total_duration_ms += duration_ms
+        self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        self.durations.add(duration_ms)
+        self.total_cpu_ms += sample.cpu_ms
+        self.total_wait_ms += sample.wait_ms
+        self.total_bytes_in += sample.bytes_in
+        self.total_bytes_out += sample.bytes_out
+        self.total_log_records += sample.log_records
+        if sample.alloc_peak_kb is not None:
+            self.max_alloc_peak_kb = max(
+                self.max_alloc_peak_kb or 0.0, sample.alloc_peak_kb
+            )
+
+    def as_dict(self, route: str) -> dict[str, Any]:
+        count = self.count or 1
+        return {
+            "route": route,
+            "count": self.count,
+            "errors": self.errors,
+            "avg_duration_ms": round(self.total_duration_ms / count, 2),
+            "max_duration_ms": round(self.max_duration_ms, 2),
+            "p95_duration_ms": self.durations.percentile(0.95),
+            "avg_cpu_ms": round(self.total_cpu_ms / count, 2),
+            "avg_wait_ms": round(self.total_wait_ms / count, 2),
+            "total_bytes_in": self.total_bytes_in,
+            "total_bytes_out": self.total_bytes_out,
+            "max_alloc_peak_kb": self.max_alloc_peak_kb,
+            "avg_log_records": round(self.total_log_records / count, 2),
+        }
+
+
+class RequestMetrics:
+    def __init__(
+        self, sample_rate: float, trace_allocations: bool, max_routes: int = MAX_ROUTES
+    ) -> None:
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.max_routes = max(max_routes, 1)
+        self._trace_allocations = trace_allocations
+        self._alloc_tracker: RequestResourceTracker | None = None
+        self._routes: dict[str, _RouteStats] = {}
+        self._latencies: dict[str, LatencyHistogram] = {}
+
+    def start(self) -> RequestResourceTracker | None:
+        if self.sample_rate <= 0.0:
+            return None
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None
+        # Another request already owns the allocation peak; resetting it here
+        # would corrupt that request's number, so this one goes without.
+        trace_allocations = self._trace_allocations and self._alloc_tracker is None
+        tracker = RequestResourceTracker(trace_allocations)
+        if tracker.traces_allocations:
+            self._alloc_tracker = tracker
+        return tracker
+
+    def release(self, tracker: RequestResourceTracker) -> None:
+        """Called once the request is over, whether or not it was recorded."""
+        if self._alloc_tracker is tracker:
+            self._alloc_tracker = None
+
+    def _bounded_key(self, table: dict[str, Any], route: str) -> str:
+        if route in table or len(table) < self.max_routes:
+            return route
+        return OVERFLOW_ROUTE
+
+    def record(
+        self,
+        route: str,
+        status_code: int,
+        duration_ms: float,
+        sample: ResourceSample,
+    ) -> None:
+        route = self._bounded_key(self._routes, route)
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = _RouteStats()
+        stats.add(status_code, duration_ms, sample)
+
+    def record_latency(self, route: str, duration_ms: float) -> None:
+        """Counts every request, sampled or not; one histogram add per call."""
+        route = self._bounded_key(self._latencies, route)
+        histogram = self._latencies.get(route)
+        if histogram is None:
+            histogram = self._latencies[route] = LatencyHistogram()
+        histogram.add(duration_ms)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [stats.as_dict(route) for route, stats in sorted(self._routes.items())]
+
+    def latency_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Count, average and p95 per route over all requests, not just samples."""
+        return {
+            route: {
+                "count": histogram.count,
+                "avg_ms": round(histogram.total_ms / histogram.count, 2),
+                "p95_ms": histogram.percentile(0.95),
+            }
+            for route, histogram in self._latencies.items()
+        }
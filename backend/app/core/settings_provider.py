@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import signal
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from .config import (
+    Settings,
+    apply_env_file,
+    install_settings,
+    load_settings,
+    plan_env_file,
+)
+
+logger = logging.getLogger("backend.settings")
+
+SettingsCallback = Callable[[Settings, Settings], None]
+
+
+@dataclass(frozen=True)
+class SettingsReload:
+    version: int
+    reason: str
+    changed: tuple[str, ...]
+    requires_restart: tuple[str, ...] = ()
+
+
+def changed_fields(previous: Settings, current: Settings) -> tuple[str, ...]:
+    return tuple(
+        item.name
+        for item in fields(Settings)
+        if getattr(previous, item.name) != getattr(current, item.name)
+    )
+
+
+class SettingsProvider:
+    """Holds the current immutable `Settings` snapshot and swaps it on reload.
+
+    Readers use `provider.current` (or `get_settings()`, whose cache is
+    refreshed on reload) and keep the snapshot they got for the rest of their
+    work. A reload builds and validates a complete new snapshot before the
+    environment or the snapshot change, so nobody observes a half-applied
+    mix, and a failed reload keeps the old one. Subscribers run after the
+    swap, serialized, and only when one of the fields they registered for
+    changed.
+
+    Only fields someone subscribed to or marked reloadable are applied. Other
+    changes keep their old value in the snapshot, so it always describes what
+    is in effect, and are reported as requiring a restart.
+    """
+
+    def __init__(self, settings: Settings, env_file: Path | None = None) -> None:
+        self.current = settings
+        self.version = 1
+        self.env_file = env_file
+        self.last_reload: SettingsReload | None = None
+        self._subscribers: list[tuple[frozenset[str], SettingsCallback]] = []
+        self._reloadable: set[str] = set()
+        self._lock = threading.Lock()
+        self._env_file_state = self._stat_env_file()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._signal: signal.Signals | None = None
+        self._previous_handler: Any = None
+
+    def subscribe(self, callback: SettingsCallback, fields: Iterable[str]) -> None:
+        self._subscribers.append((frozenset(fields), callback))
+        self._reloadable.update(fields)
+
+    def mark_reloadable(self, fields: Iterable[str]) -> None:
+        """Fields whose readers take the current snapshot on every use."""
+        self._reloadable.update(fields)
+
+    def reload(self, reason: str) -> SettingsReload:
+        with self._lock:
+            plan = None
+            if self.env_file is not None:
+                self._env_file_state = self._stat_env_file()
+                plan = plan_env_file(self.env_file)
+            # Raises on invalid values before anything is applied.
+            loaded = load_settings(plan.environ if plan is not None else None)
+            if plan is not None:
+                apply_env_file(plan)
+            previous = self.current
+            pending = changed_fields(previous, loaded)
+            requires_restart = tuple(
+                name for name in pending if name not in self._reloadable
+            )
+            changed = tuple(name for name in pending if name in self._reloadable)
+            if changed:
+                current = replace(
+                    loaded,
+                    **{name: getattr(previous, name) for name in requires_restart},
+                )
+                self.current = current
+                self.version += 1
+                install_settings(current)
+            result = SettingsReload(self.version, reason, changed, requires_restart)
+            self.last_reload = result
+            if changed:
+                self._notify(previous, current, set(changed))
+
+        if changed:
+            logger.info(
+                "settings.reloaded | reason=%s | version=%s | changed=%s",
+                reason,
+                result.version,
+                ",".join(changed),
+            )
+        else:
+            logger.debug("settings.reload.unchanged | reason=%s", reason)
+        if requires_restart:
+            logger.warning(
+                "settings.reload.requires_restart | reason=%s | fields=%s",
+                reason,
+                ",".join(requires_restart),
+            )
+        return result
+
+    def _notify(self, previous: Settings, current: Settings, changed: set[str]) -> None:
+        for interests, callback in self._subscribers:
+            if not interests & changed:
+                continue
+            try:
+                callback(previous, current)
+            except Exception:
+                logger.exception(
+                    "settings.subscriber_failed | subscriber=%s",
+                    getattr(callback, "__qualname__", repr(callback)),
+                )
+
+    def reload_logged(self, reason: str) -> None:
+        try:
+            self.reload(reason)
+        except (OSError, ValueError) as exc:
+            logger.error("settings.reload_failed | reason=%s | error=%s", reason, exc)
+
+    def _stat_env_file(self) -> tuple[int, int] | None:
+        if self.env_file is None:
+            return None
+        try:
+            stat = self.env_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def watch(self, interval: float) -> None:
+        """Reloads whenever the env file's mtime or size changes."""
+        while True:
+            await asyncio.sleep(interval)
+            if self._stat_env_file() != self._env_file_state:
+                self.reload_logged("file")
+
+    def install_signal_handler(self, signal_name: str) -> bool:
+        # Same constraints as DrainController: main thread only, and the
+        # reload itself runs on the event loop rather than in the handler.
+        if not signal_name or threading.current_thread() is not threading.main_thread():
+            return False
+        if not hasattr(signal, signal_name):
+            return False
+
+        self._signal = signal.Signals[signal_name]
+        self._loop = asyncio.get_running_loop()
+        self._previous_handler = signal.signal(self._signal, self._handle_signal)
+        return True
+
+    def remove_signal_handler(self) -> None:
+        if self._signal is not None and self._previous_handler is not None:
+            signal.signal(self._signal, self._previous_handler)
+            self._signal = None
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self.reload_logged, "signal")
@@ -0,0 +1,379 @@
+import gzip
+import json
+import logging
+import os
+import random
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("backend.capture")
+
+CAPTURE_MAGIC = b"FTCAP1\n"
+REDACTED = "[REDACTED]"
+_FRAME = struct.Struct("<I")
+_RECORD_HEAD = struct.Struct("<dfH")
+_SHORT = struct.Struct("<H")
+_LONG = struct.Struct("<I")
+_DIGEST_SIZE = 16
+
+
+def response_digest(body: bytes) -> bytes:
+    return blake2b(body, digest_size=_DIGEST_SIZE).digest()
+
+
+@dataclass(frozen=True)
+class CapturedRequest:
+    arrival: float
+    duration_ms: float
+    status: int
+    method: str
+    path: str
+    query: str
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+    response_digest: bytes
+    response_body: bytes
+
+
+def _pack_short(value: bytes) -> bytes:
+    value = value[:0xFFFF]
+    return _SHORT.pack(len(value)) + value
+
+
+def _pack_long(value: bytes) -> bytes:
+    return _LONG.pack(len(value)) + value
+
+
+def encode_record(record: CapturedRequest) -> bytes:
+    parts = [
+        _RECORD_HEAD.pack(record.arrival, record.duration_ms, record.status),
+        _pack_short(record.method.encode("ascii")),
+        _pack_short(record.path.encode("utf-8")),
+        _pack_short(record.query.encode("latin-1")),
+        _SHORT.pack(len(record.headers)),
+    ]
+    for name, value in record.headers:
+        parts.append(_pack_short(name.encode("latin-1")))
+        parts.append(_pack_short(value.encode("latin-1")))
+    parts.append(_pack_long(record.body))
+    parts.append(record.response_digest)
+    parts.append(_pack_long(record.response_body))
+    payload = b"".join(parts)
+    return _FRAME.pack(len(payload)) + payload
+
+
+def decode_record(payload: bytes) -> CapturedRequest:
+    arrival, duration_ms, status = _RECORD_HEAD.unpack_from(payload, 0)
+    offset = _RECORD_HEAD.size
+
+    def short() -> bytes:
+        nonlocal offset
+        (length,) = _SHORT.unpack_from(payload, offset)
+        offset += _SHORT.size
+        value = payload[offset : offset + length]
+        offset += length
+        return value
+
+    def long() -> bytes:
+        nonlocal offset
+        (length,) = _LONG.unpack_from(payload, offset)
+        offset += _LONG.size
+        value = payload[offset : offset + length]
+        offset += length
+        return value
+
+    method = short().decode("ascii")
+    path = short().decode("utf-8")
+    query = short().decode("latin-1")
+    (header_count,) = _SHORT.unpack_from(payload, offset)
+    offset += _SHORT.size
+    headers = tuple(
+        (short().decode("latin-1"), short().decode("latin-1"))
+        for _ in range(header_count)
+    )
+    body = long()
+    digest = payload[offset : offset + _DIGEST_SIZE]
+    offset += _DIGEST_SIZE
+    response_body = long()
+    return CapturedRequest(
+        arrival=arrival,
+        duration_ms=duration_ms,
+        status=status,
+        method=method,
+        path=path,
+        query=query,
+        headers=headers,
+        body=body,
+        response_digest=digest,
+        response_body=response_body,
+    )
+
+
+def read_capture(path: str | Path) -> Iterator[CapturedRequest]:
+    with gzip.open(path, "rb") as stream:
+        if stream.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a traffic capture file")
+        while True:
+            frame = stream.read(_FRAME.size)
+            if len(frame) < _FRAME.size:
+                return
+            (length,) = _FRAME.unpack(frame)
+            yield decode_record(stream.read(length))
+
+
+def read_captures(paths: Iterable[str | Path]) -> list[CapturedRequest]:
+    records = [record for path in paths for record in read_capture(path)]
+    records.sort(key=lambda record: record.arrival)
+    return records
+
+
+class CaptureWriter:
+    # One file per worker process so concurrent workers never interleave
+    # frames; the replay tool merges files by arrival time. write() only
+    # queues the record: encoding, gzip and file I/O happen on a background
+    # thread so the event loop never waits on the disk. When the thread falls
+    # behind and the bounded queue is full, new records are dropped.
+    def __init__(self, base_path: str | Path, queue_size: int = 10_000) -> None:
+        base = Path(base_path)
+        self.path = base.with_name(f"{base.stem}-{os.getpid()}{base.suffix}")
+        self._stream: gzip.GzipFile | None = None
+        self._queue_size = max(queue_size, 1)
+        self._queue: deque[CapturedRequest] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self.records_written = 0
+        self.records_dropped = 0
+
+    def _ensure_stream(self) -> gzip.GzipFile:
+        if self._stream is not None:
+            return self._stream
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        stream = gzip.open(self.path, "ab", compresslevel=6)
+        if is_new:
+            stream.write(CAPTURE_MAGIC)
+        self._stream = stream
+        return stream
+
+    def write(self, record: CapturedRequest) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= self._queue_size:
+                self.records_dropped += 1
+                return
+            self._queue.append(record)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="capture-writer", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _take_batch(self) -> list[CapturedRequest] | None:
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if self._closed and not self._queue:
+                return None
+            batch = list(self._queue)
+            self._queue.clear()
+            self._in_flight = len(batch)
+        return batch
+
+    def _run(self) -> None:
+        while (batch := self._take_batch()) is not None:
+            written = 0
+            try:
+                stream = self._ensure_stream()
+                for record in batch:
+                    stream.write(encode_record(record))
+                    written += 1
+            except OSError:
+                logger.exception("capture.write_failed | capture_path=%s", self.path)
+            with self._condition:
+                self._in_flight = 0
+                self.records_written += written
+                self.records_dropped += len(batch) - written
+                self._condition.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=1.0)
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+def _redact_json(value: Any, fields: frozenset[str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.lower() in fields else _redact_json(item, fields)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_json(item, fields) for item in value]
+    return value
+
+
+def _redact_pairs(
+    pairs: list[tuple[str, str]], fields: frozenset[str]
+) -> list[tuple[str, str]] | None:
+    """The pairs with sensitive values replaced; None when nothing matched."""
+    if not any(key.lower() in fields for key, _ in pairs):
+        return None
+    return [(key, REDACTED if key.lower() in fields else value) for key, value in pairs]
+
+
+class TrafficCaptureMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        writer: CaptureWriter,
+        sample_rate: float,
+        redact_headers: Iterable[str],
+        redact_fields: Iterable[str],
+        max_body_bytes: int,
+    ) -> None:
+        self.app = app
+        self.writer = writer
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.redact_headers = frozenset(name.lower() for name in redact_headers)
+        self.redact_fields = frozenset(name.lower() for name in redact_fields)
+        self.max_body_bytes = max_body_bytes
+
+    def _headers(
+        self, raw_headers: list[tuple[bytes, bytes]]
+    ) -> tuple[tuple[str, str], ...]:
+        headers = []
+        for raw_name, raw_value in raw_headers:
+            name = raw_name.decode("latin-1").lower()
+            value = raw_value.decode("latin-1")
+            headers.append((name, REDACTED if name in self.redact_headers else value))
+        return tuple(headers)
+
+    def _query(self, query_string: bytes) -> str:
+        query = query_string.decode("latin-1")
+        if not query or not self.redact_fields:
+            return query
+        pairs = parse_qsl(query, keep_blank_values=True)
+        redacted = _redact_pairs(pairs, self.redact_fields)
+        # Left byte-for-byte as sent unless a parameter had to be redacted.
+        return query if redacted is None else urlencode(redacted, safe="[]")
+
+    def _body(self, body: bytes, truncated: bool, content_type: str) -> bytes:
+        if not body or not self.redact_fields:
+            return body
+        # A body that cannot be inspected in full may still hold one of the
+        # redacted fields, so it is not stored at all.
+        if truncated:
+            return REDACTED.encode()
+        if "json" in content_type:
+            try:
+                parsed = json.loads(body)
+            except ValueError:
+                return REDACTED.encode()
+            redacted = _redact_json(parsed, self.redact_fields)
+            return json.dumps(redacted, separators=(",", ":")).encode("utf-8")
+        if "x-www-form-urlencoded" in content_type:
+            try:
+                pairs = parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+            except UnicodeDecodeError:
+                return REDACTED.encode()
+            form = _redact_pairs(pairs, self.redact_fields)
+            return body if form is None else urlencode(form, safe="[]").encode()
+        return REDACTED.encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (
+            self.sample_rate < 1.0 and random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.time()
+        started = time.perf_counter()
+        request_body = bytearray()
+        request_truncated = False
+        status = 500
+        digest = blake2b(digest_size=_DIGEST_SIZE)
+        response_body = bytearray()
+        response_truncated = False
+        response_content_type = ""
+
+        async def capture_receive() -> Message:
+            nonlocal request_truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                room = self.max_body_bytes - len(request_body)
+                if len(chunk) > room:
+                    request_truncated = True
+                request_body.extend(chunk[: max(room, 0)])
+            return message
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status, response_truncated, response_content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        response_content_type = value.decode("latin-1").lower()
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                digest.update(chunk)
+                room = self.max_body_bytes - len(response_body)
+                if len(chunk) > room:
+                    response_truncated = True
+                response_body.extend(chunk[: max(room, 0)])
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            headers = self._headers(scope["headers"])
+            content_type = dict(headers).get("content-type", "")
+            record = CapturedRequest(
+                arrival=arrival,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                status=status,
+                method=scope["method"],
+                path=scope["path"],
+                query=self._query(scope["query_string"]),
+                headers=headers,
+                body=self._body(bytes(request_body), request_truncated, content_type),
+                response_digest=digest.digest(),
+                # Responses often echo request fields back, so they get the
+                # same redaction; the digest still covers the full body.
+                response_body=self._body(
+                    bytes(response_body), response_truncated, response_content_type
+                ),
+            )
+            self.writer.write(record)
@@ -0,0 +1,108 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Final
+
+UNKNOWN: Final[str] = "unknown"
+
+
+@dataclass(frozen=True, slots=True)
+class UserAgentInfo:
+    browser: str
+    browser_version: str
+    os: str
+    device: str
+
+
+# Order matters: Chromium forks also say "Chrome" and "Safari", and Chrome
+# itself says "Safari", so the more specific tokens are tried first. Patterns
+# start with literal text and avoid re.I and a leading \b, which lets the
+# regex engine skip ahead to candidate positions instead of trying each one.
+_BROWSER_RULES: Final[tuple[tuple[re.Pattern[str], str], ...]] = (
+    (re.compile(r"Edg(?:e|A|iOS)?/(\d+)"), "Edge"),
+    (re.compile(r"(?:OPR|Opera)/(\d+)"), "Opera"),
+    (re.compile(r"SamsungBrowser/(\d+)"), "Samsung Internet"),
+    (re.compile(r"(?:Firefox|FxiOS)/(\d+)"), "Firefox"),
+    (re.compile(r"(?:Chrome|CriOS)/(\d+)"), "Chrome"),
+    (re.compile(r"Version/(\d+)[.\d]*(?: Mobile/\w+)? Safari/"), "Safari"),
+    (re.compile(r"(?:curl|Wget|python-requests|python-httpx)/(\d+)"), "HTTP client"),
+)
+_OS_RULES: Final[tuple[tuple[re.Pattern[str], str], ...]] = (
+    (re.compile(r"Windows NT (\d+\.\d+)"), "Windows"),
+    (re.compile(r"Android (\d+)"), "Android"),
+    (re.compile(r"(?:iPhone|iPad|iPod).*? OS (\d+)"), "iOS"),
+    (re.compile(r"Mac OS X (\d+)"), "macOS"),
+    (re.compile(r"CrOS()"), "ChromeOS"),
+    (re.compile(r"Linux()"), "Linux"),
+)
+# NT 10.0 covers Windows 10 and 11; the UA no longer tells them apart.
+_WINDOWS_VERSIONS: Final[dict[str, str]] = {
+    "10.0": "10",
+    "6.3": "8.1",
+    "6.2": "8",
+    "6.1": "7",
+}
+_BOT = re.compile(r"[Bb]ot\b|[Cc]rawler|[Ss]pider|Slurp|Headless|curl/|Wget/|python-")
+_TABLET = re.compile(r"iPad|Tablet|Android(?!.*\bMobile\b)")
+_MOBILE = re.compile(r"Mobi|iPhone|iPod")
+
+
+def _first_match(
+    rules: tuple[tuple[re.Pattern[str], str], ...], user_agent: str
+) -> tuple[str, str]:
+    for pattern, name in rules:
+        match = pattern.search(user_agent)
+        if match is not None:
+            return name, match.group(1)
+    return UNKNOWN, ""
+
+
+def parse_user_agent(user_agent: str) -> UserAgentInfo:
+    """Browser, OS and device class from a User-Agent string."""
+    if not user_agent.strip():
+        return UserAgentInfo(UNKNOWN, "", UNKNOWN, UNKNOWN)
+
+    browser, browser_version = _first_match(_BROWSER_RULES, user_agent)
+    os_name, os_version = _first_match(_OS_RULES, user_agent)
+    if os_name == "Windows":
+        os_version = _WINDOWS_VERSIONS.get(os_version, os_version)
+    if _BOT.search(user_agent):
+        device = "bot"
+    elif _TABLET.search(user_agent):
+        device = "tablet"
+    elif _MOBILE.search(user_agent):
+        device = "mobile"
+    elif os_name == UNKNOWN:
+        device = UNKNOWN
+    else:
+        device = "desktop"
+    return UserAgentInfo(
+        browser=browser,
+        browser_version=browser_version,
+        os=f"{os_name} {os_version}" if os_version else os_name,
+        device=device,
+    )
+
+
+class UserAgentParser:
+    """`parse_user_agent` behind a bounded LRU cache keyed by the raw string.
+
+    A few hundred distinct user agents cover almost all traffic, so after
+    warm-up nearly every event costs one dict lookup instead of a dozen
+    regex searches.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(maxsize, 0)
+        self.parse = lru_cache(maxsize=self.maxsize)(parse_user_agent)
+
+    def snapshot(self) -> dict[str, Any]:
+        info = self.parse.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "size": info.currsize,
+            "maxsize": self.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -1,102 +1,269 @@
+import asyncio
+import contextlib
 import logging
-from collections.abc import AsyncIterator, Awaitable, Callable
+import tracemalloc
+from collections.abc import AsyncIterator, Callable
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from time import perf_counter
-from uuid import uuid4
+from functools import partial
+from pathlib import Path
 
-from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI
 
 from .api.router import api_router
-from .core.config import get_settings
-from .core.logging import reset_request_id, set_request_id, setup_logging
+from .core.body_limits import JsonStructureGuard, RequestBodyLimitMiddleware
+from .core.bulkheads import BulkheadMiddleware, BulkheadRegistry
+from .core.client_telemetry import ClientTelemetry
+from .core.config import ENV_FILE, Settings, get_settings
+from .core.cors import ReloadableCORSMiddleware
+from .core.deadlines import DeadlineMiddleware
+from .core.draining import DrainController, DrainMiddleware
+from .core.expressions import ExpressionCache
+from .core.live_events import SHUTDOWN_SIGNALS, LiveBroadcaster, service_status
+from .core.log_retention import LogRetentionManager
+from .core.logging import LOGGING_FIELDS, apply_logging_settings, setup_logging
+from .core.probes import (
+    ProbeMiddleware,
+    ReadinessMonitor,
+    disk_quota_check,
+    drain_check,
+    log_dir_writable_check,
+)
+from .core.request_logging import RequestLoggingMiddleware
+from .core.request_metrics import RequestMetrics, install_log_record_counter
+from .core.settings_provider import SettingsProvider
+from .core.traffic_capture import CaptureWriter, TrafficCaptureMiddleware
+from .core.user_agents import UserAgentParser
 
 
 def _build_lifespan(
-    logger: logging.Logger,
+    logger: logging.Logger, settings: Settings
 ) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
     @asynccontextmanager
-    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         logger.info("app.startup")
+        live: LiveBroadcaster = app.state.live
+        # Installed before the drain handler, which then wraps it: a drain
+        # signal starts a drain first and only stops the server afterwards.
+        if live.install_shutdown_hook(SHUTDOWN_SIGNALS):
+            logger.info(
+                "live.shutdown_hook.installed | signals=%s", ",".join(SHUTDOWN_SIGNALS)
+            )
+        drain: DrainController = app.state.drain
+        if drain.install_signal_handler(settings.drain_signal):
+            logger.info(
+                "drain.signal_handler.installed | signal=%s", settings.drain_signal
+            )
+        provider: SettingsProvider = app.state.settings
+        if provider.install_signal_handler(settings.settings_reload_signal):
+            logger.info(
+                "settings.signal_handler.installed | signal=%s",
+                settings.settings_reload_signal,
+            )
+        background_tasks: list[asyncio.Task[None]] = []
+        if settings.settings_watch_interval_seconds > 0:
+            background_tasks.append(
+                asyncio.create_task(
+                    provider.watch(settings.settings_watch_interval_seconds)
+                )
+            )
+        retention: LogRetentionManager | None = app.state.log_retention
+        if retention is not None:
+            background_tasks.append(
+                asyncio.create_task(
+                    retention.run_periodically(settings.log_retention_interval_seconds)
+                )
+            )
+        readiness: ReadinessMonitor = app.state.readiness
+        # One pass before serving, so /readyz never answers from no data.
+        await readiness.run_once()
+        background_tasks.append(asyncio.create_task(readiness.run_periodically()))
+        background_tasks.append(asyncio.create_task(live.run()))
         yield
+        # Streams normally end at the shutdown signal; this covers servers
+        # that run the lifespan shutdown without sending one.
+        live.close_all("shutdown")
+        drain.remove_signal_handler()
+        live.remove_shutdown_hook()
+        provider.remove_signal_handler()
+        for task in background_tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        capture_writer: CaptureWriter | None = app.state.traffic_capture
+        if capture_writer is not None:
+            capture_writer.close()
+            logger.info(
+                "capture.closed | capture_path=%s | records=%s | dropped=%s",
+                capture_writer.path,
+                capture_writer.records_written,
+                capture_writer.records_dropped,
+            )
         logger.info("app.shutdown")
 
     return lifespan
 
 
+def _apply_retention_settings(
+    retention: LogRetentionManager, previous: Settings, current: Settings
+) -> None:
+    retention.update_limits(
+        retention_days=current.log_retention_days,
+        max_total_bytes=current.log_retention_max_bytes,
+        use_utc=current.log_use_utc,
+    )
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     setup_logging(settings)
 
     logger = logging.getLogger("backend.app")
-    request_logger = logging.getLogger("backend.http")
+
+    request_metrics = RequestMetrics(
+        sample_rate=settings.request_metrics_sample_rate,
+        trace_allocations=settings.request_metrics_trace_allocations,
+    )
+    if request_metrics.sample_rate > 0:
+        install_log_record_counter()
+        if settings.request_metrics_trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
 
     app = FastAPI(
         title=settings.app_name,
         version=settings.app_version,
-        lifespan=_build_lifespan(logger),
+        lifespan=_build_lifespan(logger, settings),
+    )
+    settings_provider = SettingsProvider(settings, env_file=ENV_FILE)
+    settings_provider.subscribe(
+        lambda previous, current: apply_logging_settings(current),
+        fields=LOGGING_FIELDS,
+    )
+    # The math endpoint reads these from get_settings() on every request.
+    settings_provider.mark_reloadable(
+        ("math_eval_max_elements", "math_eval_cpu_budget_ms")
+    )
+    app.state.settings = settings_provider
+    app.state.request_metrics = request_metrics
+    app.state.client_telemetry = ClientTelemetry(
+        max_pages=settings.client_telemetry_max_pages,
+        max_endpoints=settings.client_telemetry_max_endpoints,
+    )
+    app.state.user_agents = UserAgentParser(maxsize=settings.user_agent_cache_size)
+    app.state.expression_cache = ExpressionCache(maxsize=settings.math_eval_cache_size)
+    app.state.bulkheads = BulkheadRegistry(
+        limits=settings.bulkhead_limits, routes=dict(settings.bulkhead_routes)
+    )
+    app.state.traffic_capture = None
+    app.state.drain = DrainController(timeout_seconds=settings.drain_timeout_seconds)
+    app.state.log_retention = None
+    if settings.log_writer_mode != "socket":
+        log_path = Path(settings.log_file_path)
+        app.state.log_retention = LogRetentionManager(
+            log_dir=log_path.parent,
+            prefix=log_path.stem,
+            retention_days=settings.log_retention_days,
+            max_total_bytes=settings.log_retention_max_bytes,
+            use_utc=settings.log_use_utc,
+        )
+        settings_provider.subscribe(
+            partial(_apply_retention_settings, app.state.log_retention),
+            fields=(
+                "log_retention_days",
+                "log_retention_max_bytes",
+                "log_use_utc",
+            ),
+        )
+
+    log_dir = Path(settings.log_file_path).parent
+    readiness = ReadinessMonitor(
+        interval_seconds=settings.readiness_interval_seconds,
+        max_loop_lag_ms=settings.readiness_max_loop_lag_ms,
+    )
+    readiness.register("log_dir_writable", log_dir_writable_check(log_dir))
+    readiness.register(
+        "disk_quota",
+        disk_quota_check(
+            log_dir, settings.readiness_min_free_bytes, app.state.log_retention
+        ),
+    )
+    readiness.register("drain", drain_check(app.state.drain), blocking=False)
+    app.state.readiness = readiness
+    app.state.live = LiveBroadcaster(
+        status=service_status(
+            readiness, app.state.drain, lambda: get_settings().app_env
+        ),
+        tick_interval_seconds=settings.live_tick_interval_seconds,
+        heartbeat_seconds=settings.live_heartbeat_seconds,
+        client_buffer=settings.live_client_buffer,
+        slow_consumer=settings.live_slow_consumer,
+        max_subscribers=settings.live_max_subscribers,
     )
 
+    frontend_log_path = f"{settings.api_prefix}{settings.api_v1_prefix}/logs/frontend"
+    app.add_middleware(
+        RequestBodyLimitMiddleware,
+        max_bytes=settings.request_body_max_bytes,
+        route_limits=dict(settings.request_body_route_limits),
+        json_guards={
+            frontend_log_path: partial(
+                JsonStructureGuard,
+                field="details",
+                max_depth=settings.frontend_log_details_max_depth,
+                max_keys=settings.frontend_log_details_max_keys,
+                max_bytes=settings.frontend_log_details_max_bytes,
+            ),
+        },
+    )
+    app.add_middleware(
+        DeadlineMiddleware,
+        default_seconds=settings.request_deadline_seconds,
+        route_deadlines=dict(settings.request_deadline_routes),
+        budget_header=settings.request_budget_header,
+    )
+    # Inside CORS so browsers can read the 503; queue time is not counted
+    # against the request deadline.
+    app.add_middleware(BulkheadMiddleware, registry=app.state.bulkheads)
+    # Also inside CORS, so browsers can read the draining 503.
+    app.add_middleware(
+        DrainMiddleware,
+        controller=app.state.drain,
+        exempt_paths=[f"{settings.api_prefix}{settings.api_v1_prefix}/admin/drain"],
+    )
     app.add_middleware(
-        CORSMiddleware,
-        allow_origins=list(settings.cors_origins),
+        ReloadableCORSMiddleware,
+        provider=settings_provider,
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
     )
-
-    @app.middleware("http")
-    async def request_logging_middleware(
-        request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        request_id = request.headers.get("X-Request-Id", uuid4().hex)
-        token = set_request_id(request_id)
-        start_time = perf_counter()
-
-        client_host = request.client.host if request.client is not None else None
-        request_logger.debug(
-            "http.request.started | method=%s | path=%s | client_ip=%s",
-            request.method,
-            request.url.path,
-            client_host,
+    if settings.traffic_capture_path:
+        capture_writer = CaptureWriter(settings.traffic_capture_path)
+        app.state.traffic_capture = capture_writer
+        app.add_middleware(
+            TrafficCaptureMiddleware,
+            writer=capture_writer,
+            sample_rate=settings.traffic_capture_sample_rate,
+            redact_headers=settings.traffic_capture_redact_headers,
+            redact_fields=settings.traffic_capture_redact_fields,
+            max_body_bytes=settings.traffic_capture_max_body_bytes,
         )
-
-        try:
-            response = await call_next(request)
-            elapsed_ms = round((perf_counter() - start_time) * 1000, 2)
-            response.headers["X-Request-Id"] = request_id
-            request_logger.info(
-                "http.request.completed | method=%s | path=%s | "
-                "status_code=%s | duration_ms=%.2f | client_ip=%s",
-                request.method,
-                request.url.path,
-                response.status_code,
-                elapsed_ms,
-                client_host,
-            )
-            return response
-        except Exception:
-            elapsed_ms = round((perf_counter() - start_time) * 1000, 2)
-            request_logger.exception(
-                "http.request.failed | method=%s | path=%s | "
-                "duration_ms=%.2f | client_ip=%s",
-                request.method,
-                request.url.path,
-                elapsed_ms,
-                client_host,
-            )
-            raise
-        finally:
-            reset_request_id(token)
+        logger.warning(
+            "capture.enabled | capture_path=%s | sample_rate=%s",
+            capture_writer.path,
+            settings.traffic_capture_sample_rate,
+        )
+    app.add_middleware(RequestLoggingMiddleware, metrics=request_metrics)
+    app.add_middleware(ProbeMiddleware, monitor=readiness, drain=app.state.drain)
 
     app.include_router(api_router)
     logger.info(
         "app.initialized | api_prefix=%s | api_v1_prefix=%s | "
-        "log_level=%s | log_file_path=%s",
+        "log_level=%s | log_file_path=%s | request_metrics_sample_rate=%s",
         settings.api_prefix,
         settings.api_v1_prefix,
         settings.log_level,
         settings.log_file_path,
+        request_metrics.sample_rate,
     )
 
     return app
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import h11  # noqa: E402
+import uvicorn  # noqa: E402
+
+CHUNK: Final[bytes] = os.urandom(64 * 1024)
+PAYLOAD_SIZES_MB: Final[tuple[int, ...]] = (8, 64, 256)
+STREAM_PATH: Final[str] = "/api/v1/echo/stream"
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+async def _echo(port: int, size: int, checksum: str | None) -> float:
+    # Uploading and downloading run concurrently: the endpoint writes each
+    # chunk back before reading the next, so a client that finishes the upload
+    # before reading would stall on TCP backpressure.
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    connection = h11.Connection(h11.CLIENT)
+    target = STREAM_PATH + (f"?checksum={checksum}" if checksum else "")
+    request = h11.Request(
+        method="POST",
+        target=target,
+        headers=[
+            ("host", f"127.0.0.1:{port}"),
+            ("content-type", "application/octet-stream"),
+            ("transfer-encoding", "chunked"),
+        ],
+    )
+
+    async def upload() -> None:
+        writer.write(connection.send(request) or b"")
+        sent = 0
+        while sent < size:
+            writer.write(connection.send(h11.Data(data=CHUNK)) or b"")
+            sent += len(CHUNK)
+            await writer.drain()
+        writer.write(connection.send(h11.EndOfMessage()) or b"")
+        await writer.drain()
+
+    async def download() -> int:
+        received = 0
+        while True:
+            event = connection.next_event()
+            if event is h11.NEED_DATA:
+                connection.receive_data(await reader.read(256 * 1024))
+                continue
+            if isinstance(event, h11.Response) and event.status_code != 200:
+                raise RuntimeError(f"unexpected status {event.status_code}")
+            if isinstance(event, h11.Data):
+                received += len(event.data)
+            if isinstance(event, h11.EndOfMessage):
+                return received
+
+    started = time.perf_counter()
+    _, received = await asyncio.gather(upload(), download())
+    elapsed = time.perf_counter() - started
+    writer.close()
+    await writer.wait_closed()
+    if received != size:
+        raise RuntimeError(f"echoed {received} of {size} bytes")
+    return elapsed
+
+
+def main() -> None:
+    log_dir = tempfile.mkdtemp(prefix="bench-echo-")
+    os.environ.setdefault("LOG_FILE_PATH", str(Path(log_dir) / "backend.log"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from backend.app.main import create_app
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(), port=port, log_level="warning", lifespan="on")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        for size_mb in PAYLOAD_SIZES_MB:
+            size = size_mb * 1024 * 1024
+            for checksum in (None, "crc32", "sha256"):
+                elapsed = asyncio.run(_echo(port, size, checksum))
+                print(
+                    f"{size_mb:>4} MiB  checksum={checksum or '-':<7}"
+                    f"{size / 1_000_000 / elapsed:>10.1f} MB/s"
+                    f"{elapsed * 1000:>10.1f} ms"
+                )
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
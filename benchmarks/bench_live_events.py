@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+SUBSCRIBER_COUNTS: Final[tuple[int, ...]] = (1_000, 5_000, 10_000)
+TICKS: Final[int] = 20
+# Share of one core the producer may spend on fan-out at one tick per second.
+CPU_SHARE: Final[float] = 0.1
+PATH: Final[str] = "/api/v1/live"
+
+
+def _scope() -> dict[str, Any]:
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def _run(app: Any, count: int) -> float:
+    live = app.state.live
+    closing = asyncio.Event()
+    delivered = 0
+    all_delivered = asyncio.Event()
+    target = 0
+
+    async def receive() -> dict[str, Any]:
+        await closing.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal delivered
+        if message.get("body", b"").startswith(b"id: "):
+            delivered += 1
+            if delivered == target:
+                all_delivered.set()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [asyncio.create_task(app(_scope(), receive, send)) for _ in range(count)]
+    while len(live.subscribers) < count:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    gc.collect()
+    per_connection_kb = (tracemalloc.get_traced_memory()[0] - before) / count / 1024
+    tracemalloc.stop()
+
+    fanout_seconds = 0.0
+    delivery_seconds = 0.0
+    for _ in range(TICKS):
+        all_delivered.clear()
+        target, delivered = count, 0
+        started = time.perf_counter()
+        live.publish_time()
+        fanout_seconds += time.perf_counter() - started
+        await all_delivered.wait()
+        delivery_seconds += time.perf_counter() - started
+
+    closing.set()
+    await asyncio.gather(*streams)
+
+    fanout_us = fanout_seconds / TICKS / count * 1_000_000
+    delivery_us = delivery_seconds / TICKS / count * 1_000_000
+    print(
+        f"subscribers={count:<6} {per_connection_kb:>6.1f} KiB/connection  "
+        f"fan-out {fanout_us:>5.2f} us/subscriber  "
+        f"delivery {delivery_us:>5.2f} us/subscriber  "
+        f"tick {delivery_seconds / TICKS * 1000:>7.1f} ms"
+    )
+    return delivery_us
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        os.environ["LOG_FILE_PATH"] = str(Path(log_dir) / "backend.log")
+        os.environ["LOG_LEVEL"] = "WARNING"
+        os.environ["LIVE_MAX_SUBSCRIBERS"] = str(max(SUBSCRIBER_COUNTS))
+        from backend.app.main import create_app
+
+        print(
+            "in-process ASGI connections through the full middleware stack; "
+            "server socket and protocol buffers are not included"
+        )
+        delivery_us = 0.0
+        for count in SUBSCRIBER_COUNTS:
+            delivery_us = asyncio.run(_run(create_app(), count))
+        # At one tick per second, fan-out and delivery are the per-tick work.
+        capacity = CPU_SHARE * 1_000_000 / delivery_us
+        print(
+            f"~{capacity:,.0f} subscribers per worker at 1 tick/s "
+            f"using {CPU_SHARE:.0%} of a core for delivery"
+        )
+
+
+if __name__ == "__main__":
+    main()
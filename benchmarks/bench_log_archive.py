@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.log_archive import (  # noqa: E402
+    Condition,
+    LogQuery,
+    compact_log,
+    run_query,
+)
+
+ROWS: Final[int] = 400_000
+PATHS: Final[tuple[str, ...]] = (
+    "/api/v1/health",
+    "/api/v1/echo",
+    "/api/v1/time",
+    "/api/v1/math/add",
+    "/api/v1/math/eval",
+    "/api/v1/logs/frontend",
+)
+PREFIX: Final[str] = "service=backend | version=0.1.0 | environment=production"
+
+
+def _write_log(path: Path) -> None:
+    generator = random.Random(7)
+    with path.open("w", encoding="utf-8") as stream:
+        for index in range(ROWS):
+            seconds = index * 86400 // ROWS
+            asctime = (
+                f"2026-10-12 {seconds // 3600:02d}:{seconds // 60 % 60:02d}:"
+                f"{seconds % 60:02d}"
+            )
+            request_id = f"{generator.getrandbits(128):032x}"
+            route = generator.choice(PATHS)
+            if index % 2:
+                status = 500 if generator.random() < 0.02 else 200
+                level = "ERROR" if status == 500 else "INFO"
+                message = (
+                    f"http.request.completed | method=GET | path={route} | "
+                    f"status_code={status} | duration_ms="
+                    f"{generator.lognormvariate(1, 0.6):.2f} | client_ip=10.0.0.1"
+                )
+            else:
+                level = "DEBUG"
+                message = (
+                    f"http.request.started | method=GET | path={route} | "
+                    "client_ip=10.0.0.1"
+                )
+            stream.write(
+                f"{asctime} | {level} | backend.http | {request_id} | {PREFIX} | "
+                f"{message}\n"
+            )
+
+
+def _scan_text(path: Path) -> Counter[tuple[str, str]]:
+    # What answering the question from the text log takes: parse every line.
+    counts: Counter[tuple[str, str]] = Counter()
+    with path.open(encoding="utf-8") as stream:
+        for line in stream:
+            parts = line.split(" | ")
+            if len(parts) < 8 or parts[7] != "http.request.completed":
+                continue
+            fields = dict(part.partition("=")[::2] for part in parts[8:])
+            if int(fields["status_code"]) >= 500:
+                counts[(fields["path"], line[:13])] += 1
+    return counts
+
+
+def _timed(label: str, run: object) -> float:
+    started = time.perf_counter()
+    run()  # type: ignore[operator]
+    elapsed = time.perf_counter() - started
+    print(f"{label:<44}{elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "backend-2026-10-12.log"
+        archive = Path(directory) / "backend-2026-10-12.ftla"
+        _write_log(source)
+
+        _timed("compact", lambda: compact_log(source, archive))
+        print(
+            f"{'size':<44}{source.stat().st_size / 1e6:>9.1f} MB -> "
+            f"{archive.stat().st_size / 1e6:.2f} MB"
+        )
+
+        errors_per_path_hour = LogQuery(
+            group_by=("path", "hour"),
+            where=(
+                Condition.parse("event=http.request.completed"),
+                Condition.parse("status>=500"),
+            ),
+        )
+        latency_per_path = LogQuery(
+            group_by=("path",),
+            metrics=("count", "p50", "p99"),
+            where=(Condition.parse("event=http.request.completed"),),
+        )
+        text = _timed(
+            "errors per path per hour (text scan)", lambda: _scan_text(source)
+        )
+        columnar = _timed(
+            "errors per path per hour (archive)",
+            lambda: run_query([archive], errors_per_path_hour),
+        )
+        _timed(
+            "count/p50/p99 per path (archive)",
+            lambda: run_query([archive], latency_per_path),
+        )
+        _timed(
+            "count per event (archive)",
+            lambda: run_query([archive], LogQuery(group_by=("event",))),
+        )
+        print(f"{'speed-up':<44}{text / columnar:>9.1f} x")
+
+
+if __name__ == "__main__":
+    main()
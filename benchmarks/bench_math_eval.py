@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.expressions import (  # noqa: E402
+    ExpressionCache,
+    compile_expression,
+)
+
+EXPRESSION: Final[str] = "sqrt(x * x + y * y) * sin(x / 3) + log(1 + abs(y)) - k"
+MAX_ELEMENTS: Final[int] = 10_000_000
+CPU_BUDGET_MS: Final[float] = 60_000.0
+
+
+def _inputs(size: int) -> dict[str, float | list[float]]:
+    if size == 1:
+        return {"x": 1.5, "y": -2.0, "k": 3.0}
+    return {
+        "x": [index * 0.5 for index in range(size)],
+        "y": [index * -0.25 for index in range(size)],
+        "k": 3.0,
+    }
+
+
+def _rate(label: str, size: int, run: Callable[[], None], number: int) -> None:
+    seconds = min(timeit.repeat(run, number=number, repeat=5))
+    per_call_us = seconds / number * 1_000_000
+    print(
+        f"{label:<10} size={size:<6} {number / seconds:>12,.0f} evals/s  "
+        f"{per_call_us:>10.2f} us/eval  {size * number / seconds:>14,.0f} elements/s"
+    )
+
+
+def _bench_size(cache: ExpressionCache, size: int, number: int) -> None:
+    values = _inputs(size)
+
+    def uncached() -> None:
+        compile_expression(EXPRESSION).evaluate(values, MAX_ELEMENTS, CPU_BUDGET_MS)
+
+    def cached() -> None:
+        plan, _ = cache.get_or_compile(EXPRESSION)
+        plan.evaluate(values, MAX_ELEMENTS, CPU_BUDGET_MS)
+
+    _rate("uncached", size, uncached, number)
+    _rate("cached", size, cached, number)
+
+
+def main() -> None:
+    cache = ExpressionCache(maxsize=256)
+    for size, number in ((1, 20_000), (100, 2_000), (10_000, 20)):
+        _bench_size(cache, size, number)
+
+
+if __name__ == "__main__":
+    main()
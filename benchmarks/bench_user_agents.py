@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.user_agents import (  # noqa: E402
+    UserAgentParser,
+    parse_user_agent,
+)
+
+EVENTS: Final[int] = 200_000
+CACHE_SIZE: Final[int] = 512
+TEMPLATES: Final[tuple[str, ...]] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/{major}.0.{build}.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/{major}.0.0.0 Safari/537.36 Edg/{major}.0.{build}.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.{minor} Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_{minor} like Mac OS X) "
+    "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.{minor} "
+    "Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android {android}; Pixel {minor}) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/{major}.0.{build}.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:{major}.0) Gecko/20100101 Firefox/{major}.0",
+)
+
+
+def _distinct_user_agents(count: int) -> list[str]:
+    generator = random.Random(11)
+    user_agents: set[str] = set()
+    while len(user_agents) < count:
+        template = generator.choice(TEMPLATES)
+        user_agents.add(
+            template.format(
+                major=generator.randint(110, 126),
+                minor=generator.randint(0, 9),
+                build=generator.randint(4000, 6500),
+                android=generator.randint(10, 14),
+            )
+        )
+    return sorted(user_agents)
+
+
+def _event_stream(user_agents: list[str], events: int) -> list[str]:
+    # Traffic is heavily skewed: a few current browsers dominate.
+    weights = [1 / rank for rank in range(1, len(user_agents) + 1)]
+    return random.Random(3).choices(user_agents, weights=weights, k=events)
+
+
+def _per_event(label: str, stream: list[str], parse: Callable[[str], object]) -> None:
+    started = time.perf_counter()
+    for user_agent in stream:
+        parse(user_agent)
+    seconds = time.perf_counter() - started
+    print(
+        f"{label:<20} {len(stream) / seconds:>12,.0f} events/s  "
+        f"{seconds / len(stream) * 1_000_000:>8.2f} us/event"
+    )
+
+
+def main() -> None:
+    for distinct in (300, 2_000):
+        stream = _event_stream(_distinct_user_agents(distinct), EVENTS)
+        parser = UserAgentParser(maxsize=CACHE_SIZE)
+        for user_agent in stream[:10_000]:
+            parser.parse(user_agent)
+        warm = parser.snapshot()
+
+        print(f"distinct user agents={distinct} cache size={CACHE_SIZE}")
+        _per_event("uncached", stream, parse_user_agent)
+        _per_event("cached (warm)", stream, parser.parse)
+        stats = parser.snapshot()
+        hits = stats["hits"] - warm["hits"]
+        misses = stats["misses"] - warm["misses"]
+        print(f"{'warm hit rate':<20} {hits / (hits + misses):>12.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+// Production build: one minified, content-hashed bundle per page plus shared
+// chunks, copied HTML with modulepreload hints, a manifest and a size report.
+// The tsc build in dist/ stays the development build.
+import { createHash } from "node:crypto";
+import { mkdir, readdir, readFile, rm, writeFile } from "node:fs/promises";
+import path from "node:path";
+import { fileURLToPath, pathToFileURL } from "node:url";
+import { gzipSync } from "node:zlib";
+
+const FRONTEND_ROOT = path.resolve(path.dirname(fileURLToPath(import.meta.url)), "..");
+const BUILD_DIR = path.join(FRONTEND_ROOT, "build");
+const ASSETS_DIR = "assets";
+const STYLESHEET = "styles.css";
+const DEV_SCRIPT_PATTERN = /<script type="module" src="[^"]*dist\/pages\/([\w-]+)\.js"><\/script>/;
+
+export function contentHash(content) {
+  return createHash("sha256").update(content).digest("hex").slice(0, 10);
+}
+
+/** Pages are the HTML files; each names its entry through its dev script tag. */
+export async function listHtmlPages(root = FRONTEND_ROOT) {
+  const pages = ["index.html"];
+  for (const name of (await readdir(path.join(root, "pages"))).sort()) {
+    if (name.endsWith(".html")) {
+      pages.push(`pages/${name}`);
+    }
+  }
+  return pages;
+}
+
+export function entryNameFromHtml(html) {
+  return DEV_SCRIPT_PATTERN.exec(html)?.[1] ?? null;
+}
+
+/** Static imports reachable from an output, so the browser can fetch them all at once. */
+export function collectPreloads(metafile, outputPath) {
+  const seen = new Set();
+  const pending = [outputPath];
+  while (pending.length > 0) {
+    const current = pending.pop();
+    for (const imported of metafile.outputs[current]?.imports ?? []) {
+      if (imported.kind === "import-statement" && !seen.has(imported.path)) {
+        seen.add(imported.path);
+        pending.push(imported.path);
+      }
+    }
+  }
+  return [...seen].sort();
+}
+
+export function rewriteHtml(html, { prefix, entry, preloads, stylesheet }) {
+  const hints = preloads
+    .map((file) => `    <link rel="modulepreload" href="${prefix}${file}" />`)
+    .join("\n");
+  let result = html.replace(
+    DEV_SCRIPT_PATTERN,
+    `<script type="module" src="${prefix}${entry}"></script>`,
+  );
+  result = result.replace(
+    /<link rel="stylesheet" href="[^"]*styles\.css" \/>/,
+    `<link rel="stylesheet" href="${prefix}${stylesheet}" />`,
+  );
+  return hints ? result.replace("  </head>", `${hints}\n  </head>`) : result;
+}
+
+export function formatSizeReport(rows) {
+  const width = Math.max(...rows.map((row) => row.name.length), "file".length);
+  const lines = [`${"file".padEnd(width)}  ${"bytes".padStart(9)}  ${"gzip".padStart(9)}`];
+  for (const row of rows) {
+    lines.push(
+      `${row.name.padEnd(width)}  ${String(row.bytes).padStart(9)}  ${String(row.gzip).padStart(9)}`,
+    );
+  }
+  return lines.join("\n");
+}
+
+function sizeOf(content) {
+  return { bytes: content.length, gzip: gzipSync(content, { level: 9 }).length };
+}
+
+async function build() {
+  const { build: esbuild } = await import("esbuild");
+  await rm(BUILD_DIR, { recursive: true, force: true });
+  await mkdir(path.join(BUILD_DIR, ASSETS_DIR), { recursive: true });
+
+  const pages = await listHtmlPages();
+  const htmlByPage = new Map();
+  const entryPoints = {};
+  for (const page of pages) {
+    const html = await readFile(path.join(FRONTEND_ROOT, page), "utf8");
+    const entry = entryNameFromHtml(html);
+    if (entry == null) {
+      throw new Error(`${page} has no dist/pages/<name>.js module script`);
+    }
+    htmlByPage.set(page, { html, entry });
+    entryPoints[entry] = path.join(FRONTEND_ROOT, "src", "pages", `${entry}.ts`);
+  }
+
+  const result = await esbuild({
+    absWorkingDir: FRONTEND_ROOT,
+    entryPoints,
+    bundle: true,
+    splitting: true,
+    format: "esm",
+    target: "es2020",
+    minify: true,
+    sourcemap: "linked",
+    outdir: path.join(BUILD_DIR, ASSETS_DIR),
+    entryNames: "[name]-[hash]",
+    chunkNames: "shared-[hash]",
+    metafile: true,
+    logLevel: "warning",
+  });
+
+  const buildPrefix = `${path.relative(FRONTEND_ROOT, BUILD_DIR)}/`;
+  const fromBuild = (output) => output.slice(buildPrefix.length);
+  const entryOutputs = new Map();
+  for (const [output, meta] of Object.entries(result.metafile.outputs)) {
+    if (meta.entryPoint != null) {
+      entryOutputs.set(path.basename(meta.entryPoint, ".ts"), output);
+    }
+  }
+
+  const css = await readFile(path.join(FRONTEND_ROOT, STYLESHEET));
+  const stylesheet = `${ASSETS_DIR}/styles-${contentHash(css)}.css`;
+  await writeFile(path.join(BUILD_DIR, stylesheet), css);
+
+  const manifest = { pages: {}, assets: [stylesheet] };
+  const rows = [];
+  for (const [page, { html, entry }] of htmlByPage) {
+    const output = entryOutputs.get(entry);
+    const preloads = collectPreloads(result.metafile, output).map(fromBuild);
+    const prefix = page.includes("/") ? "../" : "./";
+    const rewritten = rewriteHtml(html, {
+      prefix,
+      entry: fromBuild(output),
+      preloads,
+      stylesheet,
+    });
+    await mkdir(path.dirname(path.join(BUILD_DIR, page)), { recursive: true });
+    await writeFile(path.join(BUILD_DIR, page), rewritten);
+    manifest.pages[page] = { entry: fromBuild(output), preload: preloads, css: stylesheet };
+
+    let pageBytes = 0;
+    let pageGzip = 0;
+    for (const file of [fromBuild(output), ...preloads]) {
+      const size = sizeOf(await readFile(path.join(BUILD_DIR, file)));
+      pageBytes += size.bytes;
+      pageGzip += size.gzip;
+    }
+    rows.push({ name: `${page} (js total)`, bytes: pageBytes, gzip: pageGzip });
+  }
+
+  for (const output of Object.keys(result.metafile.outputs).sort()) {
+    if (output.endsWith(".map")) {
+      continue;
+    }
+    manifest.assets.push(fromBuild(output));
+    rows.push({ name: fromBuild(output), ...sizeOf(await readFile(output)) });
+  }
+  rows.push({ name: stylesheet, ...sizeOf(css) });
+
+  await writeFile(path.join(BUILD_DIR, "manifest.json"), `${JSON.stringify(manifest, null, 2)}\n`);
+  console.log(formatSizeReport(rows));
+}
+
+if (process.argv[1] && import.meta.url === pathToFileURL(process.argv[1]).href) {
+  build().catch((error) => {
+    console.error(error);
+    process.exitCode = 1;
+  });
+}
@@ -69,8 +69,7 @@ export function mountEchoPage(options?: PageSetupOptions): void {
 
     void requestJson(context, `${API_VERSION_PREFIX}/echo`, {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ message }),
+      json: { message },
     });
   });
 }
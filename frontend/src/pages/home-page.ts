@@ -30,8 +30,7 @@ export async function mountHomePage(options?: PageSetupOptions): Promise<void> {
       });
       void requestJson(context, `${API_VERSION_PREFIX}/admin/stop-project`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({}),
+        json: {},
       });
     });
   }
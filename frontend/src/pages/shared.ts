@@ -1,5 +1,7 @@
 import { createFrontendLogger, normalizeApiBaseUrl } from "../logger.js";
-import { requestJson as runApiRequest } from "../services/api-client.js";
+import { type ApiRequestInit, requestJson as runApiRequest } from "../services/api-client.js";
+import { type ApiTransport, createApiTransport } from "../services/api-transport.js";
+import { createPerfTelemetry, observePagePerformance, type PerfTelemetry } from "../telemetry.js";
 
 export const API_VERSION_PREFIX = "/api/v1";
 
@@ -16,7 +18,9 @@ export interface FrontendLoggerLike {
 export interface PageSetupOptions {
   documentRef?: Document;
   fetchImpl?: typeof fetch;
+  api?: ApiTransport;
   logger?: FrontendLoggerLike;
+  telemetry?: PerfTelemetry | null;
   userAgent?: string;
   pagePath?: string;
 }
@@ -24,6 +28,7 @@ export interface PageSetupOptions {
 export interface PageContext {
   documentRef: Document;
   fetchImpl: typeof fetch;
+  api: ApiTransport;
   logger: FrontendLoggerLike;
   pagePath: string;
   apiBaseInput: HTMLInputElement;
@@ -92,11 +97,31 @@ export function createPageContext(options: PageSetupOptions = {}): PageContext |
       userAgent: options.userAgent,
     });
 
+  const fetchImpl = options.fetchImpl ?? defaultFetch;
+  const api = options.api ?? createApiTransport({ fetchImpl });
+  const pagePath = resolvePagePath(options.pagePath);
+  if (options.telemetry === undefined) {
+    const telemetry = createPerfTelemetry({
+      getApiBaseUrl: () => apiBaseUrl(apiBaseInput),
+      pagePath,
+      fetchImpl: options.fetchImpl,
+    });
+    if (telemetry != null) {
+      api.onTiming(telemetry.recordApiTiming);
+      if (typeof window !== "undefined") {
+        observePagePerformance(telemetry, window);
+      }
+    }
+  } else if (options.telemetry != null) {
+    api.onTiming(options.telemetry.recordApiTiming);
+  }
+
   return {
     documentRef,
-    fetchImpl: options.fetchImpl ?? defaultFetch,
+    fetchImpl,
+    api,
     logger,
-    pagePath: resolvePagePath(options.pagePath),
+    pagePath,
     apiBaseInput,
     resultElement,
     summaryElement,
@@ -138,7 +163,7 @@ export function setFieldMessage(
 export async function requestJson(
   context: PageContext,
   path: string,
-  init?: RequestInit,
+  init?: ApiRequestInit,
 ): Promise<void> {
   await runApiRequest(context, path, init);
 }
@@ -4,6 +4,7 @@ import {
   renderOperationResult,
   renderRequestPayload,
 } from "../ui/result-panel.js";
+import type { ApiTransport } from "./api-transport.js";
 import { describeOperation } from "./operation-summary.js";
 
 interface LoggerLike {
@@ -17,7 +18,7 @@ interface LoggerLike {
 }
 
 export interface ApiRequestContext {
-  fetchImpl: typeof fetch;
+  api: ApiTransport;
   logger: LoggerLike;
   pagePath: string;
   apiBaseInput: HTMLInputElement;
@@ -27,6 +28,14 @@ export interface ApiRequestContext {
   requestStatusElement: HTMLElement | null;
 }
 
+export interface ApiRequestInit extends RequestInit {
+  /** Sent as the JSON body and rendered as-is, without parsing `body` back. */
+  json?: unknown;
+}
+
+// One request per result panel: a newer request aborts the one it replaces.
+const activeRequests = new WeakMap<ApiRequestContext, AbortController>();
+
 function renderRequestStatus(
   requestStatusElement: HTMLElement | null,
   message: string,
@@ -44,69 +53,122 @@ function apiBaseUrl(input: HTMLInputElement): string {
   return normalizeApiBaseUrl(input.value || "http://127.0.0.1:8000");
 }
 
+function prepareRequest(init: ApiRequestInit | undefined): {
+  fetchInit: RequestInit | undefined;
+  requestBody: unknown;
+} {
+  if (init == null) {
+    return { fetchInit: undefined, requestBody: null };
+  }
+
+  const { json, ...fetchInit } = init;
+  if (json !== undefined) {
+    const headers = new Headers(fetchInit.headers);
+    headers.set("Content-Type", "application/json");
+    return { fetchInit: { ...fetchInit, headers, body: JSON.stringify(json) }, requestBody: json };
+  }
+
+  if (typeof fetchInit.body !== "string") {
+    return { fetchInit, requestBody: null };
+  }
+  try {
+    return { fetchInit, requestBody: JSON.parse(fetchInit.body) };
+  } catch {
+    return { fetchInit, requestBody: fetchInit.body };
+  }
+}
+
+function formatDuration(durationMs: number): string {
+  return `${Math.round(durationMs)} ms`;
+}
+
 export async function requestJson(
   context: ApiRequestContext,
   path: string,
-  init?: RequestInit,
+  init?: ApiRequestInit,
 ): Promise<void> {
   const method = init?.method ?? "GET";
-  let parsedBody: unknown = null;
-  if (typeof init?.body === "string") {
-    try {
-      parsedBody = JSON.parse(init.body);
-    } catch {
-      parsedBody = init.body;
-    }
-  }
+  const { fetchInit, requestBody } = prepareRequest(init);
 
   renderRequestPayload(context.requestElement, {
     method,
     path,
-    requestBody: parsedBody,
+    requestBody,
   });
   renderRequestStatus(context.requestStatusElement, `Running ${method} request...`, "running");
 
-  await context.logger.log({
-    level: "info",
-    event: "api.request.started",
-    pagePath: context.pagePath,
-    details: { path, method },
-  });
+  const controller = new AbortController();
+  const previous = activeRequests.get(context);
+  activeRequests.set(context, controller);
+  // Start (or join) the new request before aborting the old one, so an
+  // identical GET keeps its shared network request alive.
+  const pending = context.api.fetchJson(
+    `${apiBaseUrl(context.apiBaseInput)}${path}`,
+    fetchInit,
+    controller.signal,
+  );
+  previous?.abort();
 
   try {
-    const response = await context.fetchImpl(`${apiBaseUrl(context.apiBaseInput)}${path}`, init);
-    const data: unknown = await response.json();
-    const summary = describeOperation(path, method, data, response.status);
+    const result = await pending;
+    if (activeRequests.get(context) !== controller) {
+      return;
+    }
+    activeRequests.delete(context);
+
+    const summary = describeOperation(path, method, result.data, result.status);
+    const timing = {
+      path,
+      method,
+      statusCode: result.status,
+      durationMs: Math.round(result.durationMs),
+      source: result.source,
+    };
 
-    if (!response.ok) {
-      await context.logger.log({
+    if (!result.ok) {
+      void context.logger.log({
         level: "warning",
         event: "api.request.failed",
         pagePath: context.pagePath,
-        details: { path, method, statusCode: response.status, responseData: data, summary },
+        details: { ...timing, responseData: result.data, summary },
       });
       renderOperationError(
         context.resultElement,
         context.summaryElement,
-        { error: `HTTP ${response.status}`, details: data },
+        { error: `HTTP ${result.status}`, details: result.data },
         summary,
       );
-      renderRequestStatus(context.requestStatusElement, `Request failed with HTTP ${response.status}.`, "error");
+      renderRequestStatus(
+        context.requestStatusElement,
+        `Request failed with HTTP ${result.status} after ${formatDuration(result.durationMs)}.`,
+        "error",
+      );
       return;
     }
 
-    await context.logger.log({
+    void context.logger.log({
       level: "info",
       event: "api.request.succeeded",
       pagePath: context.pagePath,
-      details: { path, method, statusCode: response.status, summary },
+      details: { ...timing, summary },
     });
-    renderOperationResult(context.resultElement, context.summaryElement, data, summary);
-    renderRequestStatus(context.requestStatusElement, "Request completed successfully.", "success");
+    renderOperationResult(context.resultElement, context.summaryElement, result.data, summary);
+    const origin = result.source === "cache" ? " from cache" : "";
+    renderRequestStatus(
+      context.requestStatusElement,
+      `Request completed successfully in ${formatDuration(result.durationMs)}${origin}.`,
+      "success",
+    );
   } catch (error: unknown) {
+    if (activeRequests.get(context) !== controller) {
+      // Superseded by a newer request, which owns the panel now.
+      return;
+    }
+    activeRequests.delete(context);
+
     const message = error instanceof Error ? error.message : "Unknown error";
     const summary = `An error occurred during the request: ${method} ${path}`;
-    await context.logger.log({
+    void context.logger.log({
       level: "error",
       event: "api.request.exception",
       message,
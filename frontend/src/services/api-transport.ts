@@ -0,0 +1,260 @@
+export type ApiResponseSource = "network" | "revalidated" | "cache" | "shared";
+
+export interface ApiResult {
+  status: number;
+  ok: boolean;
+  data: unknown;
+  source: ApiResponseSource;
+  durationMs: number;
+}
+
+export interface ApiTiming {
+  method: string;
+  url: string;
+  status: number | null;
+  source: ApiResponseSource | null;
+  durationMs: number;
+}
+
+export interface CacheDirectives {
+  noStore: boolean;
+  noCache: boolean;
+  maxAgeSeconds: number | null;
+}
+
+export interface ApiTransportOptions {
+  fetchImpl: typeof fetch;
+  now?: () => number;
+  maxCacheEntries?: number;
+}
+
+export interface ApiTransport {
+  fetchJson: (url: string, init: RequestInit | undefined, signal: AbortSignal) => Promise<ApiResult>;
+  onTiming: (listener: (timing: ApiTiming) => void) => () => void;
+  clear: () => void;
+}
+
+interface CachedResponse {
+  status: number;
+  data: unknown;
+  etag: string | null;
+  expiresAt: number;
+}
+
+interface SharedRequest {
+  promise: Promise<Omit<ApiResult, "durationMs">>;
+  controller: AbortController;
+  waiters: number;
+  settled: boolean;
+}
+
+const DEFAULT_MAX_CACHE_ENTRIES = 64;
+
+function defaultNow(): number {
+  return typeof performance !== "undefined" ? performance.now() : Date.now();
+}
+
+export function parseCacheControl(header: string | null): CacheDirectives {
+  const directives: CacheDirectives = { noStore: false, noCache: false, maxAgeSeconds: null };
+  if (header == null) {
+    return directives;
+  }
+
+  for (const part of header.split(",")) {
+    const [rawName, rawValue] = part.split("=", 2);
+    const name = rawName.trim().toLowerCase();
+    if (name === "no-store") {
+      directives.noStore = true;
+    } else if (name === "no-cache") {
+      directives.noCache = true;
+    } else if (name === "max-age" && rawValue != null) {
+      const seconds = Number.parseInt(rawValue.trim().replace(/^"|"$/g, ""), 10);
+      if (Number.isFinite(seconds) && seconds >= 0) {
+        directives.maxAgeSeconds = seconds;
+      }
+    }
+  }
+  return directives;
+}
+
+export function isAbortError(error: unknown): boolean {
+  return error instanceof Error && error.name === "AbortError";
+}
+
+function abortError(signal: AbortSignal): unknown {
+  return signal.reason ?? new DOMException("The request was aborted.", "AbortError");
+}
+
+function untilAborted<T>(promise: Promise<T>, signal: AbortSignal): Promise<T> {
+  if (signal.aborted) {
+    return Promise.reject(abortError(signal));
+  }
+
+  return new Promise<T>((resolve, reject) => {
+    const onAbort = (): void => reject(abortError(signal));
+    signal.addEventListener("abort", onAbort, { once: true });
+    promise.then(
+      (value) => {
+        signal.removeEventListener("abort", onAbort);
+        resolve(value);
+      },
+      (error: unknown) => {
+        signal.removeEventListener("abort", onAbort);
+        reject(error);
+      },
+    );
+  });
+}
+
+/**
+ * Fetch wrapper for JSON endpoints.
+ *
+ * Identical GETs that are in flight share one network request, and GET
+ * responses are kept in a small LRU cache for as long as their
+ * `Cache-Control: max-age` allows. Stale entries with an `ETag` are
+ * revalidated with `If-None-Match`. Responses without cache headers are
+ * never reused, so endpoints opt in from the backend.
+ */
+export function createApiTransport(options: ApiTransportOptions): ApiTransport {
+  const now = options.now ?? defaultNow;
+  const maxCacheEntries = options.maxCacheEntries ?? DEFAULT_MAX_CACHE_ENTRIES;
+  const cache = new Map<string, CachedResponse>();
+  const inFlight = new Map<string, SharedRequest>();
+  const listeners = new Set<(timing: ApiTiming) => void>();
+
+  function emit(timing: ApiTiming): void {
+    for (const listener of listeners) {
+      listener(timing);
+    }
+  }
+
+  function store(key: string, status: number, data: unknown, headers: Headers): void {
+    const directives = parseCacheControl(headers.get("Cache-Control"));
+    const etag = headers.get("ETag") ?? cache.get(key)?.etag ?? null;
+    const maxAgeSeconds = directives.noCache ? 0 : (directives.maxAgeSeconds ?? 0);
+    cache.delete(key);
+    if (directives.noStore || (maxAgeSeconds === 0 && etag == null)) {
+      return;
+    }
+
+    cache.set(key, { status, data, etag, expiresAt: now() + maxAgeSeconds * 1000 });
+    while (cache.size > maxCacheEntries) {
+      const oldest = cache.keys().next().value as string;
+      cache.delete(oldest);
+    }
+  }
+
+  async function load(
+    key: string,
+    init: RequestInit | undefined,
+    signal: AbortSignal,
+  ): Promise<Omit<ApiResult, "durationMs">> {
+    const cached = cache.get(key);
+    const headers = new Headers(init?.headers);
+    if (cached?.etag != null) {
+      headers.set("If-None-Match", cached.etag);
+    }
+
+    const response = await options.fetchImpl(key, { ...init, headers, signal });
+    if (response.status === 304 && cached != null) {
+      store(key, cached.status, cached.data, response.headers);
+      return { status: cached.status, ok: true, data: cached.data, source: "revalidated" };
+    }
+
+    const data: unknown = await response.json();
+    if (response.ok) {
+      store(key, response.status, data, response.headers);
+    }
+    return { status: response.status, ok: response.ok, data, source: "network" };
+  }
+
+  function startShared(key: string, init: RequestInit | undefined): SharedRequest {
+    const controller = new AbortController();
+    const shared: SharedRequest = {
+      promise: load(key, init, controller.signal),
+      controller,
+      waiters: 0,
+      settled: false,
+    };
+    const settle = (): void => {
+      shared.settled = true;
+      if (inFlight.get(key) === shared) {
+        inFlight.delete(key);
+      }
+    };
+    shared.promise.then(settle, settle);
+    return shared;
+  }
+
+  async function fetchShared(key: string, init: RequestInit | undefined, signal: AbortSignal) {
+    const cached = cache.get(key);
+    if (cached != null && cached.expiresAt > now()) {
+      // Re-insert so the Map's insertion order tracks recency.
+      cache.delete(key);
+      cache.set(key, cached);
+      return { status: cached.status, ok: true, data: cached.data, source: "cache" as const };
+    }
+
+    let shared = inFlight.get(key);
+    const joined = shared != null;
+    if (shared == null) {
+      shared = startShared(key, init);
+      inFlight.set(key, shared);
+    }
+    shared.waiters += 1;
+
+    const request = shared;
+    try {
+      const result = await untilAborted(request.promise, signal);
+      return joined ? { ...result, source: "shared" as const } : result;
+    } finally {
+      request.waiters -= 1;
+      // Nobody is waiting for the response any more.
+      if (request.waiters === 0 && !request.settled) {
+        request.controller.abort();
+      }
+    }
+  }
+
+  async function fetchDirect(url: string, init: RequestInit | undefined, signal: AbortSignal) {
+    const response = await options.fetchImpl(url, { ...init, signal });
+    const data: unknown = await response.json();
+    return { status: response.status, ok: response.ok, data, source: "network" as const };
+  }
+
+  async function fetchJson(
+    url: string,
+    init: RequestInit | undefined,
+    signal: AbortSignal,
+  ): Promise<ApiResult> {
+    const method = (init?.method ?? "GET").toUpperCase();
+    const started = now();
+    const shareable = method === "GET" && init?.body == null;
+    try {
+      const result = shareable
+        ? await fetchShared(url, init, signal)
+        : await fetchDirect(url, init, signal);
+      const durationMs = now() - started;
+      emit({ method, url, status: result.status, source: result.source, durationMs });
+      return { ...result, durationMs };
+    } catch (error: unknown) {
+      if (!isAbortError(error)) {
+        emit({ method, url, status: null, source: null, durationMs: now() - started });
+      }
+      throw error;
+    }
+  }
+
+  return {
+    fetchJson,
+    onTiming(listener) {
+      listeners.add(listener);
+      return () => {
+        listeners.delete(listener);
+      };
+    },
+    clear() {
+      cache.clear();
+    },
+  };
+}
@@ -0,0 +1,215 @@
+import { normalizeApiBaseUrl } from "./logger.js";
+import type { ApiTiming } from "./services/api-transport.js";
+
+export type ResourceTimingEntry = [initiator: string, durationMs: number];
+export type ApiTimingEntry = [method: string, path: string, status: number, durationMs: number];
+
+export interface NavigationTimings {
+  ttfb: number | null;
+  dom_content_loaded: number | null;
+  load: number | null;
+}
+
+export interface TelemetryBatch {
+  page_path: string;
+  navigation?: NavigationTimings;
+  resources: ResourceTimingEntry[];
+  api: ApiTimingEntry[];
+}
+
+export interface PerfTelemetryOptions {
+  getApiBaseUrl: () => string;
+  pagePath: string;
+  fetchImpl?: typeof fetch;
+  sendBeacon?: (url: string, body: string) => boolean;
+  sampleRate?: number;
+  random?: () => number;
+  maxBatchEntries?: number;
+  flushDelayMs?: number;
+}
+
+export interface PerfTelemetry {
+  recordApiTiming: (timing: ApiTiming) => void;
+  recordNavigation: (entry: PerformanceNavigationTiming) => void;
+  recordResource: (entry: PerformanceResourceTiming) => void;
+  flush: (useBeacon?: boolean) => Promise<void>;
+  pending: () => number;
+}
+
+export const TELEMETRY_PATH = "/api/v1/telemetry/frontend";
+export const DEFAULT_TELEMETRY_SAMPLE_RATE = 0.25;
+const DEFAULT_MAX_BATCH_ENTRIES = 50;
+const DEFAULT_FLUSH_DELAY_MS = 15_000;
+// API calls are reported from the transport with their real outcome, and
+// reporting the telemetry and log requests themselves would feed back.
+const SKIPPED_INITIATORS = new Set(["fetch", "xmlhttprequest", "beacon"]);
+
+function defaultFetch(input: RequestInfo | URL, init?: RequestInit): Promise<Response> {
+  return window.fetch(input, init);
+}
+
+function defaultSendBeacon(url: string, body: string): boolean {
+  if (typeof navigator === "undefined" || typeof navigator.sendBeacon !== "function") {
+    return false;
+  }
+  return navigator.sendBeacon(url, new Blob([body], { type: "text/plain" }));
+}
+
+function roundMs(value: number): number {
+  return Math.round(value * 10) / 10;
+}
+
+function positiveOrNull(value: number): number | null {
+  return value > 0 ? roundMs(value) : null;
+}
+
+function urlPath(url: string): string {
+  try {
+    return new URL(url).pathname;
+  } catch {
+    return url.split("?", 1)[0];
+  }
+}
+
+/**
+ * Collects navigation, resource and API timings for one page view and sends
+ * them to the backend in small batches.
+ *
+ * Sampling is decided once per page view, so a sampled view reports all of
+ * its timings and an unsampled one costs nothing. Batches go out once
+ * `maxBatchEntries` timings are queued, `flushDelayMs` after the first queued
+ * one, and when the page is hidden. They are posted as `text/plain`, which
+ * makes them CORS simple requests: no preflight, and `sendBeacon` can
+ * deliver them while the page unloads.
+ */
+export function createPerfTelemetry(options: PerfTelemetryOptions): PerfTelemetry | null {
+  const sampleRate = options.sampleRate ?? DEFAULT_TELEMETRY_SAMPLE_RATE;
+  if (sampleRate <= 0 || (options.random ?? Math.random)() >= sampleRate) {
+    return null;
+  }
+
+  const fetchImpl = options.fetchImpl ?? defaultFetch;
+  const sendBeacon = options.sendBeacon ?? defaultSendBeacon;
+  const maxBatchEntries = options.maxBatchEntries ?? DEFAULT_MAX_BATCH_ENTRIES;
+  const flushDelayMs = options.flushDelayMs ?? DEFAULT_FLUSH_DELAY_MS;
+
+  let navigation: NavigationTimings | null = null;
+  let resources: ResourceTimingEntry[] = [];
+  let api: ApiTimingEntry[] = [];
+  let timer: ReturnType<typeof setTimeout> | null = null;
+
+  function pending(): number {
+    return resources.length + api.length + (navigation == null ? 0 : 1);
+  }
+
+  function queued(): void {
+    if (pending() >= maxBatchEntries) {
+      void flush();
+    } else if (timer == null) {
+      timer = setTimeout(() => {
+        void flush();
+      }, flushDelayMs);
+    }
+  }
+
+  async function flush(useBeacon = false): Promise<void> {
+    if (timer != null) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    if (pending() === 0) {
+      return;
+    }
+
+    const batch: TelemetryBatch = { page_path: options.pagePath, resources, api };
+    if (navigation != null) {
+      batch.navigation = navigation;
+    }
+    navigation = null;
+    resources = [];
+    api = [];
+
+    const url = `${normalizeApiBaseUrl(options.getApiBaseUrl())}${TELEMETRY_PATH}`;
+    const body = JSON.stringify(batch);
+    if (useBeacon && sendBeacon(url, body)) {
+      return;
+    }
+    try {
+      await fetchImpl(url, {
+        method: "POST",
+        headers: { "Content-Type": "text/plain" },
+        body,
+        keepalive: true,
+      });
+    } catch {
+      // Telemetry is best effort; a lost batch is not worth a retry.
+    }
+  }
+
+  return {
+    recordApiTiming(timing) {
+      // Cache hits and shared requests did not touch the network.
+      if (timing.source === "cache" || timing.source === "shared") {
+        return;
+      }
+      api.push([timing.method, urlPath(timing.url), timing.status ?? 0, roundMs(timing.durationMs)]);
+      queued();
+    },
+    recordNavigation(entry) {
+      navigation = {
+        ttfb: positiveOrNull(entry.responseStart - entry.startTime),
+        dom_content_loaded: positiveOrNull(entry.domContentLoadedEventEnd - entry.startTime),
+        load: positiveOrNull(entry.loadEventEnd - entry.startTime),
+      };
+      queued();
+    },
+    recordResource(entry) {
+      if (SKIPPED_INITIATORS.has(entry.initiatorType)) {
+        return;
+      }
+      resources.push([entry.initiatorType, roundMs(entry.duration)]);
+      queued();
+    },
+    flush,
+    pending,
+  };
+}
+
+/** Feeds the browser's navigation and resource timings into `telemetry`. */
+export function observePagePerformance(telemetry: PerfTelemetry, windowRef: Window = window): void {
+  const performanceRef = windowRef.performance;
+  if (performanceRef == null || typeof performanceRef.getEntriesByType !== "function") {
+    return;
+  }
+
+  const recordNavigation = (): void => {
+    const [entry] = performanceRef.getEntriesByType("navigation") as PerformanceNavigationTiming[];
+    if (entry != null) {
+      telemetry.recordNavigation(entry);
+    }
+  };
+  if (windowRef.document.readyState === "complete") {
+    recordNavigation();
+  } else {
+    // loadEventEnd is only set once the load handlers have returned.
+    windowRef.addEventListener("load", () => setTimeout(recordNavigation, 0), { once: true });
+  }
+
+  if (typeof PerformanceObserver === "function") {
+    const observer = new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        telemetry.recordResource(entry as PerformanceResourceTiming);
+      }
+    });
+    observer.observe({ type: "resource", buffered: true });
+  }
+
+  windowRef.document.addEventListener("visibilitychange", () => {
+    if (windowRef.document.visibilityState === "hidden") {
+      void telemetry.flush(true);
+    }
+  });
+  windowRef.addEventListener("pagehide", () => {
+    void telemetry.flush(true);
+  });
+}
@@ -0,0 +1,169 @@
+export interface PayloadSize {
+  nodes: number;
+  chars: number;
+  /** False when the walk stopped at `maxNodes` before seeing everything. */
+  complete: boolean;
+}
+
+export interface JsonPreview {
+  text: string;
+  truncated: boolean;
+}
+
+export interface IncrementalFormatOptions {
+  signal?: AbortSignal;
+  /** Main-thread time spent formatting before yielding to the event loop. */
+  sliceMs?: number;
+  chunkChars?: number;
+}
+
+const DEFAULT_CHUNK_CHARS = 16_384;
+const DEFAULT_SLICE_MS = 8;
+const INDENT = "  ";
+
+/**
+ * Produces the same text as `JSON.stringify(value, null, 2)` in pieces of
+ * roughly `chunkChars`, so callers can stop early or yield between pieces.
+ */
+export function* formatJsonChunks(
+  value: unknown,
+  chunkChars = DEFAULT_CHUNK_CHARS,
+): Generator<string, void, undefined> {
+  let buffer = "";
+
+  function* flush(): Generator<string, void, undefined> {
+    if (buffer.length >= chunkChars) {
+      const chunk = buffer;
+      buffer = "";
+      yield chunk;
+    }
+  }
+
+  function* write(node: unknown, indent: string): Generator<string, void, undefined> {
+    if (node === null || typeof node !== "object") {
+      buffer += JSON.stringify(node) ?? "null";
+      yield* flush();
+      return;
+    }
+
+    const inner = indent + INDENT;
+    if (Array.isArray(node)) {
+      if (node.length === 0) {
+        buffer += "[]";
+        return;
+      }
+      buffer += "[";
+      for (let index = 0; index < node.length; index += 1) {
+        buffer += (index === 0 ? "\n" : ",\n") + inner;
+        yield* write(node[index], inner);
+      }
+      buffer += `\n${indent}]`;
+    } else {
+      let first = true;
+      for (const [key, child] of Object.entries(node)) {
+        if (child === undefined || typeof child === "function") {
+          continue;
+        }
+        buffer += `${first ? "{\n" : ",\n"}${inner}${JSON.stringify(key)}: `;
+        first = false;
+        yield* write(child, inner);
+      }
+      buffer += first ? "{}" : `\n${indent}}`;
+    }
+    yield* flush();
+  }
+
+  yield* write(value, "");
+  if (buffer.length > 0) {
+    yield buffer;
+  }
+}
+
+/** Counts nodes and approximate serialized size, stopping after `maxNodes`. */
+export function measurePayload(value: unknown, maxNodes: number): PayloadSize {
+  const pending: unknown[] = [value];
+  let nodes = 0;
+  let chars = 0;
+  while (pending.length > 0) {
+    if (nodes >= maxNodes) {
+      return { nodes, chars, complete: false };
+    }
+    const node = pending.pop();
+    nodes += 1;
+    if (typeof node === "string") {
+      chars += node.length + 2;
+    } else if (node !== null && typeof node === "object") {
+      if (Array.isArray(node)) {
+        chars += 2 + node.length;
+        for (const child of node) {
+          pending.push(child);
+        }
+      } else {
+        for (const [key, child] of Object.entries(node)) {
+          chars += key.length + 4;
+          pending.push(child);
+        }
+      }
+    } else {
+      chars += 8;
+    }
+  }
+  return { nodes, chars, complete: true };
+}
+
+function nextTask(): Promise<void> {
+  return new Promise((resolve) => {
+    setTimeout(resolve, 0);
+  });
+}
+
+function throwIfAborted(signal: AbortSignal | undefined): void {
+  if (signal?.aborted) {
+    throw signal.reason ?? new DOMException("Formatting was aborted.", "AbortError");
+  }
+}
+
+async function formatIncrementally(
+  value: unknown,
+  maxChars: number,
+  options: IncrementalFormatOptions,
+): Promise<{ parts: string[]; chars: number; truncated: boolean }> {
+  const sliceMs = options.sliceMs ?? DEFAULT_SLICE_MS;
+  const parts: string[] = [];
+  let chars = 0;
+  let sliceStarted = performance.now();
+  for (const chunk of formatJsonChunks(value, options.chunkChars)) {
+    throwIfAborted(options.signal);
+    parts.push(chunk);
+    chars += chunk.length;
+    if (chars >= maxChars) {
+      return { parts, chars, truncated: true };
+    }
+    if (performance.now() - sliceStarted >= sliceMs) {
+      await nextTask();
+      sliceStarted = performance.now();
+    }
+  }
+  throwIfAborted(options.signal);
+  return { parts, chars, truncated: false };
+}
+
+/** Formats the first `maxChars` of the pretty JSON without blocking the page. */
+export async function formatJsonPreview(
+  value: unknown,
+  maxChars: number,
+  options: IncrementalFormatOptions = {},
+): Promise<JsonPreview> {
+  const { parts, truncated } = await formatIncrementally(value, maxChars, options);
+  const text = parts.join("");
+  return truncated ? { text: text.slice(0, maxChars), truncated } : { text, truncated };
+}
+
+/** Formats the whole payload in slices; the parts can be passed to `Blob`. */
+export async function formatJsonParts(
+  value: unknown,
+  options: IncrementalFormatOptions = {},
+): Promise<string[]> {
+  const { parts } = await formatIncrementally(value, Number.POSITIVE_INFINITY, options);
+  return parts;
+}
@@ -0,0 +1,229 @@
+export interface JsonTreeOptions {
+  rowHeight?: number;
+  viewportRows?: number;
+  overscanRows?: number;
+  /** Children listed per expansion; the rest sit behind a "show more" row. */
+  pageSize?: number;
+  maxPreviewChars?: number;
+}
+
+export interface JsonTreeRow {
+  depth: number;
+  label: string;
+  value: unknown;
+  expandable: boolean;
+  expanded: boolean;
+  /** For "show more" rows: the container and the next child to list. */
+  more?: { parent: unknown; offset: number; depth: number };
+}
+
+export interface JsonTreeView {
+  element: HTMLElement;
+  rows: JsonTreeRow[];
+  toggle: (index: number) => void;
+  render: () => void;
+}
+
+const DEFAULT_ROW_HEIGHT = 22;
+const DEFAULT_VIEWPORT_ROWS = 24;
+const DEFAULT_OVERSCAN_ROWS = 8;
+const DEFAULT_PAGE_SIZE = 500;
+const DEFAULT_MAX_PREVIEW_CHARS = 160;
+
+function isContainer(value: unknown): value is Record<string, unknown> | unknown[] {
+  return value !== null && typeof value === "object";
+}
+
+function childCount(value: Record<string, unknown> | unknown[]): number {
+  return Array.isArray(value) ? value.length : Object.keys(value).length;
+}
+
+export function describeValue(value: unknown, maxChars: number): string {
+  if (Array.isArray(value)) {
+    return `[${value.length} ${value.length === 1 ? "item" : "items"}]`;
+  }
+  if (isContainer(value)) {
+    const keys = childCount(value);
+    return `{${keys} ${keys === 1 ? "key" : "keys"}}`;
+  }
+  const text = JSON.stringify(value) ?? "null";
+  return text.length > maxChars ? `${text.slice(0, maxChars)}… (${text.length} chars)` : text;
+}
+
+function makeRow(depth: number, label: string, value: unknown): JsonTreeRow {
+  return { depth, label, value, expandable: isContainer(value) && childCount(value) > 0, expanded: false };
+}
+
+/** Rows for children `offset .. offset + pageSize` of `parent`, plus a "show more" row. */
+export function childRows(
+  parent: Record<string, unknown> | unknown[],
+  depth: number,
+  offset: number,
+  pageSize: number,
+): JsonTreeRow[] {
+  const rows: JsonTreeRow[] = [];
+  let total: number;
+  if (Array.isArray(parent)) {
+    total = parent.length;
+    const end = Math.min(total, offset + pageSize);
+    for (let index = offset; index < end; index += 1) {
+      rows.push(makeRow(depth, String(index), parent[index]));
+    }
+  } else {
+    const keys = Object.keys(parent);
+    total = keys.length;
+    const end = Math.min(total, offset + pageSize);
+    for (let index = offset; index < end; index += 1) {
+      rows.push(makeRow(depth, JSON.stringify(keys[index]), parent[keys[index]]));
+    }
+  }
+
+  const next = offset + pageSize;
+  if (next < total) {
+    rows.push({
+      depth,
+      label: `… ${total - next} more`,
+      value: null,
+      expandable: false,
+      expanded: false,
+      more: { parent, offset: next, depth },
+    });
+  }
+  return rows;
+}
+
+/**
+ * Collapsible, virtualized tree for large JSON payloads.
+ *
+ * Only expanded containers have rows, children are listed a page at a time,
+ * and only the rows inside the viewport (plus some overscan) exist in the
+ * DOM; scrolling re-uses them. Rows have a fixed height, so positions are
+ * computed rather than measured.
+ */
+export function createJsonTreeView(
+  documentRef: Document,
+  value: unknown,
+  options: JsonTreeOptions = {},
+): JsonTreeView {
+  const rowHeight = options.rowHeight ?? DEFAULT_ROW_HEIGHT;
+  const viewportRows = options.viewportRows ?? DEFAULT_VIEWPORT_ROWS;
+  const overscanRows = options.overscanRows ?? DEFAULT_OVERSCAN_ROWS;
+  const pageSize = options.pageSize ?? DEFAULT_PAGE_SIZE;
+  const maxPreviewChars = options.maxPreviewChars ?? DEFAULT_MAX_PREVIEW_CHARS;
+
+  const viewport = documentRef.createElement("div");
+  viewport.className = "json-tree";
+  viewport.setAttribute("role", "tree");
+  viewport.style.height = `${viewportRows * rowHeight}px`;
+  const spacer = documentRef.createElement("div");
+  spacer.className = "json-tree-spacer";
+  const list = documentRef.createElement("div");
+  list.className = "json-tree-rows";
+  spacer.append(list);
+  viewport.append(spacer);
+
+  const rows: JsonTreeRow[] = [makeRow(0, "(root)", value)];
+  const pool: HTMLElement[] = [];
+  let frame: number | null = null;
+
+  function expand(index: number): void {
+    const row = rows[index];
+    if (!isContainer(row.value)) {
+      return;
+    }
+    row.expanded = true;
+    rows.splice(index + 1, 0, ...childRows(row.value, row.depth + 1, 0, pageSize));
+  }
+
+  function collapse(index: number): void {
+    const row = rows[index];
+    let end = index + 1;
+    while (end < rows.length && rows[end].depth > row.depth) {
+      end += 1;
+    }
+    row.expanded = false;
+    rows.splice(index + 1, end - index - 1);
+  }
+
+  function showMore(index: number): void {
+    const more = rows[index].more;
+    if (more == null || !isContainer(more.parent)) {
+      return;
+    }
+    rows.splice(index, 1, ...childRows(more.parent, more.depth, more.offset, pageSize));
+  }
+
+  function toggle(index: number): void {
+    const row = rows[index];
+    if (row == null) {
+      return;
+    }
+    if (row.more != null) {
+      showMore(index);
+    } else if (row.expanded) {
+      collapse(index);
+    } else if (row.expandable) {
+      expand(index);
+    } else {
+      return;
+    }
+    render();
+  }
+
+  function rowElement(slot: number): HTMLElement {
+    let element = pool[slot];
+    if (element == null) {
+      element = documentRef.createElement("div");
+      element.className = "json-tree-row";
+      element.setAttribute("role", "treeitem");
+      element.style.height = `${rowHeight}px`;
+      pool[slot] = element;
+    }
+    return element;
+  }
+
+  function render(): void {
+    frame = null;
+    spacer.style.height = `${rows.length * rowHeight}px`;
+    const first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - overscanRows);
+    const last = Math.min(rows.length, first + viewportRows + overscanRows * 2);
+    list.style.transform = `translateY(${first * rowHeight}px)`;
+
+    const elements: HTMLElement[] = [];
+    for (let index = first; index < last; index += 1) {
+      const row = rows[index];
+      const element = rowElement(index - first);
+      element.dataset.index = String(index);
+      element.dataset.kind = row.more != null ? "more" : row.expandable ? "branch" : "leaf";
+      element.style.paddingLeft = `${row.depth * 1.1}rem`;
+      if (row.expandable) {
+        element.setAttribute("aria-expanded", String(row.expanded));
+      } else {
+        element.removeAttribute("aria-expanded");
+      }
+      const marker = row.expandable ? (row.expanded ? "▾ " : "▸ ") : "";
+      element.textContent =
+        row.more != null
+          ? row.label
+          : `${marker}${row.label}: ${describeValue(row.value, maxPreviewChars)}`;
+      elements.push(element);
+    }
+    list.replaceChildren(...elements);
+  }
+
+  viewport.addEventListener("scroll", () => {
+    if (frame == null) {
+      frame = requestAnimationFrame(render);
+    }
+  });
+  viewport.addEventListener("click", (event) => {
+    const target = (event.target as HTMLElement | null)?.closest<HTMLElement>(".json-tree-row");
+    if (target?.dataset.index != null) {
+      toggle(Number(target.dataset.index));
+    }
+  });
+
+  expand(0);
+  render();
+  return { element: viewport, rows, toggle, render };
+}
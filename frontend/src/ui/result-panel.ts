@@ -1,10 +1,124 @@
+import { formatJsonParts, formatJsonPreview, measurePayload } from "./json-format.js";
+import { createJsonTreeView } from "./json-tree.js";
+
+// Up to these sizes the payload is stringified in one go, as before.
+export const PLAIN_MAX_NODES = 2_000;
+export const PLAIN_MAX_CHARS = 100_000;
+// Past these the tree is not worth building: a truncated preview is shown.
+export const TREE_MAX_NODES = 500_000;
+export const TREE_MAX_CHARS = 8_000_000;
+export const PREVIEW_MAX_CHARS = 64_000;
+
+export type JsonRenderMode = "plain" | "tree" | "preview";
+
+// One render per element: a newer payload cancels formatting of the old one.
+const activeRenders = new WeakMap<HTMLElement, AbortController>();
+
+export function chooseRenderMode(payload: unknown): JsonRenderMode {
+  const size = measurePayload(payload, TREE_MAX_NODES);
+  if (size.complete && size.nodes <= PLAIN_MAX_NODES && size.chars <= PLAIN_MAX_CHARS) {
+    return "plain";
+  }
+  if (!size.complete || size.chars > TREE_MAX_CHARS) {
+    return "preview";
+  }
+  return "tree";
+}
+
+function createDownloadButton(documentRef: Document, payload: unknown): HTMLButtonElement {
+  const button = documentRef.createElement("button");
+  button.type = "button";
+  button.className = "result-download";
+  button.textContent = "Download JSON";
+  button.addEventListener("click", async () => {
+    button.disabled = true;
+    button.textContent = "Preparing download...";
+    try {
+      const parts = await formatJsonParts(payload);
+      const url = URL.createObjectURL(new Blob(parts, { type: "application/json" }));
+      const link = documentRef.createElement("a");
+      link.href = url;
+      link.download = "response.json";
+      link.click();
+      setTimeout(() => URL.revokeObjectURL(url), 0);
+    } finally {
+      button.disabled = false;
+      button.textContent = "Download JSON";
+    }
+  });
+  return button;
+}
+
+function createToolbar(documentRef: Document, payload: unknown, note: string): HTMLElement {
+  const toolbar = documentRef.createElement("div");
+  toolbar.className = "result-toolbar";
+  const text = documentRef.createElement("span");
+  text.textContent = note;
+  toolbar.append(text, createDownloadButton(documentRef, payload));
+  return toolbar;
+}
+
+/**
+ * Renders `payload` as pretty JSON into `element`, picking a strategy by
+ * size: plain text for ordinary responses, a lazy virtualized tree for large
+ * ones, and a truncated preview formatted in slices for huge ones. The last
+ * two offer the full JSON as a download.
+ */
+export async function renderJson(element: HTMLElement, payload: unknown): Promise<JsonRenderMode> {
+  activeRenders.get(element)?.abort();
+  activeRenders.delete(element);
+
+  const mode = chooseRenderMode(payload);
+  element.dataset.renderMode = mode;
+  if (mode === "plain") {
+    element.textContent = JSON.stringify(payload, null, 2);
+    return mode;
+  }
+
+  const documentRef = element.ownerDocument;
+  if (mode === "tree") {
+    const tree = createJsonTreeView(documentRef, payload);
+    element.replaceChildren(
+      createToolbar(documentRef, payload, "Large response: expand nodes to inspect it."),
+      tree.element,
+    );
+    return mode;
+  }
+
+  const controller = new AbortController();
+  activeRenders.set(element, controller);
+  element.textContent = "Formatting large response...";
+  try {
+    const preview = await formatJsonPreview(payload, PREVIEW_MAX_CHARS, { signal: controller.signal });
+    if (controller.signal.aborted) {
+      return mode;
+    }
+    const text = documentRef.createElement("div");
+    text.className = "result-preview";
+    text.textContent = preview.truncated ? `${preview.text}\n…` : preview.text;
+    const note = preview.truncated
+      ? `Very large response: showing the first ${PREVIEW_MAX_CHARS.toLocaleString("en-US")} characters.`
+      : "Very large response.";
+    element.replaceChildren(createToolbar(documentRef, payload, note), text);
+  } catch (error: unknown) {
+    if (!controller.signal.aborted) {
+      throw error;
+    }
+  } finally {
+    if (activeRenders.get(element) === controller) {
+      activeRenders.delete(element);
+    }
+  }
+  return mode;
+}
+
 export function renderOperationResult(
   resultElement: HTMLElement,
   summaryElement: HTMLElement | null,
   payload: unknown,
   summary: string,
 ): void {
-  resultElement.textContent = JSON.stringify(payload, null, 2);
+  void renderJson(resultElement, payload);
   if (summaryElement != null) {
     summaryElement.textContent = summary;
   }
@@ -16,7 +130,7 @@ export function renderOperationError(
   payload: unknown,
   summary: string,
 ): void {
-  resultElement.textContent = JSON.stringify(payload, null, 2);
+  void renderJson(resultElement, payload);
   if (summaryElement != null) {
     summaryElement.textContent = summary;
   }
@@ -27,5 +141,5 @@ export function renderRequestPayload(requestElement: HTMLElement | null, payload
     return;
   }
 
-  requestElement.textContent = JSON.stringify(payload, null, 2);
+  void renderJson(requestElement, payload);
 }
@@ -0,0 +1,271 @@
+import { describe, expect, it, vi } from "vitest";
+
+import { requestJson } from "../src/services/api-client";
+import {
+  type ApiTiming,
+  createApiTransport,
+  parseCacheControl,
+} from "../src/services/api-transport";
+
+function createJsonResponse(
+  payload: unknown,
+  status = 200,
+  headers: Record<string, string> = {},
+): Response {
+  return new Response(status === 304 ? null : JSON.stringify(payload), {
+    status,
+    headers: { "Content-Type": "application/json", ...headers },
+  });
+}
+
+function deferred<T>(): { promise: Promise<T>; resolve: (value: T) => void } {
+  let resolve!: (value: T) => void;
+  const promise = new Promise<T>((done) => {
+    resolve = done;
+  });
+  return { promise, resolve };
+}
+
+function createClock(): { now: () => number; advance: (ms: number) => void } {
+  let current = 1000;
+  return {
+    now: () => current,
+    advance: (ms: number) => {
+      current += ms;
+    },
+  };
+}
+
+function signal(): AbortSignal {
+  return new AbortController().signal;
+}
+
+describe("api transport", () => {
+  it("parses cache-control directives", () => {
+    expect(parseCacheControl("public, max-age=30")).toEqual({
+      noStore: false,
+      noCache: false,
+      maxAgeSeconds: 30,
+    });
+    expect(parseCacheControl("No-Store")).toMatchObject({ noStore: true });
+    expect(parseCacheControl("no-cache, max-age=bogus")).toEqual({
+      noStore: false,
+      noCache: true,
+      maxAgeSeconds: null,
+    });
+    expect(parseCacheControl(null).maxAgeSeconds).toBeNull();
+  });
+
+  it("shares one network request between identical in-flight GETs", async () => {
+    const response = deferred<Response>();
+    const fetchMock = vi.fn().mockReturnValue(response.promise);
+    const api = createApiTransport({ fetchImpl: fetchMock as unknown as typeof fetch });
+
+    const first = api.fetchJson("http://api.local/api/v1/time", undefined, signal());
+    const second = api.fetchJson("http://api.local/api/v1/time", undefined, signal());
+    response.resolve(createJsonResponse({ utc: "2026-02-07T12:34:56+00:00" }));
+
+    const [a, b] = await Promise.all([first, second]);
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(a.source).toBe("network");
+    expect(b.source).toBe("shared");
+    expect(b.data).toEqual(a.data);
+  });
+
+  it("never shares or caches requests with a body", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockImplementation(() =>
+        Promise.resolve(createJsonResponse({ echoed: "hi" }, 200, { "Cache-Control": "max-age=60" })),
+      );
+    const api = createApiTransport({ fetchImpl: fetchMock as unknown as typeof fetch });
+    const init = { method: "POST", body: "{\"message\":\"hi\"}" };
+
+    await Promise.all([
+      api.fetchJson("http://api.local/api/v1/echo", init, signal()),
+      api.fetchJson("http://api.local/api/v1/echo", init, signal()),
+    ]);
+    await api.fetchJson("http://api.local/api/v1/echo", init, signal());
+
+    expect(fetchMock).toHaveBeenCalledTimes(3);
+  });
+
+  it("serves fresh responses from cache until max-age runs out", async () => {
+    const clock = createClock();
+    const fetchMock = vi
+      .fn()
+      .mockImplementation(() =>
+        Promise.resolve(createJsonResponse({ result: 6.5 }, 200, { "Cache-Control": "max-age=10" })),
+      );
+    const api = createApiTransport({
+      fetchImpl: fetchMock as unknown as typeof fetch,
+      now: clock.now,
+    });
+    const url = "http://api.local/api/v1/math/add?a=2&b=4.5";
+
+    expect((await api.fetchJson(url, undefined, signal())).source).toBe("network");
+    clock.advance(9_000);
+    expect((await api.fetchJson(url, undefined, signal())).source).toBe("cache");
+    clock.advance(2_000);
+    expect((await api.fetchJson(url, undefined, signal())).source).toBe("network");
+    expect(fetchMock).toHaveBeenCalledTimes(2);
+  });
+
+  it("does not keep responses without cache headers or with no-store", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockImplementationOnce(() => Promise.resolve(createJsonResponse({ status: "ok" })))
+      .mockImplementationOnce(() =>
+        Promise.resolve(createJsonResponse({ status: "ok" }, 200, { "Cache-Control": "no-store, max-age=60" })),
+      )
+      .mockImplementation(() => Promise.resolve(createJsonResponse({ status: "ok" })));
+    const api = createApiTransport({ fetchImpl: fetchMock as unknown as typeof fetch });
+
+    for (let attempt = 0; attempt < 3; attempt += 1) {
+      await api.fetchJson("http://api.local/api/v1/health", undefined, signal());
+    }
+    expect(fetchMock).toHaveBeenCalledTimes(3);
+  });
+
+  it("revalidates stale entries with If-None-Match and reuses them on 304", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockImplementationOnce(() =>
+        Promise.resolve(createJsonResponse({ status: "ok" }, 200, { "Cache-Control": "no-cache", ETag: "\"v1\"" })),
+      )
+      .mockImplementationOnce(() => Promise.resolve(createJsonResponse(null, 304, { ETag: "\"v1\"" })));
+    const api = createApiTransport({ fetchImpl: fetchMock as unknown as typeof fetch });
+    const url = "http://api.local/api/v1/health";
+
+    await api.fetchJson(url, undefined, signal());
+    const revalidated = await api.fetchJson(url, undefined, signal());
+
+    const headers = new Headers((fetchMock.mock.calls[1][1] as RequestInit).headers);
+    expect(headers.get("If-None-Match")).toBe("\"v1\"");
+    expect(revalidated.source).toBe("revalidated");
+    expect(revalidated.data).toEqual({ status: "ok" });
+  });
+
+  it("evicts the least recently used entry beyond the size limit", async () => {
+    const fetchMock = vi
+      .fn()
+      .mockImplementation(() =>
+        Promise.resolve(createJsonResponse({}, 200, { "Cache-Control": "max-age=60" })),
+      );
+    const api = createApiTransport({
+      fetchImpl: fetchMock as unknown as typeof fetch,
+      maxCacheEntries: 2,
+    });
+
+    await api.fetchJson("http://api.local/a", undefined, signal());
+    await api.fetchJson("http://api.local/b", undefined, signal());
+    await api.fetchJson("http://api.local/a", undefined, signal());
+    await api.fetchJson("http://api.local/c", undefined, signal());
+
+    expect((await api.fetchJson("http://api.local/a", undefined, signal())).source).toBe("cache");
+    expect((await api.fetchJson("http://api.local/b", undefined, signal())).source).toBe("network");
+  });
+
+  it("aborts the network request once every waiter has gone", async () => {
+    let networkSignal: AbortSignal | undefined;
+    const fetchMock = vi.fn().mockImplementation((_url: string, init: RequestInit) => {
+      networkSignal = init.signal ?? undefined;
+      return new Promise<Response>(() => undefined);
+    });
+    const api = createApiTransport({ fetchImpl: fetchMock as unknown as typeof fetch });
+    const controller = new AbortController();
+
+    const pending = api.fetchJson("http://api.local/api/v1/time", undefined, controller.signal);
+    controller.abort();
+
+    await expect(pending).rejects.toMatchObject({ name: "AbortError" });
+    expect(networkSignal?.aborted).toBe(true);
+  });
+
+  it("reports client-measured latency to timing listeners", async () => {
+    const clock = createClock();
+    const fetchMock = vi.fn().mockImplementation(() => {
+      clock.advance(42);
+      return Promise.resolve(createJsonResponse({ status: "ok" }));
+    });
+    const api = createApiTransport({
+      fetchImpl: fetchMock as unknown as typeof fetch,
+      now: clock.now,
+    });
+    const timings: ApiTiming[] = [];
+    const unsubscribe = api.onTiming((timing) => timings.push(timing));
+
+    const result = await api.fetchJson("http://api.local/api/v1/health", undefined, signal());
+    unsubscribe();
+    await api.fetchJson("http://api.local/api/v1/health", undefined, signal());
+
+    expect(result.durationMs).toBe(42);
+    expect(timings).toEqual([
+      {
+        method: "GET",
+        url: "http://api.local/api/v1/health",
+        status: 200,
+        source: "network",
+        durationMs: 42,
+      },
+    ]);
+  });
+});
+
+describe("requestJson", () => {
+  function createContext(fetchImpl: typeof fetch) {
+    document.body.innerHTML = `
+      <input id="api-base" value="http://api.local" />
+      <pre id="request-payload"></pre>
+      <p id="request-status"></p>
+      <p id="operation-summary"></p>
+      <pre id="result"></pre>
+    `;
+    return {
+      api: createApiTransport({ fetchImpl }),
+      logger: { log: vi.fn().mockResolvedValue(undefined) },
+      pagePath: "/pages/math.html",
+      apiBaseInput: document.getElementById("api-base") as HTMLInputElement,
+      resultElement: document.getElementById("result") as HTMLElement,
+      summaryElement: document.getElementById("operation-summary"),
+      requestElement: document.getElementById("request-payload"),
+      requestStatusElement: document.getElementById("request-status"),
+    };
+  }
+
+  it("aborts a superseded request and renders only the latest response", async () => {
+    const slow = deferred<Response>();
+    const signals: AbortSignal[] = [];
+    const fetchMock = vi
+      .fn()
+      .mockImplementationOnce((_url: string, init: RequestInit) => {
+        signals.push(init.signal as AbortSignal);
+        return slow.promise;
+      })
+      .mockImplementationOnce(() => Promise.resolve(createJsonResponse({ a: 1, b: 1, result: 2 })));
+    const context = createContext(fetchMock as unknown as typeof fetch);
+
+    const first = requestJson(context, "/api/v1/math/add?a=2&b=4.5");
+    const second = requestJson(context, "/api/v1/math/add?a=1&b=1");
+    slow.resolve(createJsonResponse({ a: 2, b: 4.5, result: 6.5 }));
+    await Promise.all([first, second]);
+
+    expect(signals[0].aborted).toBe(true);
+    expect(context.resultElement.textContent).toContain("\"result\": 2");
+    expect(context.requestStatusElement?.textContent).toMatch(/completed successfully in \d+ ms/);
+    const events = context.logger.log.mock.calls.map((call) => call[0].event);
+    expect(events).toEqual(["api.request.succeeded"]);
+  });
+
+  it("renders the JSON payload without re-parsing the body", async () => {
+    const fetchMock = vi.fn().mockResolvedValue(createJsonResponse({ echoed: "hi", length: 2 }));
+    const context = createContext(fetchMock as unknown as typeof fetch);
+
+    await requestJson(context, "/api/v1/echo", { method: "POST", json: { message: "hi" } });
+
+    const init = fetchMock.mock.calls[0][1] as RequestInit;
+    expect(init.body).toBe("{\"message\":\"hi\"}");
+    expect(new Headers(init.headers).get("Content-Type")).toBe("application/json");
+    expect(context.requestElement?.textContent).toContain("\"message\": \"hi\"");
+  });
+});
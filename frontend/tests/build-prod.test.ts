@@ -0,0 +1,72 @@
+import { describe, expect, it } from "vitest";
+
+import {
+  collectPreloads,
+  entryNameFromHtml,
+  formatSizeReport,
+  rewriteHtml,
+} from "../scripts/build-prod.mjs";
+
+const PAGE_HTML = `<!doctype html>
+<html lang="en">
+  <head>
+    <link rel="stylesheet" href="../styles.css" />
+  </head>
+  <body>
+    <script type="module" src="../dist/pages/health.js"></script>
+  </body>
+</html>
+`;
+
+describe("production build helpers", () => {
+  it("reads the entry name from the dev module script", () => {
+    expect(entryNameFromHtml(PAGE_HTML)).toBe("health");
+    expect(entryNameFromHtml("<html></html>")).toBeNull();
+  });
+
+  it("follows static imports only when collecting preloads", () => {
+    const metafile = {
+      outputs: {
+        "build/assets/health-A.js": {
+          imports: [
+            { path: "build/assets/shared-B.js", kind: "import-statement" },
+            { path: "build/assets/lazy-C.js", kind: "dynamic-import" },
+          ],
+        },
+        "build/assets/shared-B.js": {
+          imports: [{ path: "build/assets/shared-D.js", kind: "import-statement" }],
+        },
+        "build/assets/shared-D.js": { imports: [] },
+      },
+    };
+
+    expect(collectPreloads(metafile, "build/assets/health-A.js")).toEqual([
+      "build/assets/shared-B.js",
+      "build/assets/shared-D.js",
+    ]);
+  });
+
+  it("points the page at hashed assets and adds modulepreload hints", () => {
+    const html = rewriteHtml(PAGE_HTML, {
+      prefix: "../",
+      entry: "assets/health-A.js",
+      preloads: ["assets/shared-B.js"],
+      stylesheet: "assets/styles-C.css",
+    });
+
+    expect(html).toContain('<script type="module" src="../assets/health-A.js"></script>');
+    expect(html).toContain('<link rel="stylesheet" href="../assets/styles-C.css" />');
+    expect(html).toContain('<link rel="modulepreload" href="../assets/shared-B.js" />\n  </head>');
+    expect(html).not.toContain("dist/pages");
+  });
+
+  it("aligns the size report columns", () => {
+    const report = formatSizeReport([
+      { name: "assets/home-A.js", bytes: 1200, gzip: 600 },
+      { name: "assets/shared-B.js", bytes: 3400, gzip: 1500 },
+    ]).split("\n");
+
+    expect(report).toHaveLength(3);
+    expect(new Set(report.map((line) => line.length)).size).toBe(1);
+  });
+});
@@ -0,0 +1,117 @@
+import { describe, expect, it } from "vitest";
+
+import { formatJsonChunks, formatJsonPreview, measurePayload } from "../src/ui/json-format";
+import { createJsonTreeView } from "../src/ui/json-tree";
+import { chooseRenderMode, PREVIEW_MAX_CHARS, renderJson } from "../src/ui/result-panel";
+
+const SAMPLE = {
+  name: "batch",
+  empty: {},
+  list: [],
+  skipped: undefined,
+  results: [1, 2.5, null, true, "text \"quoted\"", { nested: [{ deep: ["x"] }] }],
+};
+
+function largeArray(length: number): Array<{ id: number; value: string }> {
+  return Array.from({ length }, (_, id) => ({ id, value: `item-${id}` }));
+}
+
+describe("json formatting", () => {
+  it("matches JSON.stringify output regardless of chunk size", () => {
+    const expected = JSON.stringify(SAMPLE, null, 2);
+    for (const chunkChars of [1, 7, 16_384]) {
+      expect([...formatJsonChunks(SAMPLE, chunkChars)].join("")).toBe(expected);
+    }
+  });
+
+  it("stops measuring at the node limit", () => {
+    expect(measurePayload(SAMPLE, 1000)).toMatchObject({ complete: true });
+    expect(measurePayload(largeArray(100), 50)).toMatchObject({ nodes: 50, complete: false });
+  });
+
+  it("formats only as much as the preview needs", async () => {
+    const preview = await formatJsonPreview(largeArray(50_000), 1_000);
+    expect(preview.truncated).toBe(true);
+    expect(preview.text).toHaveLength(1_000);
+    expect(preview.text.startsWith("[\n  {\n    \"id\": 0,")).toBe(true);
+  });
+
+  it("stops formatting when aborted", async () => {
+    const controller = new AbortController();
+    controller.abort();
+    await expect(
+      formatJsonPreview(largeArray(10), 1_000, { signal: controller.signal }),
+    ).rejects.toMatchObject({ name: "AbortError" });
+  });
+});
+
+describe("json tree view", () => {
+  it("creates rows lazily and keeps only visible ones in the DOM", () => {
+    const tree = createJsonTreeView(document, largeArray(10_000), {
+      pageSize: 100,
+      viewportRows: 10,
+      overscanRows: 2,
+    });
+
+    // Root, its first page of children, and a "show more" row.
+    expect(tree.rows).toHaveLength(102);
+    expect(tree.rows[101].label).toBe("… 9900 more");
+    expect(tree.element.querySelectorAll(".json-tree-row")).toHaveLength(14);
+
+    tree.toggle(101);
+    expect(tree.rows).toHaveLength(202);
+
+    tree.toggle(1);
+    expect(tree.rows[1].expanded).toBe(true);
+    expect(tree.rows[2]).toMatchObject({ depth: 2, label: "\"id\"", value: 0 });
+    tree.toggle(1);
+    expect(tree.rows).toHaveLength(202);
+  });
+
+  it("expands a row when it is clicked", () => {
+    const tree = createJsonTreeView(document, { outer: { inner: 1 } });
+    const row = tree.element.querySelector<HTMLElement>("[data-index='1']");
+    expect(row?.getAttribute("aria-expanded")).toBe("false");
+
+    row?.click();
+    expect(tree.rows.map((item) => item.label)).toEqual(["(root)", "\"outer\"", "\"inner\""]);
+  });
+});
+
+describe("result panel", () => {
+  it("picks a render mode by payload size", () => {
+    expect(chooseRenderMode({ status: "ok" })).toBe("plain");
+    expect(chooseRenderMode(largeArray(5_000))).toBe("tree");
+    expect(chooseRenderMode({ blob: "x".repeat(9_000_000) })).toBe("preview");
+  });
+
+  it("renders small payloads as plain JSON text", async () => {
+    const element = document.createElement("pre");
+    expect(await renderJson(element, { status: "ok" })).toBe("plain");
+    expect(element.textContent).toBe("{\n  \"status\": \"ok\"\n}");
+  });
+
+  it("renders large payloads as a tree with a download option", async () => {
+    const element = document.createElement("pre");
+    expect(await renderJson(element, largeArray(5_000))).toBe("tree");
+    expect(element.querySelector(".json-tree")).not.toBeNull();
+    expect(element.querySelector(".result-download")?.textContent).toBe("Download JSON");
+  });
+
+  it("falls back to a truncated preview for huge payloads", async () => {
+    const element = document.createElement("pre");
+    expect(await renderJson(element, { blob: "x".repeat(9_000_000) })).toBe("preview");
+    const preview = element.querySelector(".result-preview")?.textContent ?? "";
+    expect(preview.length).toBeLessThanOrEqual(PREVIEW_MAX_CHARS + 2);
+    expect(preview.endsWith("…")).toBe(true);
+    expect(element.querySelector(".result-download")).not.toBeNull();
+  });
+
+  it("drops a pending preview when a newer payload is rendered", async () => {
+    const element = document.createElement("pre");
+    const huge = renderJson(element, { blob: "x".repeat(9_000_000) });
+    await renderJson(element, { status: "ok" });
+    await huge;
+    expect(element.textContent).toBe("{\n  \"status\": \"ok\"\n}");
+  });
+});
@@ -0,0 +1,108 @@
+import { afterEach, describe, expect, it, vi } from "vitest";
+
+import { createPerfTelemetry, type PerfTelemetryOptions, TELEMETRY_PATH } from "../src/telemetry";
+
+function createTelemetry(overrides: Partial<PerfTelemetryOptions> = {}) {
+  const fetchMock = vi.fn().mockResolvedValue(new Response(null, { status: 202 }));
+  const telemetry = createPerfTelemetry({
+    getApiBaseUrl: () => "http://api.local/",
+    pagePath: "/pages/health.html",
+    fetchImpl: fetchMock as unknown as typeof fetch,
+    sampleRate: 1,
+    ...overrides,
+  });
+  return { telemetry, fetchMock };
+}
+
+function sentBatch(fetchMock: ReturnType<typeof vi.fn>, call = 0): unknown {
+  return JSON.parse((fetchMock.mock.calls[call][1] as RequestInit).body as string);
+}
+
+describe("perf telemetry", () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it("samples once per page view", () => {
+    expect(createTelemetry({ sampleRate: 0.25, random: () => 0.3 }).telemetry).toBeNull();
+    expect(createTelemetry({ sampleRate: 0.25, random: () => 0.1 }).telemetry).not.toBeNull();
+    expect(createTelemetry({ sampleRate: 0 }).telemetry).toBeNull();
+  });
+
+  it("sends a compact text/plain batch after the flush delay", async () => {
+    vi.useFakeTimers();
+    const { telemetry, fetchMock } = createTelemetry({ flushDelayMs: 1_000 });
+
+    telemetry?.recordNavigation({
+      startTime: 0,
+      responseStart: 12.34,
+      domContentLoadedEventEnd: 180,
+      loadEventEnd: 0,
+    } as PerformanceNavigationTiming);
+    telemetry?.recordResource({ initiatorType: "script", duration: 8.06 } as PerformanceResourceTiming);
+    telemetry?.recordResource({ initiatorType: "fetch", duration: 20 } as PerformanceResourceTiming);
+    telemetry?.recordApiTiming({
+      method: "GET",
+      url: "http://api.local/api/v1/math/add?a=1&b=2",
+      status: 200,
+      source: "network",
+      durationMs: 15.56,
+    });
+    telemetry?.recordApiTiming({
+      method: "GET",
+      url: "http://api.local/api/v1/math/add?a=1&b=2",
+      status: 200,
+      source: "cache",
+      durationMs: 0.1,
+    });
+
+    expect(fetchMock).not.toHaveBeenCalled();
+    await vi.advanceTimersByTimeAsync(1_000);
+
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(fetchMock.mock.calls[0][0]).toBe(`http://api.local${TELEMETRY_PATH}`);
+    const init = fetchMock.mock.calls[0][1] as RequestInit;
+    expect(init.headers).toEqual({ "Content-Type": "text/plain" });
+    expect(sentBatch(fetchMock)).toEqual({
+      page_path: "/pages/health.html",
+      navigation: { ttfb: 12.3, dom_content_loaded: 180, load: null },
+      resources: [["script", 8.1]],
+      api: [["GET", "/api/v1/math/add", 200, 15.6]],
+    });
+    expect(telemetry?.pending()).toBe(0);
+  });
+
+  it("flushes as soon as the batch is full", () => {
+    const { telemetry, fetchMock } = createTelemetry({ maxBatchEntries: 2 });
+
+    for (const durationMs of [5, 6]) {
+      telemetry?.recordApiTiming({
+        method: "GET",
+        url: "http://api.local/api/v1/time",
+        status: null,
+        source: null,
+        durationMs,
+      });
+    }
+
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    expect(sentBatch(fetchMock)).toMatchObject({
+      api: [
+        ["GET", "/api/v1/time", 0, 5],
+        ["GET", "/api/v1/time", 0, 6],
+      ],
+    });
+  });
+
+  it("prefers sendBeacon when the page is going away", async () => {
+    const sendBeacon = vi.fn().mockReturnValue(true);
+    const { telemetry, fetchMock } = createTelemetry({ sendBeacon });
+
+    telemetry?.recordResource({ initiatorType: "css", duration: 3 } as PerformanceResourceTiming);
+    await telemetry?.flush(true);
+
+    expect(sendBeacon).toHaveBeenCalledTimes(1);
+    expect(sendBeacon.mock.calls[0][0]).toBe(`http://api.local${TELEMETRY_PATH}`);
+    expect(fetchMock).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,289 @@
+"""Process and port helpers shared by `dev_up.py` and `dev_down.py`.
+
+Everything is inspected directly: `os.kill(pid, 0)` and `/proc` on POSIX,
+`OpenProcess` on Windows, and a plain TCP connect for "is the port taken".
+Only port-owner lookup outside Linux still asks an external tool, once.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+RUN_DIR: Final[Path] = PROJECT_ROOT / ".run"
+LOG_DIR: Final[Path] = PROJECT_ROOT / "logs"
+HOST: Final[str] = "127.0.0.1"
+POLL_SECONDS: Final[float] = 0.05
+
+_WINDOWS_STILL_ACTIVE: Final[int] = 259
+_WINDOWS_QUERY_LIMITED_INFORMATION: Final[int] = 0x1000
+
+
+@dataclass(frozen=True)
+class Service:
+    name: str
+    port: int
+    command: tuple[str, ...]
+    ready_path: str
+
+    @property
+    def ready_url(self) -> str:
+        return f"http://{HOST}:{self.port}{self.ready_path}"
+
+    @property
+    def pid_file(self) -> Path:
+        return RUN_DIR / f"{self.name}.pid"
+
+    @property
+    def log_file(self) -> Path:
+        return LOG_DIR / f"dev-{self.name}.out.log"
+
+
+SERVICES: Final[tuple[Service, ...]] = (
+    Service(
+        name="backend",
+        port=8000,
+        command=(
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.app.main:app",
+            "--reload",
+            "--host",
+            HOST,
+            "--port",
+            "8000",
+        ),
+        ready_path="/readyz",
+    ),
+    Service(
+        name="frontend",
+        port=5500,
+        command=(
+            sys.executable,
+            "scripts/serve_frontend.py",
+            "--host",
+            HOST,
+            "--port",
+            "5500",
+        ),
+        ready_path="/",
+    ),
+)
+
+
+def elapsed_ms(started: float) -> str:
+    return f"{(time.perf_counter() - started) * 1000:.0f} ms"
+
+
+def read_pid(path: Path) -> int | None:
+    try:
+        return int(path.read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _windows_is_running(pid: int) -> bool:
+    import ctypes
+
+    kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+    handle = kernel32.OpenProcess(_WINDOWS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return False
+    try:
+        exit_code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == _WINDOWS_STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def is_running(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        return _windows_is_running(pid)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A zombie still answers signal 0 but is already dead.
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text(encoding="utf-8")
+    except OSError:
+        return True
+    return stat.rpartition(")")[2].split()[0] != "Z"
+
+
+def port_accepting(port: int, timeout: float = 0.2) -> bool:
+    try:
+        with socket.create_connection((HOST, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _proc_listening_inodes(port: int) -> set[str]:
+    inodes: set[str] = set()
+    for table in ("tcp", "tcp6"):
+        try:
+            lines = Path(f"/proc/net/{table}").read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for line in lines.splitlines()[1:]:
+            fields = line.split()
+            # local_address is HEXIP:HEXPORT; state 0A is LISTEN.
+            if fields[3] == "0A" and int(fields[1].rpartition(":")[2], 16) == port:
+                inodes.add(fields[9])
+    return inodes
+
+
+def _proc_socket_owners(inodes: set[str]) -> set[int]:
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    owners: set[int] = set()
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            descriptors = os.scandir(f"/proc/{entry.name}/fd")
+        except OSError:
+            continue
+        with descriptors:
+            for descriptor in descriptors:
+                try:
+                    if os.readlink(descriptor.path) in targets:
+                        owners.add(int(entry.name))
+                        break
+                except OSError:
+                    continue
+    return owners
+
+
+def _netstat_listening_pids(port: int) -> set[int]:
+    result = subprocess.run(
+        ["netstat", "-ano", "-p", "TCP"], check=False, capture_output=True, text=True
+    )
+    pids: set[int] = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 5 and parts[3].upper() == "LISTENING":
+            if parts[1].rpartition(":")[2] == str(port) and parts[4].isdigit():
+                pids.add(int(parts[4]))
+    return pids
+
+
+def _lsof_listening_pids(port: int) -> set[int]:
+    try:
+        result = subprocess.run(
+            ["lsof", "-t", f"-iTCP:{port}", "-sTCP:LISTEN"],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return set()
+    return {int(line) for line in result.stdout.split() if line.isdigit()}
+
+
+def listening_pids(port: int) -> set[int]:
+    """Returns the processes holding a listening TCP socket on `port`."""
+    if sys.platform.startswith("linux"):
+        inodes = _proc_listening_inodes(port)
+        pids = _proc_socket_owners(inodes) if inodes else set()
+    elif sys.platform == "win32":
+        pids = _netstat_listening_pids(port)
+    else:
+        pids = _lsof_listening_pids(port)
+    return {pid for pid in pids if pid != os.getpid() and is_running(pid)}
+
+
+def start_service(service: Service) -> subprocess.Popen[bytes]:
+    with service.log_file.open("ab") as log_handle:
+        if sys.platform == "win32":
+            process = subprocess.Popen(
+                service.command,
+                cwd=str(PROJECT_ROOT),
+                stdout=log_handle,
+                stderr=subprocess.STDOUT,
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+            )
+        else:
+            process = subprocess.Popen(
+                service.command,
+                cwd=str(PROJECT_ROOT),
+                stdout=log_handle,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    service.pid_file.write_text(str(process.pid), encoding="utf-8")
+    return process
+
+
+def _signal(pid: int, group: bool, force: bool) -> None:
+    if sys.platform == "win32":
+        if force:
+            subprocess.run(
+                ["taskkill", "/PID", str(pid), "/T", "/F"],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        elif group:
+            os.kill(pid, signal.CTRL_BREAK_EVENT)
+        else:
+            os.kill(pid, signal.SIGTERM)
+        return
+
+    signum = signal.SIGKILL if force else signal.SIGTERM
+    # Never signal the caller's own group: when dev_down runs inside the
+    # service's group, that would stop dev_down halfway through.
+    if group and pid != os.getpgrp():
+        try:
+            # Services are started in their own session, so the group also
+            # covers uvicorn's reload worker.
+            os.killpg(pid, signum)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    os.kill(pid, signum)
+
+
+def wait_exited(pid: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while is_running(pid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_SECONDS)
+    return True
+
+
+def terminate(pid: int, grace_seconds: float, group: bool = True) -> str:
+    """Asks `pid` to stop, then forces it after `grace_seconds`.
+
+    Returns `stopped`, `killed`, `gone` (already dead) or `stuck`.
+    """
+    if not is_running(pid):
+        return "gone"
+    try:
+        _signal(pid, group=group, force=False)
+    except ProcessLookupError:
+        return "gone"
+    if wait_exited(pid, grace_seconds):
+        return "stopped"
+    try:
+        _signal(pid, group=group, force=True)
+    except ProcessLookupError:
+        return "stopped"
+    return "killed" if wait_exited(pid, 2.0) else "stuck"
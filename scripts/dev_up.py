@@ -1,165 +1,121 @@
 from __future__ import annotations
 
-import os
+import argparse
 import subprocess
-import sys
-from pathlib import Path
-from typing import Final
-
-PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
-RUN_DIR: Final[Path] = PROJECT_ROOT / ".run"
-LOG_DIR: Final[Path] = PROJECT_ROOT / "logs"
-
-
-def _is_running(pid: int) -> bool:
-    if pid <= 0:
-        return False
-
-    if sys.platform == "win32":
-        result = subprocess.run(
-            ["tasklist", "/FI", f"PID eq {pid}"],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        output = (result.stdout or "").upper()
-        return str(pid) in output and "NO TASKS ARE RUNNING" not in output
-
-    try:
-        os.kill(pid, 0)
-    except Exception:
-        return False
-    return True
-
-
-def _read_pid_file(path: Path) -> int | None:
-    if not path.exists():
-        return None
-
-    try:
-        return int(path.read_text(encoding="utf-8").strip())
-    except ValueError:
-        return None
-
-
-def _service_pid_file(service_name: str) -> Path:
-    return RUN_DIR / f"{service_name}.pid"
-
-
-def _start_service(service_name: str, command: list[str], log_file: Path) -> int:
-    with log_file.open("a", encoding="utf-8") as log_handle:
-        if sys.platform == "win32":
-            process = subprocess.Popen(
-                command,
-                cwd=str(PROJECT_ROOT),
-                stdout=log_handle,
-                stderr=subprocess.STDOUT,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
-            )
-        else:
-            process = subprocess.Popen(
-                command,
-                cwd=str(PROJECT_ROOT),
-                stdout=log_handle,
-                stderr=subprocess.STDOUT,
-                start_new_session=True,
-            )
-
-    pid = process.pid
-    _service_pid_file(service_name).write_text(str(pid), encoding="utf-8")
-    return pid
-
-
-def _listening_pids(port: int) -> set[int]:
-    result = subprocess.run(
-        ["netstat", "-ano"],
-        check=False,
-        capture_output=True,
-        text=True,
-    )
-    pids: set[int] = set()
-    target = f":{port}"
-
-    for raw_line in result.stdout.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        upper_line = line.upper()
-        if "LISTENING" not in upper_line:
-            continue
-        if target not in line:
-            continue
-
-        parts = line.split()
-        if not parts:
-            continue
-        maybe_pid = parts[-1]
-        if maybe_pid.isdigit():
-            pid = int(maybe_pid)
-            if _is_running(pid):
-                pids.add(pid)
-
-    return pids
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from dev_process import (
+    LOG_DIR,
+    POLL_SECONDS,
+    RUN_DIR,
+    SERVICES,
+    Service,
+    elapsed_ms,
+    is_running,
+    listening_pids,
+    port_accepting,
+    read_pid,
+    start_service,
+    terminate,
+)
 
 
 def _ensure_clean_state() -> None:
     RUN_DIR.mkdir(parents=True, exist_ok=True)
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-    for service_name in ("backend", "frontend"):
-        pid_file = _service_pid_file(service_name)
-        pid = _read_pid_file(pid_file)
+    for service in SERVICES:
+        pid = read_pid(service.pid_file)
         if pid is None:
             continue
-        if _is_running(pid):
+        if is_running(pid):
             raise SystemExit(
-                f"{service_name} already running (pid={pid}). "
+                f"{service.name} already running (pid={pid}). "
                 "Run `make down` before `make up`."
             )
-        pid_file.unlink(missing_ok=True)
+        service.pid_file.unlink(missing_ok=True)
 
-    busy_frontend = _listening_pids(5500)
-    busy_backend = _listening_pids(8000)
-    if busy_frontend or busy_backend:
-        raise SystemExit(
-            "Ports are busy. Run `make down` first. "
-            f"5500 pids={sorted(busy_frontend)} 8000 pids={sorted(busy_backend)}"
-        )
+    # A connect attempt is enough to tell whether a port is taken; owners are
+    # only looked up for the error message.
+    busy = {
+        service.port: sorted(listening_pids(service.port))
+        for service in SERVICES
+        if port_accepting(service.port)
+    }
+    if busy:
+        ports = " ".join(f"{port} pids={pids}" for port, pids in busy.items())
+        raise SystemExit(f"Ports are busy. Run `make down` first. {ports}")
 
 
-def main() -> None:
-    _ensure_clean_state()
+def _probe(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return bool(response.status == 200)
+    except (urllib.error.URLError, OSError):
+        return False
 
-    backend_pid = _start_service(
-        service_name="backend",
-        command=[
-            sys.executable,
-            "-m",
-            "uvicorn",
-            "backend.app.main:app",
-            "--reload",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            "8000",
-        ],
-        log_file=LOG_DIR / "dev-backend.out.log",
-    )
 
-    frontend_pid = _start_service(
-        service_name="frontend",
-        command=[
-            sys.executable,
-            "-m",
-            "http.server",
-            "5500",
-            "--directory",
-            "frontend",
-        ],
-        log_file=LOG_DIR / "dev-frontend.out.log",
+def _wait_ready(
+    service: Service, process: subprocess.Popen[bytes], deadline: float
+) -> str | None:
+    """Polls the readiness URL; returns an error or None once it answers 200."""
+    while time.monotonic() < deadline:
+        code = process.poll()
+        if code is not None:
+            return f"exited with code {code}, see {service.log_file}"
+        if _probe(service.ready_url):
+            return None
+        time.sleep(POLL_SECONDS)
+    return f"not ready at {service.ready_url} in time, see {service.log_file}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Start backend and frontend and wait until both serve."
     )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30.0,
+        help="seconds to wait for the readiness probes",
+    )
+    args = parser.parse_args()
 
-    print(f"Started backend (pid={backend_pid}) and frontend (pid={frontend_pid}).")
+    started = time.perf_counter()
+    _ensure_clean_state()
+    print(f"{'preflight':<16}{elapsed_ms(started):>10}")
+
+    launched = time.perf_counter()
+    processes = {service.name: start_service(service) for service in SERVICES}
+    deadline = time.monotonic() + args.timeout
+
+    def wait(service: Service) -> tuple[Service, str | None, str]:
+        error = _wait_ready(service, processes[service.name], deadline)
+        return service, error, elapsed_ms(launched)
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=len(SERVICES)) as pool:
+        for service, error, took in pool.map(wait, SERVICES):
+            pid = processes[service.name].pid
+            if error is None:
+                print(
+                    f"{service.name + ' ready':<16}{took:>10}  "
+                    f"{service.ready_url} (pid={pid})"
+                )
+            else:
+                failed = True
+                print(f"{service.name + ' failed':<16}{took:>10}  {error}")
+
+    if failed:
+        for service in SERVICES:
+            terminate(processes[service.name].pid, grace_seconds=5)
+            service.pid_file.unlink(missing_ok=True)
+        raise SystemExit("Startup failed; started services were stopped.")
+
+    print(f"{'total':<16}{elapsed_ms(started):>10}")
     print("Backend:  http://127.0.0.1:8000")
     print("Frontend: http://127.0.0.1:5500")
     print("Stop all: make down")
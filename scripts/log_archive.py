@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.config import get_settings  # noqa: E402
+from backend.app.core.log_archive import (  # noqa: E402
+    ARCHIVE_SUFFIX,
+    ArchiveError,
+    Condition,
+    LogQuery,
+    QueryStats,
+    closed_log_files,
+    compact_log,
+    parse_time,
+    run_query,
+)
+from backend.app.core.log_retention import LogRetentionManager  # noqa: E402
+
+
+def _compact(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    log_path = Path(settings.log_file_path)
+    log_dir = args.log_dir or log_path.parent
+    archive_dir = args.archive_dir or log_dir / "archive"
+    sources = args.files or closed_log_files(
+        log_dir, log_path.stem, datetime.now().strftime("%Y-%m-%d")
+    )
+    # Deletions go through the retention manager so its manifest of closed
+    # file sizes does not keep counting the removed logs against the quota.
+    retention: dict[Path, LogRetentionManager] = {}
+
+    for source in sources:
+        archive = archive_dir / f"{source.stem}{ARCHIVE_SUFFIX}"
+        if archive.exists() and not args.force:
+            print(f"skip    {source.name} (archive exists)")
+            continue
+        started = time.perf_counter()
+        summary = compact_log(source, archive)
+        ratio = summary.source_bytes / max(summary.archive_bytes, 1)
+        print(
+            f"compact {source.name}: {summary.rows} rows in {summary.blocks} blocks, "
+            f"{summary.source_bytes:,} -> {summary.archive_bytes:,} bytes "
+            f"({ratio:.1f}x) in {time.perf_counter() - started:.2f}s"
+        )
+        if args.delete_source:
+            source_dir = source.parent.resolve()
+            if source_dir not in retention:
+                retention[source_dir] = LogRetentionManager(
+                    log_dir=source_dir,
+                    prefix=log_path.stem,
+                    retention_days=settings.log_retention_days,
+                    max_total_bytes=settings.log_retention_max_bytes,
+                    use_utc=settings.log_use_utc,
+                )
+            retention[source_dir].discard(source)
+
+
+def _print_table(rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        print("(no rows)")
+        return
+    headers = list(rows[0])
+    cells = [
+        [("-" if row[name] is None else str(row[name])) for name in headers]
+        for row in rows
+    ]
+    widths = [
+        max(len(name), *(len(line[index]) for line in cells))
+        for index, name in enumerate(headers)
+    ]
+    print(
+        "  ".join(
+            name.ljust(width) for name, width in zip(headers, widths, strict=True)
+        )
+    )
+    for line in cells:
+        print(
+            "  ".join(
+                value.ljust(width) for value, width in zip(line, widths, strict=True)
+            )
+        )
+
+
+def _query(args: argparse.Namespace) -> None:
+    query = LogQuery(
+        group_by=tuple(key for key in args.group_by.split(",") if key),
+        metrics=tuple(metric for metric in args.metrics.split(",") if metric),
+        where=tuple(Condition.parse(expression) for expression in args.where),
+        since=parse_time(args.since) if args.since else None,
+        until=parse_time(args.until) if args.until else None,
+    )
+    stats = QueryStats()
+    started = time.perf_counter()
+    rows = run_query(args.archives, query, stats)[: args.limit]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.format == "json":
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_table(rows)
+    print(
+        f"\n{stats.archives} archives, {stats.blocks_scanned}/{stats.blocks_total} "
+        f"blocks scanned, {stats.rows_scanned:,} rows in {elapsed_ms:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compact closed daily logs into columnar archives and query them."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact = commands.add_parser("compact", help="compact closed daily log files")
+    compact.add_argument("files", nargs="*", type=Path)
+    compact.add_argument("--log-dir", type=Path)
+    compact.add_argument("--archive-dir", type=Path)
+    compact.add_argument(
+        "--force", action="store_true", help="rebuild existing archives"
+    )
+    compact.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="remove each text log once archived",
+    )
+    compact.set_defaults(handler=_compact)
+
+    query = commands.add_parser("query", help="aggregate over archives")
+    query.add_argument("archives", nargs="+", type=Path)
+    query.add_argument(
+        "--group-by",
+        default="",
+        help="comma-separated: level, logger, event, path, method, status, hour, day",
+    )
+    query.add_argument(
+        "--metrics",
+        default="count",
+        help="comma-separated: count, avg, max, p50, p90, p95, p99 (of duration_ms)",
+    )
+    query.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="e.g. level=ERROR, event=http.request.completed, status>=500 (repeatable)",
+    )
+    query.add_argument("--since", help="YYYY-MM-DD[THH:MM[:SS]], inclusive")
+    query.add_argument("--until", help="YYYY-MM-DD[THH:MM[:SS]], exclusive")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--format", choices=("table", "json"), default="table")
+    query.set_defaults(handler=_query)
+
+    args = parser.parse_args()
+    try:
+        args.handler(args)
+    except ArchiveError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx  # noqa: E402
+from backend.app.core.traffic_capture import (  # noqa: E402
+    CapturedRequest,
+    read_captures,
+    response_digest,
+)
+
+SKIPPED_HEADERS: Final[frozenset[str]] = frozenset(
+    {"host", "content-length", "connection", "transfer-encoding", "accept-encoding"}
+)
+MAX_DIFF_EXAMPLES: Final[int] = 5
+
+
+@dataclass
+class ReplayReport:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+    status_diffs: Counter[str] = field(default_factory=Counter)
+    body_diffs: Counter[str] = field(default_factory=Counter)
+    examples: list[dict[str, object]] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _request_headers(record: CapturedRequest) -> dict[str, str]:
+    return {
+        name: value for name, value in record.headers if name not in SKIPPED_HEADERS
+    }
+
+
+async def _replay_one(
+    client: httpx.AsyncClient,
+    record: CapturedRequest,
+    report: ReplayReport,
+    ignore_bodies: tuple[str, ...],
+) -> None:
+    route = f"{record.method} {record.path}"
+    url = record.path + (f"?{record.query}" if record.query else "")
+    started = time.perf_counter()
+    try:
+        response = await client.request(
+            record.method,
+            url,
+            headers=_request_headers(record),
+            content=record.body or None,
+        )
+    except httpx.HTTPError as exc:
+        report.errors[f"{route}: {type(exc).__name__}"] += 1
+        return
+    report.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+    if response.status_code != record.status:
+        report.status_diffs[route] += 1
+        if len(report.examples) < MAX_DIFF_EXAMPLES:
+            report.examples.append(
+                {
+                    "route": route,
+                    "captured_status": record.status,
+                    "replayed_status": response.status_code,
+                }
+            )
+        return
+
+    if record.path.startswith(ignore_bodies):
+        return
+    if response_digest(response.content) != record.response_digest:
+        report.body_diffs[route] += 1
+        if len(report.examples) < MAX_DIFF_EXAMPLES:
+            report.examples.append(
+                {
+                    "route": route,
+                    "captured_body": record.response_body[:200].decode(
+                        "utf-8", "replace"
+                    ),
+                    "replayed_body": response.content[:200].decode("utf-8", "replace"),
+                }
+            )
+
+
+async def replay(
+    records: list[CapturedRequest],
+    client: httpx.AsyncClient,
+    speed: float | None,
+    concurrency: int,
+    ignore_bodies: tuple[str, ...] = (),
+) -> ReplayReport:
+    report = ReplayReport()
+    if not records:
+        return report
+
+    semaphore = asyncio.Semaphore(concurrency)
+    first_arrival = records[0].arrival
+    started = time.perf_counter()
+
+    async def scheduled(record: CapturedRequest) -> None:
+        if speed is not None:
+            due = (record.arrival - first_arrival) / speed
+            delay = due - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        async with semaphore:
+            await _replay_one(client, record, report, ignore_bodies)
+
+    await asyncio.gather(*(scheduled(record) for record in records))
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+def summarize(report: ReplayReport) -> dict[str, object]:
+    latencies = report.latencies_ms
+    return {
+        "requests": len(latencies) + sum(report.errors.values()),
+        "wall_seconds": round(report.wall_seconds, 3),
+        "throughput_rps": (
+            round(len(latencies) / report.wall_seconds, 1)
+            if report.wall_seconds
+            else 0.0
+        ),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p90": round(_percentile(latencies, 90), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "max": round(max(latencies, default=0.0), 2),
+        },
+        "errors": dict(report.errors),
+        "status_diffs": dict(report.status_diffs),
+        "body_diffs": dict(report.body_diffs),
+        "examples": report.examples,
+    }
+
+
+def _parse_speed(raw_value: str) -> float | None:
+    if raw_value == "max":
+        return None
+    if raw_value == "original":
+        return 1.0
+    speed = float(raw_value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive, 'original' or 'max'")
+    return speed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay captured traffic against a running backend."
+    )
+    parser.add_argument("captures", nargs="+", type=Path)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--speed",
+        type=_parse_speed,
+        default=1.0,
+        help="'original', a multiplier such as 2.5, or 'max'",
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument(
+        "--ignore-body",
+        action="append",
+        default=[],
+        help="path prefix whose response bodies are not compared (repeatable)",
+    )
+    args = parser.parse_args()
+
+    records = read_captures(args.captures)
+
+    async def run() -> ReplayReport:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=args.base_url, limits=limits, timeout=30.0
+        ) as client:
+            return await replay(
+                records,
+                client,
+                args.speed,
+                args.concurrency,
+                tuple(args.ignore_body),
+            )
+
+    print(json.dumps(summarize(asyncio.run(run())), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Static server for the frontend.
+
+By default it serves `frontend/` as-is (the `tsc` build in `dist/`), with
+caching disabled so edits show up on reload. With `--prod` it serves
+`frontend/build/` and reads `manifest.json` from it: the hashed assets it
+lists are sent as immutable for a year, and the HTML pages are always
+revalidated, so a new build is picked up on the next navigation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Final
+from urllib.parse import urlsplit
+
+PROJECT_ROOT: Final[Path] = Path(__file__).resolve().parents[1]
+FRONTEND_DIR: Final[Path] = PROJECT_ROOT / "frontend"
+BUILD_DIR: Final[Path] = FRONTEND_DIR / "build"
+MANIFEST_NAME: Final[str] = "manifest.json"
+
+IMMUTABLE: Final[str] = "public, max-age=31536000, immutable"
+REVALIDATE: Final[str] = "no-cache"
+NO_STORE: Final[str] = "no-store"
+
+
+def load_immutable_paths(build_dir: Path) -> frozenset[str]:
+    """Returns the URL paths of the hashed assets listed in the manifest."""
+    manifest_path = build_dir / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise SystemExit(
+            f"{manifest_path} not found. Run `make frontend-build-prod` first."
+        ) from None
+    return frozenset(f"/{asset}" for asset in manifest["assets"])
+
+
+class FrontendRequestHandler(SimpleHTTPRequestHandler):
+    immutable_paths: frozenset[str] = frozenset()
+
+    def end_headers(self) -> None:
+        path = urlsplit(self.path).path
+        if path in self.immutable_paths:
+            cache_control = IMMUTABLE
+        elif self.immutable_paths:
+            cache_control = REVALIDATE
+        else:
+            cache_control = NO_STORE
+        self.send_header("Cache-Control", cache_control)
+        super().end_headers()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the frontend pages.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5500)
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="serve frontend/build with long-lived caching from its manifest",
+    )
+    args = parser.parse_args()
+
+    if args.prod:
+        directory = BUILD_DIR
+        handler_class = type(
+            "ProductionRequestHandler",
+            (FrontendRequestHandler,),
+            {"immutable_paths": load_immutable_paths(BUILD_DIR)},
+        )
+    else:
+        directory = FRONTEND_DIR
+        handler_class = FrontendRequestHandler
+
+    handler = partial(handler_class, directory=str(directory))
+    with ThreadingHTTPServer((args.host, args.port), handler) as server:
+        print(f"Serving {directory} on http://{args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
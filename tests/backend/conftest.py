@@ -87,3 +87,16 @@ def mock_frontend_logger(monkeypatch: pytest.MonkeyPatch) -> StubFrontendLogger:
     logger = StubFrontendLogger()
     monkeypatch.setattr(logs_endpoint, "logger", logger)
     return logger
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--update-perf-budgets",
+        action="store_true",
+        help="rewrite tests/backend/perf_budgets.json from this run's measurements",
+    )
+    parser.addoption(
+        "--perf-latency",
+        action="store_true",
+        help="also hold routes to the median_ms budgets (needs a quiet machine)",
+    )
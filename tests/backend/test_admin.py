@@ -1,6 +1,13 @@
+import os
+import signal
+import sys
+from typing import Any
+
+import pytest
 from fastapi.testclient import TestClient
 
 from backend.app.api.v1.endpoints import admin as admin_endpoint
+from backend.app.core.config import PROJECT_ROOT
 
 
 def test_stop_project_endpoint_schedules_shutdown(
@@ -19,3 +26,46 @@ def test_stop_project_endpoint_schedules_shutdown(
     assert response.status_code == 200
     assert response.json()["status"] == "stopping"
     assert calls == ["shutdown"]
+
+
+def test_project_shutdown_runs_dev_down_outside_the_backend_process_group(
+    monkeypatch,
+) -> None:
+    launched: list[dict[str, Any]] = []
+
+    def fake_popen(command: list[str], **options: Any) -> None:
+        launched.append({"command": command, **options})
+
+    monkeypatch.setattr(admin_endpoint.subprocess, "Popen", fake_popen)
+
+    admin_endpoint._request_project_shutdown()
+
+    assert len(launched) == 1
+    assert launched[0]["command"][-1].endswith("dev_down.py")
+    if sys.platform != "win32":
+        assert launched[0]["start_new_session"] is True
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups are POSIX only")
+def test_dev_down_never_signals_its_own_process_group(monkeypatch) -> None:
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    try:
+        import dev_process
+    finally:
+        sys.path.remove(str(PROJECT_ROOT / "scripts"))
+    signalled: list[tuple[str, int, int]] = []
+    monkeypatch.setattr(
+        dev_process.os, "killpg", lambda pid, sig: signalled.append(("group", pid, sig))
+    )
+    monkeypatch.setattr(
+        dev_process.os, "kill", lambda pid, sig: signalled.append(("pid", pid, sig))
+    )
+
+    own_group = os.getpgrp()
+    dev_process._signal(own_group, group=True, force=False)
+    dev_process._signal(own_group + 1, group=True, force=False)
+
+    assert signalled == [
+        ("pid", own_group, signal.SIGTERM),
+        ("group", own_group + 1, signal.SIGTERM),
+    ]
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from backend.app.core.body_limits import JsonLimitExceeded, JsonStructureGuard
+from backend.app.main import create_app
+
+
+def _guard() -> JsonStructureGuard:
+    return JsonStructureGuard(field="details", max_depth=3, max_keys=4, max_bytes=64)
+
+
+def _chunked(payload: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(payload), size):
+        yield payload[start : start + size]
+
+
+def test_guard_accepts_payload_within_limits_in_small_chunks() -> None:
+    payload = json.dumps(
+        {"event": "x", "details": {"a": [1, {"b": 'q"uo}te\\'}], "c": 2}}
+    ).encode()
+    guard = _guard()
+
+    for chunk in _chunked(payload, 3):
+        guard.feed(chunk)
+
+
+@pytest.mark.parametrize(
+    ("details", "reason"),
+    [
+        ({"a": {"b": {"c": {"d": 1}}}}, "depth"),
+        ({f"k{index}": index for index in range(5)}, "keys"),
+        ({"text": "x" * 100}, "bytes"),
+    ],
+)
+def test_guard_rejects_oversized_details(details: dict[str, Any], reason: str) -> None:
+    payload = json.dumps({"event": "x", "details": details}).encode()
+    guard = _guard()
+
+    with pytest.raises(JsonLimitExceeded, match=reason):
+        for chunk in _chunked(payload, 5):
+            guard.feed(chunk)
+
+
+def test_guard_ignores_keys_outside_details() -> None:
+    payload = json.dumps({"details": {"a": 1}, "event": "details"}).encode()
+    guard = _guard()
+
+    guard.feed(payload)
+
+
+def test_rejects_declared_content_length_over_route_limit(client: TestClient) -> None:
+    response = client.post(
+        "/api/v1/echo",
+        content=b"x" * (16 * 1024 + 1),
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 413
+
+
+def test_rejects_streamed_body_as_soon_as_limit_is_crossed(
+    client: TestClient,
+) -> None:
+    received_chunks = 0
+    sent: list[Message] = []
+
+    async def receive() -> Message:
+        nonlocal received_chunks
+        received_chunks += 1
+        return {"type": "http.request", "body": b" " * 1024, "more_body": True}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/echo",
+        "raw_path": b"/api/v1/echo",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(client.app(scope, receive, send))
+
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == 413
+    assert received_chunks == 17
+
+
+def test_global_limit_applies_to_routes_without_override(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("REQUEST_BODY_MAX_BYTES", "10")
+    monkeypatch.setenv("REQUEST_BODY_ROUTE_LIMITS", "")
+    client = TestClient(create_app())
+    response = client.post("/api/v1/echo", json={"message": "hello world"})
+
+    assert response.status_code == 413
+
+
+def test_frontend_log_rejects_deeply_nested_details_without_parsing(
+    client: TestClient,
+    frontend_log_payload: dict[str, object],
+) -> None:
+    nested = "[" * 30_000 + "]" * 30_000
+    body = json.dumps(frontend_log_payload).replace('{"source": "pytest"}', nested)
+
+    tracemalloc.start()
+    try:
+        response = client.post(
+            "/api/v1/logs/frontend",
+            content=body.encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert response.status_code == 422
+    assert "depth" in response.json()["detail"]
+    assert peak < 2 * 1024 * 1024
+
+
+def test_frontend_log_rejects_details_with_too_many_keys(
+    client: TestClient,
+    frontend_log_payload: dict[str, object],
+) -> None:
+    payload = dict(frontend_log_payload)
+    payload["details"] = {f"k{index}": index for index in range(1000)}
+
+    response = client.post("/api/v1/logs/frontend", json=payload)
+
+    assert response.status_code == 422
+    assert "keys" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("key", ["detail\\u0073", "\\u0064\\u0065tails"])
+def test_frontend_log_guard_decodes_escaped_field_names(
+    client: TestClient,
+    frontend_log_payload: dict[str, object],
+    key: str,
+) -> None:
+    payload = dict(frontend_log_payload)
+    details = json.dumps({f"k{index}": index for index in range(2000)})
+    body = json.dumps(payload)[:-1] + f', "{key}": {details}}}'
+
+    response = client.post(
+        "/api/v1/logs/frontend",
+        content=body.encode(),
+        headers={"Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert "keys" in response.json()["detail"]
+
+
+def test_frontend_log_accepts_details_within_limits(
+    client: TestClient,
+    frontend_log_payload: dict[str, object],
+) -> None:
+    payload = dict(frontend_log_payload)
+    payload["details"] = {"nested": {"list": [1, 2, {"ok": True}]}}
+
+    response = client.post("/api/v1/logs/frontend", json=payload)
+
+    assert response.status_code == 200
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import pytest
+
+from backend.app.core.bulkheads import (
+    Bulkhead,
+    BulkheadRegistry,
+    BulkheadRejected,
+    _current_bulkhead,
+    run_in_bulkhead_threadpool,
+)
+from backend.app.main import create_app
+
+STREAM_PATH = "/api/v1/echo/stream"
+
+
+async def _held_body(release: asyncio.Event) -> AsyncIterator[bytes]:
+    yield b"first"
+    await release.wait()
+    yield b"second"
+
+
+async def _wait_until(condition: str, check: Callable[[], bool]) -> None:
+    for _ in range(200):
+        if check():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"{condition} never happened")
+
+
+def test_saturated_group_queues_then_rejects_without_starving_others(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("BULKHEAD_LIMITS", "echo=1:1:2000:1,core=4:4:250:1")
+    app = create_app()
+    registry: BulkheadRegistry = app.state.bulkheads
+    echo = registry.bulkheads["echo"]
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            held = asyncio.create_task(
+                client.post(STREAM_PATH, content=_held_body(release))
+            )
+            await _wait_until("first echo admitted", lambda: echo.active == 1)
+            queued = asyncio.create_task(
+                client.post("/api/v1/echo", json={"message": "queued"})
+            )
+            await _wait_until("second echo queued", lambda: echo.waiting == 1)
+
+            rejected = await client.post("/api/v1/echo", json={"message": "rejected"})
+            health = await client.get("/api/v1/health")
+            release.set()
+            assert (await held).content == b"firstsecond"
+            assert (await queued).status_code == 200
+
+            assert rejected.status_code == 503
+            assert rejected.headers["retry-after"] == "1"
+            assert rejected.json() == {"detail": "Service busy: echo is saturated"}
+            assert health.status_code == 200
+
+            stats = await client.get("/api/v1/admin/bulkheads")
+
+        groups = {entry["group"]: entry for entry in stats.json()["groups"]}
+        assert sorted(groups) == ["core", "echo"]
+        assert groups["echo"]["admitted"] == 2
+        assert groups["echo"]["queued"] == 1
+        assert groups["echo"]["rejected_full"] == 1
+        assert groups["echo"]["peak_active"] == 1
+        assert groups["echo"]["saturation_ratio"] == pytest.approx(2 / 3, abs=1e-3)
+        assert groups["echo"]["queue_ms"]["count"] == 1
+        assert groups["core"]["rejected_full"] == 0
+
+    asyncio.run(scenario())
+    assert echo.active == 0
+
+
+def test_queued_request_is_rejected_when_its_wait_times_out() -> None:
+    bulkhead = Bulkhead(
+        "slow", max_concurrent=1, max_queue=4, queue_timeout_seconds=0.02, max_threads=1
+    )
+
+    async def scenario() -> None:
+        await bulkhead.acquire()
+        with pytest.raises(BulkheadRejected) as excinfo:
+            await bulkhead.acquire()
+        assert excinfo.value.reason == "timeout"
+        assert bulkhead.waiting == 0
+
+        # A released slot goes to the oldest waiter, not to a newcomer.
+        first = asyncio.create_task(bulkhead.acquire())
+        await asyncio.sleep(0)
+        bulkhead.release()
+        assert await first >= 0
+        assert bulkhead.active == 1
+
+    asyncio.run(scenario())
+    assert bulkhead.rejected_timeout == 1
+    assert bulkhead.admitted == 2
+
+
+def test_sync_work_is_capped_by_the_group_thread_limit() -> None:
+    bulkhead = Bulkhead(
+        "math", max_concurrent=8, max_queue=0, queue_timeout_seconds=0, max_threads=2
+    )
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def blocking() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    async def scenario() -> None:
+        token = _current_bulkhead.set(bulkhead)
+        try:
+            await asyncio.gather(
+                *(run_in_bulkhead_threadpool(blocking) for _ in range(6))
+            )
+        finally:
+            _current_bulkhead.reset(token)
+
+    asyncio.run(scenario())
+    assert peak == 2
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.core.deadlines import remaining_budget_ms
+from backend.app.main import create_app
+
+SLOW_PATH = "/api/v1/test/slow"
+BUDGET_PATH = "/api/v1/test/budget"
+
+
+@pytest.fixture
+def cancelled() -> list[bool]:
+    return []
+
+
+@pytest.fixture
+def deadline_client(
+    monkeypatch: pytest.MonkeyPatch, cancelled: list[bool]
+) -> Iterator[TestClient]:
+    monkeypatch.setenv("REQUEST_DEADLINE_ROUTES", f"{SLOW_PATH}=0.05,{BUDGET_PATH}=0")
+    app: FastAPI = create_app()
+
+    async def slow() -> dict[str, str]:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return {"status": "finished"}
+
+    async def budget() -> dict[str, float | None]:
+        return {"remaining_ms": remaining_budget_ms()}
+
+    app.add_api_route(SLOW_PATH, slow)
+    app.add_api_route(BUDGET_PATH, budget)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_route_deadline_cancels_handler_and_returns_504(
+    deadline_client: TestClient,
+    cancelled: list[bool],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level(logging.DEBUG, logger="backend.http"):
+        response = deadline_client.get(SLOW_PATH)
+
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+    assert cancelled == [True]
+    assert "http.request.timeout" in caplog.text
+    assert "budget_ms=50 | budget_source=route" in caplog.text
+    assert "status_code=504" in caplog.text
+
+
+def test_client_budget_cannot_extend_route_deadline(
+    deadline_client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="backend.http"):
+        response = deadline_client.get(
+            SLOW_PATH, headers={"X-Request-Budget-Ms": "60000"}
+        )
+
+    assert response.status_code == 504
+    assert "budget_source=route" in caplog.text
+
+
+def test_client_budget_shortens_default_deadline(
+    deadline_client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="backend.http"):
+        response = deadline_client.post(
+            "/api/v1/echo", json={"message": "hi"}, headers={"X-Request-Budget-Ms": "0"}
+        )
+
+    assert response.status_code == 504
+    assert "budget_ms=0 | budget_source=client" in caplog.text
+
+
+def test_remaining_budget_is_visible_to_handlers(deadline_client: TestClient) -> None:
+    unbounded = deadline_client.get(BUDGET_PATH).json()
+    bounded = deadline_client.get(
+        BUDGET_PATH, headers={"X-Request-Budget-Ms": "1500"}
+    ).json()
+    ignored = deadline_client.get(
+        BUDGET_PATH, headers={"X-Request-Budget-Ms": "soon"}
+    ).json()
+
+    assert unbounded["remaining_ms"] is None
+    assert 0 < bounded["remaining_ms"] <= 1500
+    assert ignored["remaining_ms"] is None
+    assert remaining_budget_ms() is None
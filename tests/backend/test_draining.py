@@ -0,0 +1,141 @@
+import asyncio
+import signal
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.draining import DRAINED, DRAINING, DrainController
+from backend.app.main import create_app
+
+
+async def _held_body(release: asyncio.Event) -> AsyncIterator[bytes]:
+    yield b"first"
+    await release.wait()
+    yield b"second"
+
+
+async def _wait_for_in_flight(controller: DrainController, count: int) -> None:
+    for _ in range(200):
+        if controller.in_flight == count:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError(f"in_flight never reached {count}")
+
+
+def test_drain_waits_for_in_flight_requests_and_rejects_new_work() -> None:
+    app = create_app()
+    controller: DrainController = app.state.drain
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            held = asyncio.create_task(
+                client.post("/api/v1/echo/stream", content=_held_body(release))
+            )
+            await _wait_for_in_flight(controller, 1)
+
+            started = await client.post("/api/v1/admin/drain")
+            health = await client.get(
+                "/api/v1/health", headers={"Origin": "http://127.0.0.1:5500"}
+            )
+            progress = await client.get("/api/v1/admin/drain")
+
+            release.set()
+            echoed = await held
+            assert controller._task is not None
+            await controller._task
+
+            assert started.status_code == 202
+            assert started.json()["state"] == DRAINING
+            assert started.json()["in_flight"] == 1
+            assert health.status_code == 503
+            assert health.headers["retry-after"] == "1"
+            assert (
+                health.headers["access-control-allow-origin"] == "http://127.0.0.1:5500"
+            )
+            assert progress.json()["remaining_seconds"] > 0
+            assert echoed.content == b"firstsecond"
+
+            repeated = await client.post("/api/v1/admin/drain")
+            assert repeated.status_code == 200
+            assert repeated.json()["state"] == DRAINED
+
+    asyncio.run(scenario())
+
+    snapshot = controller.snapshot()
+    assert snapshot["completed_while_draining"] == 1
+    assert snapshot["rejected_while_draining"] == 1
+    assert snapshot["abandoned"] == 0
+
+
+def test_drain_endpoint_is_refused_outside_development(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("APP_ENV", "production")
+    app = create_app()
+
+    with TestClient(app) as client:
+        response = client.post("/api/v1/admin/drain")
+
+    assert response.status_code == 403
+    assert app.state.drain.state != DRAINING
+
+
+def test_drain_gives_up_on_requests_past_the_deadline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DRAIN_TIMEOUT_SECONDS", "0.05")
+    app = create_app()
+    controller: DrainController = app.state.drain
+    drained: list[str] = []
+    controller.on_drained = lambda: drained.append(controller.state)
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver"
+        ) as client:
+            held = asyncio.create_task(
+                client.post("/api/v1/echo/stream", content=_held_body(release))
+            )
+            await _wait_for_in_flight(controller, 1)
+            controller.begin(reason="test")
+            assert controller._task is not None
+            await controller._task
+            release.set()
+            await held
+
+    asyncio.run(scenario())
+
+    assert drained == [DRAINED]
+    assert controller.snapshot()["abandoned"] == 1
+
+
+def test_signal_starts_drain_and_hands_exit_to_callback() -> None:
+    drained: list[bool] = []
+    controller = DrainController(
+        timeout_seconds=1, on_drained=lambda: drained.append(True)
+    )
+
+    async def scenario() -> None:
+        assert controller.install_signal_handler("SIGUSR1")
+        try:
+            signal.raise_signal(signal.SIGUSR1)
+            for _ in range(100):
+                if drained:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            controller.remove_signal_handler()
+
+    asyncio.run(scenario())
+
+    assert drained == [True]
+    assert controller.reason == "SIGUSR1"
+    assert signal.getsignal(signal.SIGUSR1) is signal.SIG_DFL
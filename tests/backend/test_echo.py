@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+import logging
+import zlib
+
+import pytest
 from fastapi.testclient import TestClient
+from starlette.types import Message
 
 
 def test_echo_endpoint(client: TestClient) -> None:
@@ -12,3 +19,87 @@ def test_echo_validation(client: TestClient) -> None:
     response = client.post("/api/v1/echo", json={"message": ""})
 
     assert response.status_code == 422
+
+
+def test_echo_logs_length_instead_of_message(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.DEBUG, logger="backend.api.echo"):
+        client.post("/api/v1/echo", json={"message": "secret payload"})
+
+    assert "echo.processed | length=14" in caplog.text
+    assert "secret payload" not in caplog.text
+
+
+def test_echo_stream_returns_large_chunked_body(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    chunk = bytes(range(256)) * 256
+    chunks = [chunk] * 40  # 2.5 MiB, above the default 1 MiB body limit
+    expected = b"".join(chunks)
+
+    with caplog.at_level(logging.INFO, logger="backend.api.echo"):
+        response = client.post(
+            "/api/v1/echo/stream",
+            params={"checksum": "crc32"},
+            content=iter(chunks),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+
+    assert response.status_code == 200
+    assert response.content == expected
+    assert "content-length" not in response.headers
+    assert f"bytes={len(expected)} |" in caplog.text
+    assert f"checksum=crc32:{zlib.crc32(expected):08x}" in caplog.text
+
+
+def test_echo_stream_writes_each_chunk_before_reading_the_next(
+    client: TestClient,
+) -> None:
+    events: list[str] = []
+    remaining = 5
+
+    async def receive() -> Message:
+        nonlocal remaining
+        remaining -= 1
+        events.append("receive")
+        return {"type": "http.request", "body": b"x" * 1024, "more_body": remaining > 0}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            events.append("send")
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v1/echo/stream",
+        "raw_path": b"/api/v1/echo/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"transfer-encoding", b"chunked")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(client.app(scope, receive, send))
+
+    assert events == ["receive", "send"] * 5
+
+
+def test_echo_stream_supports_sha256_and_empty_bodies(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.INFO, logger="backend.api.echo"):
+        response = client.post("/api/v1/echo/stream?checksum=sha256", content=b"")
+
+    assert response.status_code == 200
+    assert response.content == b""
+    assert f"checksum=sha256:{hashlib.sha256(b'').hexdigest()}" in caplog.text
+
+
+def test_echo_stream_rejects_unknown_checksum(client: TestClient) -> None:
+    response = client.post("/api/v1/echo/stream?checksum=md5", content=b"data")
+
+    assert response.status_code == 422
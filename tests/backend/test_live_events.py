@@ -0,0 +1,258 @@
+import asyncio
+import json
+import signal
+import socket
+from typing import Any
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from backend.app.core.live_events import (
+    HEARTBEAT_CHUNK,
+    RETRY_CHUNK,
+    LiveBroadcaster,
+)
+from backend.app.main import create_app
+
+LIVE_PATH = "/api/v1/live"
+
+
+def _broadcaster(status: dict[str, Any] | None = None, **overrides: Any) -> Any:
+    current = status if status is not None else {"status": "ok", "failing": []}
+    options: dict[str, Any] = {
+        "status": lambda: dict(current),
+        "tick_interval_seconds": 0.01,
+        "heartbeat_seconds": 0,
+        "client_buffer": 2,
+        "slow_consumer": "disconnect",
+        "max_subscribers": 10,
+    }
+    options.update(overrides)
+    return LiveBroadcaster(**options)
+
+
+def _events(body: bytes) -> list[tuple[str, dict[str, Any]]]:
+    events = []
+    for block in body.decode().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _live_scope() -> dict[str, Any]:
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": LIVE_PATH,
+        "raw_path": LIVE_PATH.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def _wait_for_subscriber(live: LiveBroadcaster) -> None:
+    for _ in range(200):
+        if live.subscribers:
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("no subscriber")
+
+
+def test_stream_pushes_status_then_ticks_until_the_client_leaves() -> None:
+    app = create_app()
+    live: LiveBroadcaster = app.state.live
+    sent: list[Message] = []
+
+    async def scenario() -> None:
+        disconnect = asyncio.Event()
+        requested = False
+
+        async def receive() -> Message:
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        stream = asyncio.create_task(app(_live_scope(), receive, send))
+        await _wait_for_subscriber(live)
+        live.publish_time()
+        live.broadcast(HEARTBEAT_CHUNK)
+        await asyncio.sleep(0.01)
+        disconnect.set()
+        await asyncio.wait_for(stream, timeout=2)
+
+    asyncio.run(scenario())
+
+    start = sent[0]
+    assert start["status"] == 200
+    assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert body.startswith(RETRY_CHUNK)
+    assert HEARTBEAT_CHUNK in body
+    events = _events(body)
+    assert [topic for topic, _ in events] == ["status", "time"]
+    assert events[0][1]["environment"] == "development"
+    assert "utc" in events[1][1]
+    assert live.subscribers == set()
+
+
+def test_slow_consumers_are_disconnected_or_lose_old_events() -> None:
+    async def scenario() -> None:
+        strict = _broadcaster(slow_consumer="disconnect")
+        slow = strict.subscribe(["time"])
+        assert slow is not None
+        for _ in range(3):
+            strict.publish_time()
+        assert slow.close_reason == "slow"
+        assert strict.subscribers == set()
+        assert strict.slow_disconnects == 1
+
+        lenient = _broadcaster(slow_consumer="drop")
+        lagging = lenient.subscribe(["time"])
+        assert lagging is not None
+        for _ in range(5):
+            lenient.publish_time()
+        assert lenient.chunks_dropped == 3
+        chunk = await lagging.next_chunk()
+        assert chunk is not None
+        # Only the two newest ticks are left.
+        assert len(_events(chunk)) == 2
+        assert chunk.startswith(b"id: 4\n")
+
+    asyncio.run(scenario())
+
+
+def test_writer_stuck_on_a_stalled_client_is_cut_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LIVE_CLIENT_BUFFER", "2")
+    app = create_app()
+    live: LiveBroadcaster = app.state.live
+
+    async def scenario() -> None:
+        stalled = asyncio.Event()
+        sends = 0
+
+        async def receive() -> Message:
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        async def send(message: Message) -> None:
+            # The client stops reading after the headers and first event.
+            nonlocal sends
+            sends += 1
+            if sends > 2:
+                stalled.set()
+                await asyncio.Event().wait()
+
+        stream = asyncio.create_task(app(_live_scope(), receive, send))
+        await _wait_for_subscriber(live)
+        await asyncio.wait_for(stalled.wait(), 1)
+        for _ in range(3):
+            live.publish_time()
+        await asyncio.wait_for(stream, timeout=1)
+
+    asyncio.run(scenario())
+    assert live.slow_disconnects == 1
+    assert live.subscribers == set()
+
+
+def test_drain_ends_open_streams_after_a_final_status_event() -> None:
+    status = {"status": "ok", "failing": []}
+    broadcaster = _broadcaster(status, client_buffer=8)
+
+    async def scenario() -> None:
+        subscriber = broadcaster.subscribe(["status"])
+        assert subscriber is not None
+        producer = asyncio.create_task(broadcaster.run())
+        status["status"] = "draining"
+        chunks = []
+        while (chunk := await asyncio.wait_for(subscriber.next_chunk(), 1)) is not None:
+            chunks.append(chunk)
+        producer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await producer
+
+        statuses = [data["status"] for _, data in _events(b"".join(chunks))]
+        assert statuses == ["ok", "draining"]
+        assert subscriber.close_reason == "draining"
+        assert broadcaster.subscribe(["status"]) is None
+
+    asyncio.run(scenario())
+
+
+def test_subscribers_beyond_the_limit_get_503(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LIVE_MAX_SUBSCRIBERS", "0")
+    client = TestClient(create_app())
+
+    response = client.get(LIVE_PATH)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert client.get(LIVE_PATH, params={"topics": "weather"}).status_code == 422
+    assert client.get("/api/v1/admin/live").json()["rejected"] == 1
+
+
+def test_shutdown_signal_ends_open_streams_so_the_server_can_stop() -> None:
+    app = create_app()
+    received: list[int] = []
+    # uvicorn re-raises the signal once it has stopped; keep it from
+    # interrupting the test run.
+    previous = signal.signal(signal.SIGINT, lambda signum, _: received.append(signum))
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, log_config=None, timeout_graceful_shutdown=None)
+    )
+
+    async def scenario() -> bytes:
+        serving = asyncio.create_task(server.serve(sockets=[listener]))
+        while not server.started:
+            await asyncio.sleep(0.01)
+        body = b""
+
+        async def read_until_closed() -> None:
+            nonlocal body
+            url = f"http://127.0.0.1:{port}{LIVE_PATH}"
+            async with httpx.AsyncClient() as client:
+                async with client.stream("GET", url) as response:
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if b"event: status" in body:
+                            signal.raise_signal(signal.SIGINT)
+
+        try:
+            await asyncio.wait_for(read_until_closed(), timeout=5)
+            await asyncio.wait_for(serving, timeout=5)
+        finally:
+            server.force_exit = True
+            await serving
+        return body
+
+    try:
+        body = asyncio.run(scenario())
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        listener.close()
+
+    assert [topic for topic, _ in _events(body)][0] == "status"
+    assert received == [signal.SIGINT]
+    assert app.state.live.subscribers == set()
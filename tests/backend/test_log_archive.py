@@ -0,0 +1,185 @@
+from pathlib import Path
+
+import pytest
+
+from backend.app.core import log_archive
+from backend.app.core.log_archive import (
+    ArchiveError,
+    Condition,
+    LogArchive,
+    LogQuery,
+    QueryStats,
+    compact_log,
+    parse_time,
+    run_query,
+)
+
+PREFIX = "service=backend | version=0.1.0 | environment=test"
+
+
+def _line(clock: str, level: str, message: str) -> str:
+    return (
+        f"2026-10-12 {clock} | {level} | backend.http | req-1 | {PREFIX} | {message}\n"
+    )
+
+
+def _completed(clock: str, path: str, status: int, duration: float) -> str:
+    level = "ERROR" if status >= 500 else "INFO"
+    return _line(
+        clock,
+        level,
+        f"http.request.completed | method=GET | path={path} | "
+        f"status_code={status} | duration_ms={duration}",
+    )
+
+
+def _compact(tmp_path: Path, lines: list[str]) -> Path:
+    source = tmp_path / "backend-2026-10-12.log"
+    source.write_text("".join(lines), encoding="utf-8")
+    archive = tmp_path / "archive" / "backend-2026-10-12.ftla"
+    summary = compact_log(source, archive)
+    assert summary.rows == sum(1 for line in lines if line.startswith("2026"))
+    return archive
+
+
+def test_compaction_keeps_messages_and_continuation_lines(tmp_path: Path) -> None:
+    archive_path = _compact(
+        tmp_path,
+        [
+            _completed("09:00:00", "/api/v1/health", 200, 1.5),
+            _line("09:00:01", "ERROR", "app.failed | reason=boom"),
+            "Traceback (most recent call last):\n",
+            '  File "main.py", line 1\n',
+        ],
+    )
+
+    with LogArchive(archive_path) as archive:
+        block = archive.blocks[0]
+        messages = archive.column(block, "message")
+        timestamps = archive.column(block, "ts")
+
+    assert archive.rows == 2
+    assert messages[1] == (
+        "app.failed | reason=boom\nTraceback (most recent call last):\n"
+        '  File "main.py", line 1'
+    )
+    assert timestamps == [
+        parse_time("2026-10-12T09:00:00"),
+        parse_time("2026-10-12T09:00:01"),
+    ]
+    assert archive.dictionaries["event"] == ["http.request.completed", "app.failed"]
+
+
+def test_status_codes_outside_the_http_range_are_not_stored(tmp_path: Path) -> None:
+    archive_path = _compact(
+        tmp_path,
+        [
+            _completed("09:00:00", "/api/v1/health", 200, 1.5),
+            _line(
+                "09:00:01",
+                "INFO",
+                "frontend.log.event | message=oops | status_code=70000",
+            ),
+            _line("09:00:02", "INFO", "frontend.log.event | status_code=099"),
+        ],
+    )
+
+    with LogArchive(archive_path) as archive:
+        statuses = archive.column(archive.blocks[0], "status")
+
+    assert list(statuses) == [200, log_archive.NO_STATUS, log_archive.NO_STATUS]
+
+
+def test_group_by_with_filters_and_duration_metrics(tmp_path: Path) -> None:
+    archive = _compact(
+        tmp_path,
+        [
+            _completed("09:00:00", "/api/v1/health", 200, 1.0),
+            _completed("09:10:00", "/api/v1/health", 200, 3.0),
+            _completed("09:20:00", "/api/v1/echo", 500, 10.0),
+            _completed("10:05:00", "/api/v1/echo", 503, 20.0),
+            _completed("10:06:00", "/api/v1/echo", 200, 2.0),
+            _line("10:07:00", "DEBUG", "http.request.started | method=GET | path=/x"),
+        ],
+    )
+
+    errors = run_query(
+        [archive],
+        LogQuery(
+            group_by=("path", "hour"),
+            where=(Condition.parse("status>=500"),),
+        ),
+    )
+    latency = run_query(
+        [archive],
+        LogQuery(
+            group_by=("path",),
+            metrics=("count", "avg", "max", "p50"),
+            where=(Condition.parse("event=http.request.completed"),),
+        ),
+    )
+    not_ok = run_query(
+        [archive],
+        LogQuery(where=(Condition.parse("status!=200"),)),
+    )
+
+    assert sorted(errors, key=lambda row: row["hour"]) == [
+        {"path": "/api/v1/echo", "hour": "2026-10-12T09:00", "count": 1},
+        {"path": "/api/v1/echo", "hour": "2026-10-12T10:00", "count": 1},
+    ]
+    assert latency == [
+        {"path": "/api/v1/echo", "count": 3, "avg": 10.667, "max": 20.0, "p50": 10.0},
+        {"path": "/api/v1/health", "count": 2, "avg": 2.0, "max": 3.0, "p50": 1.0},
+    ]
+    # Rows without a status never match status conditions.
+    assert not_ok == [{"count": 2}]
+
+
+def test_time_range_and_predicates_skip_blocks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(log_archive, "BLOCK_ROWS", 2)
+    archive = _compact(
+        tmp_path,
+        [
+            _completed("08:00:00", "/a", 200, 1.0),
+            _completed("08:30:00", "/a", 200, 1.0),
+            _completed("12:00:00", "/b", 200, 1.0),
+            _completed("12:30:00", "/b", 500, 1.0),
+            _completed("18:00:00", "/a", 200, 1.0),
+        ],
+    )
+
+    stats = QueryStats()
+    rows = run_query(
+        [archive],
+        LogQuery(
+            group_by=("path",),
+            since=parse_time("2026-10-12T12:00"),
+            until=parse_time("2026-10-12T12:15"),
+        ),
+        stats,
+    )
+    assert rows == [{"path": "/b", "count": 1}]
+    assert (stats.blocks_total, stats.blocks_scanned) == (3, 1)
+
+    stats = QueryStats()
+    rows = run_query([archive], LogQuery(where=(Condition.parse("path=/b"),)), stats)
+    assert rows == [{"count": 2}]
+    assert stats.blocks_scanned == 1
+
+
+@pytest.mark.parametrize(
+    ("make_query", "message"),
+    [
+        (lambda: Condition.parse("level>=ERROR"), "supports only"),
+        (lambda: Condition.parse("status>=abc"), "integer"),
+        (lambda: Condition.parse("client_ip=1"), "unknown column"),
+        (lambda: LogQuery(group_by=("route",)), "unknown group-by"),
+        (lambda: LogQuery(metrics=("p42",)), "unknown metrics"),
+        (lambda: parse_time("yesterday"), "invalid time"),
+    ],
+)
+def test_invalid_queries_are_rejected(make_query: object, message: str) -> None:
+    with pytest.raises(ArchiveError, match=message):
+        make_query()  # type: ignore[operator]
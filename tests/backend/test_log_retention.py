@@ -0,0 +1,131 @@
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core import log_retention
+from backend.app.core.log_retention import LogRetentionManager
+from backend.app.main import create_app
+
+
+def _day(offset: int, today: date | None = None) -> str:
+    return ((today or date.today()) + timedelta(days=offset)).isoformat()
+
+
+def _write_log(log_dir: Path, day: str, size: int) -> Path:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    path = log_dir / f"backend-{day}.log"
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def _manager(
+    log_dir: Path, retention_days: int = 30, max_bytes: int = 0
+) -> LogRetentionManager:
+    return LogRetentionManager(
+        log_dir=log_dir,
+        prefix="backend",
+        retention_days=retention_days,
+        max_total_bytes=max_bytes,
+        use_utc=False,
+    )
+
+
+def test_deletes_files_older_than_retention_and_records_manifest(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    old = _write_log(tmp_path, _day(-40), 10)
+    recent = _write_log(tmp_path, _day(-2), 20)
+    active = _write_log(tmp_path, _day(0), 5)
+    _write_log(tmp_path, "notes", 1)
+
+    with caplog.at_level(logging.INFO, logger="backend.log_retention"):
+        report = _manager(tmp_path).run_once()
+
+    assert not old.exists()
+    assert recent.exists() and active.exists()
+    assert report.deleted == [(old.name, 10, "age")]
+    assert report.total_bytes == 25
+    assert f"log.retention.deleted | file={old.name} | bytes=10 | reason=age" in (
+        caplog.text
+    )
+    manifest = json.loads((tmp_path / ".backend-retention.json").read_text())
+    assert manifest["files"] == {_day(-2): 20}
+
+
+def test_quota_removes_oldest_closed_files_first(tmp_path: Path) -> None:
+    for offset in (-3, -2, -1):
+        _write_log(tmp_path, _day(offset), 100)
+    _write_log(tmp_path, _day(0), 50)
+
+    report = _manager(tmp_path, max_bytes=260).run_once()
+
+    assert [name for name, _, _ in report.deleted] == [f"backend-{_day(-3)}.log"]
+    assert report.total_bytes == 250
+    assert {path.name for path in tmp_path.glob("backend-*.log")} == {
+        f"backend-{_day(offset)}.log" for offset in (-2, -1, 0)
+    }
+
+
+def test_later_passes_use_manifest_instead_of_listing_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    today = date.today()
+    _write_log(tmp_path, _day(-1, today), 100)
+    _manager(tmp_path).run_once()
+
+    def no_listing(path: object) -> None:
+        raise AssertionError("directory listed")
+
+    monkeypatch.setattr(log_retention.os, "scandir", no_listing)
+    _write_log(tmp_path, _day(0, today), 70)
+
+    class NextDay(datetime):
+        @classmethod
+        def now(cls, tz: object = None) -> datetime:
+            return datetime.combine(today + timedelta(days=1), datetime.min.time())
+
+    monkeypatch.setattr(log_retention, "datetime", NextDay)
+    report = _manager(tmp_path, max_bytes=100).run_once()
+
+    assert [name for name, _, _ in report.deleted] == [f"backend-{_day(-1, today)}.log"]
+    assert report.total_bytes == 70
+
+
+def test_discard_drops_the_manifest_entry_seen_by_other_managers(
+    tmp_path: Path,
+) -> None:
+    archived = _write_log(tmp_path, _day(-2), 100)
+    _write_log(tmp_path, _day(-1), 100)
+    _write_log(tmp_path, _day(0), 50)
+    server = _manager(tmp_path, max_bytes=260)
+    server.run_once()
+
+    _manager(tmp_path).discard(archived)
+    report = server.run_once()
+
+    assert not archived.exists()
+    manifest = json.loads((tmp_path / ".backend-retention.json").read_text())
+    assert manifest["files"] == {_day(-1): 100}
+    assert report.deleted == []
+    assert report.total_bytes == 150
+
+
+def test_app_lifespan_runs_retention_in_background(
+    isolated_runtime: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stale = _write_log(isolated_runtime, _day(-400), 10)
+    monkeypatch.setenv("LOG_USE_UTC", "false")
+
+    with TestClient(create_app()) as client:
+        deadline = time.monotonic() + 2
+        while stale.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        retention = client.app.state.log_retention  # type: ignore[attr-defined]
+
+    assert not stale.exists()
+    assert retention.passes >= 1
@@ -0,0 +1,178 @@
+import logging
+import re
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core import log_writer as log_writer_module
+from backend.app.core.log_writer import DailyLogSink, LogWriterServer, SocketLogHandler
+from backend.app.main import create_app
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Iterator[str]:
+    # AF_UNIX paths are limited to ~100 bytes, so keep the name short.
+    path = tmp_path / "w.sock"
+    yield str(path)
+
+
+@pytest.fixture
+def log_writer(socket_path: str, tmp_path: Path) -> Iterator[Path]:
+    log_dir = tmp_path / "central"
+    server = LogWriterServer(
+        socket_path=socket_path,
+        sink=DailyLogSink(log_dir, "backend", retention_days=30, use_utc=True),
+        poll_interval=0.05,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield log_dir
+    server.stop()
+    thread.join(timeout=2)
+
+
+def _today_file(log_dir: Path) -> Path:
+    return log_dir / f"backend-{datetime.now().strftime('%Y-%m-%d')}.log"
+
+
+def _wait_for_lines(path: Path, count: int) -> list[str]:
+    deadline = time.monotonic() + 2
+    lines: list[str] = []
+    while time.monotonic() < deadline:
+        if path.exists():
+            lines = path.read_text(encoding="utf-8").splitlines()
+            if len(lines) >= count:
+                break
+        time.sleep(0.02)
+    return lines
+
+
+def _make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test.log_writer.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_records_are_written_in_order_by_writer_process(
+    log_writer: Path, socket_path: str
+) -> None:
+    handler = SocketLogHandler(socket_path)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _make_logger(handler)
+
+    for index in range(200):
+        logger.info("event.%s", index)
+    handler.close()
+
+    lines = _wait_for_lines(_today_file(log_writer), 200)
+    assert lines == [f"event.{index}" for index in range(200)]
+
+
+def test_records_are_dropped_and_counted_when_writer_is_unavailable(
+    socket_path: str,
+) -> None:
+    handler = SocketLogHandler(socket_path, queue_size=4)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _make_logger(handler)
+
+    started = time.perf_counter()
+    for index in range(50):
+        logger.info("event.%s", index)
+    elapsed = time.perf_counter() - started
+    handler.close()
+
+    assert elapsed < 0.5
+    assert handler.dropped_total > 0
+
+
+def test_drop_notice_is_delivered_once_writer_recovers(
+    socket_path: str, tmp_path: Path
+) -> None:
+    handler = SocketLogHandler(socket_path, queue_size=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _make_logger(handler)
+    logger.info("lost")
+    handler.flush()
+
+    server = LogWriterServer(
+        socket_path=socket_path,
+        sink=DailyLogSink(tmp_path / "late", "backend", 30, True),
+        poll_interval=0.05,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        lines = _wait_for_lines(_today_file(tmp_path / "late"), 1)
+    finally:
+        handler.close()
+        server.stop()
+        thread.join(timeout=2)
+
+    assert any("log.writer.records_dropped" in line for line in lines)
+
+
+def test_drop_notices_add_up_to_every_dropped_and_lost_record(
+    socket_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # One record per datagram, so a lost record and the notice travel apart.
+    monkeypatch.setattr(log_writer_module, "MAX_DATAGRAM_BYTES", 64)
+    handler = SocketLogHandler(socket_path, queue_size=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = _make_logger(handler)
+    sending = threading.Event()
+    release = threading.Event()
+    delivered: list[bytes] = []
+
+    def send_datagram(datagram: bytes) -> bool:
+        sending.set()
+        release.wait(2)
+        if datagram.startswith(b"event.1"):
+            return False
+        delivered.append(datagram)
+        return True
+
+    handler._send_datagram = send_datagram  # type: ignore[method-assign]
+    padding = "x" * 40
+    logger.info("event.0%s", padding)
+    assert sending.wait(2)
+    # The sender is busy with event.0: two records fit, two are dropped.
+    for index in range(1, 5):
+        logger.info("event.%s%s", index, padding)
+    release.set()
+
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        with handler._condition:
+            if not (handler._queue or handler._in_flight or handler._pending_drops):
+                break
+        time.sleep(0.02)
+    handler.close()
+
+    notices = [
+        int(match.group(1))
+        for datagram in delivered
+        if (match := re.search(rb"records_dropped \| count=(\d+)", datagram))
+    ]
+    assert notices == [2, 1]
+    assert sum(notices) == handler.dropped_total == 3
+    assert not any(datagram.startswith(b"event.1") for datagram in delivered)
+
+
+def test_app_routes_file_logging_through_writer_in_socket_mode(
+    log_writer: Path, socket_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LOG_WRITER_MODE", "socket")
+    monkeypatch.setenv("LOG_WRITER_SOCKET_PATH", socket_path)
+    with TestClient(create_app()) as client:
+        client.get("/api/v1/health")
+    logging.getLogger().handlers[-1].flush()
+
+    lines = _wait_for_lines(_today_file(log_writer), 3)
+    assert any("http.request.completed" in line for line in lines)
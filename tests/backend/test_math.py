@@ -1,8 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
 from fastapi.testclient import TestClient
 
+from backend.app.core import expressions
+from backend.app.main import create_app
+
 
 def test_math_add_endpoint(client: TestClient) -> None:
     response = client.get("/api/v1/math/add", params={"a": 2, "b": 3.5})
 
     assert response.status_code == 200
     assert response.json() == {"a": 2.0, "b": 3.5, "result": 5.5}
+
+
+def test_math_eval_scalar_expression(client: TestClient) -> None:
+    response = client.post(
+        "/api/v1/math/eval",
+        json={"expression": "a * 2 + sqrt(b)", "variables": {"a": 3, "b": 16}},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "expression": "a * 2 + sqrt(b)",
+        "result": 10.0,
+        "size": 1,
+        "cached": False,
+    }
+
+
+def test_math_eval_broadcasts_scalars_over_arrays_and_caches_plan(
+    client: TestClient,
+) -> None:
+    body = {"expression": "x * k + 1", "variables": {"x": [1, 2, 3], "k": 10}}
+
+    first = client.post("/api/v1/math/eval", json=body)
+    second = client.post("/api/v1/math/eval", json=body)
+
+    assert first.json()["result"] == [11.0, 21.0, 31.0]
+    assert first.json()["cached"] is False
+    assert second.json()["cached"] is True
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os').system('true')",
+        "x.__class__",
+        "open('/etc/passwd')",
+        "[x for x in y]",
+        "lambda: 1",
+        "x if y else 1",
+    ],
+)
+def test_math_eval_rejects_unsafe_syntax(client: TestClient, expression: str) -> None:
+    response = client.post(
+        "/api/v1/math/eval",
+        json={"expression": expression, "variables": {"x": 1, "y": 1}},
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    ("expression", "variables"),
+    [
+        ("1 / x", {"x": 0}),
+        ("sqrt(x)", {"x": -1}),
+        ("9 ** 9 ** 9", {}),
+        ("x + y", {"x": [1, 2], "y": [1, 2, 3]}),
+        ("x + missing", {"x": 1}),
+    ],
+)
+def test_math_eval_reports_evaluation_errors(
+    client: TestClient, expression: str, variables: dict[str, object]
+) -> None:
+    response = client.post(
+        "/api/v1/math/eval", json={"expression": expression, "variables": variables}
+    )
+
+    assert response.status_code == 422
+
+
+def test_expression_cache_is_sized_per_app_from_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MATH_EVAL_CACHE_SIZE", "3")
+
+    app = create_app()
+
+    assert app.state.expression_cache.maxsize == 3
+    assert create_app().state.expression_cache is not app.state.expression_cache
+
+
+def test_math_eval_enforces_size_and_cpu_limits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("MATH_EVAL_MAX_ELEMENTS", "10")
+    monkeypatch.setenv("MATH_EVAL_CPU_BUDGET_MS", "5")
+    ticks = iter(range(0, 1000, 1))
+    monkeypatch.setattr(
+        expressions, "time", SimpleNamespace(thread_time=lambda: next(ticks))
+    )
+    client = TestClient(create_app())
+
+    too_large = client.post(
+        "/api/v1/math/eval",
+        json={"expression": "x + 1", "variables": {"x": list(range(11))}},
+    )
+    too_slow = client.post(
+        "/api/v1/math/eval",
+        json={"expression": "x + 1", "variables": {"x": list(range(5))}},
+    )
+
+    assert too_large.status_code == 413
+    assert too_slow.status_code == 422
+    assert "CPU" in too_slow.json()["detail"]
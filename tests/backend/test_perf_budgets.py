@@ -0,0 +1,269 @@
+"""Allocation, log-volume and latency budgets for the hot request paths.
+
+Each case is driven in-process through the ASGI app from `create_app`, with
+no HTTP client in between, and compared with `perf_budgets.json`. After an
+intentional change, rewrite the budgets with `make perf-budgets` (that is,
+`pytest tests/backend/test_perf_budgets.py --update-perf-budgets`) and
+commit the diff together with the change.
+
+Wall-clock medians of a couple of milliseconds swing too much on shared CI
+runners to fail a build on, so `median_ms` is only enforced with
+`--perf-latency` (`make perf-latency`). Allocation and log-volume budgets
+are always checked.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import statistics
+import time
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from starlette.types import ASGIApp, Message
+
+from backend.app.main import create_app
+
+BUDGETS_PATH = Path(__file__).with_name("perf_budgets.json")
+WARMUP_REQUESTS = 20
+MEASURED_REQUESTS = 200
+# Headroom applied when budgets are written, so normal noise and slower CI
+# machines pass while real regressions (an extra copy, a new log line in a
+# loop, a blocking call) do not.
+ALLOC_HEADROOM = 1.5
+ALLOC_SLACK_KB = 4.0
+LATENCY_HEADROOM = 4.0
+LATENCY_FLOOR_MS = 2.0
+LATENCY_METRICS = frozenset({"median_ms"})
+
+
+@dataclass(frozen=True)
+class Case:
+    method: str
+    path: str
+    query: str = ""
+    body: bytes = b""
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+@dataclass(frozen=True)
+class Measurement:
+    alloc_kb: float
+    log_records: int
+    median_ms: float
+
+
+CASES = (
+    Case("GET", "/livez"),
+    Case("GET", "/api/v1/health"),
+    Case("GET", "/api/v1/time"),
+    Case("GET", "/api/v1/math/add", query="a=3&b=4"),
+    Case(
+        "POST",
+        "/api/v1/math/eval",
+        body=b'{"expression": "a * 2 + sqrt(b)", "variables": {"a": 3, "b": 16}}',
+    ),
+    Case("POST", "/api/v1/echo", body=b'{"message": "perf budget"}'),
+    Case(
+        "POST",
+        "/api/v1/logs/frontend",
+        body=json.dumps(
+            {
+                "level": "info",
+                "event": "frontend.perf.event",
+                "message": "perf budget",
+                "page_path": "/pages/health.html",
+                "details": {"source": "pytest"},
+                "browser_timestamp": "2026-02-07T12:00:00.000Z",
+                "user_agent": "pytest-agent",
+            }
+        ).encode(),
+    ),
+    Case("GET", "/api/v1/admin/request-stats"),
+)
+
+
+class _RecordCounter(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records += 1
+
+
+@dataclass
+class _Exchange:
+    status: int = 0
+
+
+async def _request(app: ASGIApp, case: Case) -> int:
+    exchange = _Exchange()
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": case.body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            exchange.status = message["status"]
+
+    headers = [(b"host", b"testserver")]
+    if case.body:
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(case.body)).encode()),
+        ]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": case.method,
+        "scheme": "http",
+        "path": case.path,
+        "raw_path": case.path.encode(),
+        "root_path": "",
+        "query_string": case.query.encode(),
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    return exchange.status
+
+
+async def _measure(app: ASGIApp, case: Case) -> Measurement:
+    for _ in range(WARMUP_REQUESTS):
+        assert await _request(app, case) == 200
+
+    # Latency first, without tracemalloc slowing every allocation down.
+    durations: list[float] = []
+    for _ in range(MEASURED_REQUESTS):
+        started = time.perf_counter()
+        await _request(app, case)
+        durations.append((time.perf_counter() - started) * 1000)
+
+    counter = _RecordCounter()
+    root = logging.getLogger()
+    root.addHandler(counter)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    peaks: list[int] = []
+    try:
+        for _ in range(MEASURED_REQUESTS):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await _request(app, case)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        root.removeHandler(counter)
+
+    return Measurement(
+        alloc_kb=round(statistics.median(peaks) / 1024, 2),
+        log_records=round(counter.records / MEASURED_REQUESTS),
+        median_ms=round(statistics.median(durations), 3),
+    )
+
+
+def _budget_for(measured: Measurement) -> dict[str, Any]:
+    return {
+        "alloc_kb": math.ceil(measured.alloc_kb * ALLOC_HEADROOM + ALLOC_SLACK_KB),
+        "log_records": measured.log_records,
+        "median_ms": round(
+            max(measured.median_ms * LATENCY_HEADROOM, LATENCY_FLOOR_MS), 1
+        ),
+    }
+
+
+def _load_budgets() -> dict[str, dict[str, Any]]:
+    if not BUDGETS_PATH.exists():
+        return {}
+    budgets: dict[str, dict[str, Any]] = json.loads(BUDGETS_PATH.read_text())
+    return budgets
+
+
+def _store_budget(name: str, measured: Measurement) -> None:
+    budgets = _load_budgets()
+    budgets[name] = _budget_for(measured)
+    BUDGETS_PATH.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+
+
+def _report(
+    name: str,
+    budget: dict[str, Any],
+    measured: Measurement,
+    skipped: frozenset[str] = frozenset(),
+) -> list[str]:
+    lines = [f"{'metric':<12}{'budget':>10}{'measured':>12}{'change':>10}"]
+    exceeded = []
+    for metric, value in asdict(measured).items():
+        if metric in skipped:
+            continue
+        limit = budget.get(metric)
+        if limit is None:
+            lines.append(f"{metric:<12}{'-':>10}{value:>12}{'':>10}  missing")
+            exceeded.append(metric)
+            continue
+        change = f"{(value - limit) / limit:+.0%}" if limit else ""
+        over = value > limit
+        lines.append(
+            f"{metric:<12}{limit:>10}{value:>12}{change:>10}"
+            + ("  <-- over budget" if over else "")
+        )
+        if over:
+            exceeded.append(metric)
+    if not exceeded:
+        return []
+    return [
+        f"{name} exceeded its budget ({', '.join(exceeded)}):",
+        *lines,
+        "If the change is intended, run `make perf-budgets` and commit "
+        f"{BUDGETS_PATH.name}.",
+    ]
+
+
+@pytest.fixture
+def perf_app(monkeypatch: pytest.MonkeyPatch) -> Iterator[ASGIApp]:
+    # No per-request sampling overhead in the numbers.
+    monkeypatch.setenv("REQUEST_METRICS_SAMPLE_RATE", "0")
+    yield create_app()
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+def test_route_stays_within_perf_budget(
+    case: Case, perf_app: ASGIApp, request: pytest.FixtureRequest
+) -> None:
+    measured = asyncio.run(_measure(perf_app, case))
+
+    if request.config.getoption("--update-perf-budgets"):
+        _store_budget(case.name, measured)
+        return
+
+    budget = _load_budgets().get(case.name)
+    if budget is None:
+        pytest.fail(
+            f"{case.name} has no budget in {BUDGETS_PATH.name}; "
+            "run `make perf-budgets`.",
+            pytrace=False,
+        )
+    skipped = (
+        frozenset() if request.config.getoption("--perf-latency") else LATENCY_METRICS
+    )
+    failures = _report(case.name, budget, measured, skipped)
+    if failures:
+        pytest.fail("\n".join(failures), pytrace=False)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.probes import ReadinessMonitor
+from backend.app.main import create_app
+
+
+def test_livez_is_served_without_logging_or_routing(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.DEBUG):
+        response = client.get("/livez")
+
+    assert response.status_code == 200
+    assert response.content == b'{"status":"ok"}'
+    assert response.headers["cache-control"] == "no-store"
+    assert "x-request-id" not in response.headers
+    assert [r for r in caplog.records if r.name.startswith("backend")] == []
+
+
+def test_readyz_reports_cached_checks_without_running_them(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setenv("READINESS_INTERVAL_SECONDS", "60")
+    calls = 0
+
+    def counted() -> tuple[bool, str]:
+        nonlocal calls
+        calls += 1
+        return True, "ok"
+
+    with TestClient(create_app()) as client:
+        app_state = client.app.state  # type: ignore[attr-defined]
+        monitor: ReadinessMonitor = app_state.readiness
+        monitor.register("counted", counted, blocking=False)
+        with caplog.at_level(logging.DEBUG):
+            responses = [client.get("/readyz") for _ in range(20)]
+
+    assert {response.status_code for response in responses} == {200}
+    payload = responses[0].json()
+    assert payload["status"] == "ready"
+    assert set(payload["checks"]) == {
+        "event_loop_lag",
+        "log_dir_writable",
+        "disk_quota",
+        "drain",
+    }
+    assert payload["checks"]["log_dir_writable"]["ok"] is True
+    assert calls == 0
+    assert [r for r in caplog.records if r.name.startswith("backend")] == []
+
+
+def test_failing_check_and_drain_make_readyz_unavailable(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    monitor: ReadinessMonitor = client.app.state.readiness  # type: ignore[attr-defined]
+    monitor.register("log_dir_writable", lambda: (False, "error=read-only"))
+
+    with caplog.at_level(logging.INFO, logger="backend.probes"):
+        asyncio.run(monitor.run_once())
+    failing = client.get("/readyz")
+
+    assert failing.status_code == 503
+    assert failing.json()["checks"]["log_dir_writable"] == {
+        "ok": False,
+        "detail": "error=read-only",
+        "duration_ms": failing.json()["checks"]["log_dir_writable"]["duration_ms"],
+    }
+    assert "readiness.changed | ready=false | failing=log_dir_writable" in caplog.text
+
+    monitor.register("log_dir_writable", lambda: (True, "writable"))
+    asyncio.run(monitor.run_once())
+    assert client.get("/readyz").status_code == 200
+
+    client.post("/api/v1/admin/drain")
+    draining = client.get("/readyz")
+    assert draining.status_code == 503
+    assert draining.json()["status"] == "draining"
+    assert client.get("/livez").status_code == 200
+
+
+def test_loop_lag_over_limit_fails_readiness() -> None:
+    monitor = ReadinessMonitor(interval_seconds=1, max_loop_lag_ms=50)
+    monitor.loop_lag_ms = 120.0
+
+    assert asyncio.run(monitor.run_once()) is False
+    assert monitor.results["event_loop_lag"].detail == "lag_ms=120.0"
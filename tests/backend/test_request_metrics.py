@@ -0,0 +1,108 @@
+import logging
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.request_metrics import (
+    OVERFLOW_ROUTE,
+    RequestMetrics,
+    ResourceSample,
+)
+from backend.app.main import create_app
+
+
+@pytest.fixture
+def sampled_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setenv("REQUEST_METRICS_SAMPLE_RATE", "1")
+    return TestClient(create_app())
+
+
+def test_completion_event_includes_resource_fields(
+    sampled_client: TestClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level(logging.DEBUG):
+        response = sampled_client.post("/api/v1/echo", json={"message": "hello"})
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-Id"]
+    completed = [
+        record.getMessage()
+        for record in caplog.records
+        if record.getMessage().startswith("http.request.completed")
+    ]
+    assert len(completed) == 1
+    message = completed[0]
+    assert "cpu_ms=" in message
+    assert "wait_ms=" in message
+    assert "bytes_in=19" in message
+    assert f"bytes_out={len(response.content)}" in message
+    assert "log_records=3" in message
+
+
+def test_request_stats_are_aggregated_per_route(sampled_client: TestClient) -> None:
+    sampled_client.get("/api/v1/math/add", params={"a": 1, "b": 2})
+    sampled_client.get("/api/v1/math/add", params={"a": 3, "b": 4})
+
+    response = sampled_client.get("/api/v1/admin/request-stats")
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["sample_rate"] == 1.0
+    routes = {entry["route"]: entry for entry in payload["routes"]}
+    assert routes["GET /api/v1/math/add"]["count"] == 2
+    assert routes["GET /api/v1/math/add"]["avg_log_records"] == 3.0
+
+
+def test_request_stats_empty_when_sampling_disabled(client: TestClient) -> None:
+    client.get("/api/v1/health")
+
+    response = client.get("/api/v1/admin/request-stats")
+
+    assert response.status_code == 200
+    assert response.json() == {"sample_rate": 0.0, "routes": []}
+
+
+def test_unmatched_paths_share_one_key_and_routes_are_capped(
+    sampled_client: TestClient,
+) -> None:
+    for index in range(3):
+        sampled_client.get(f"/api/v1/missing/{index}")
+
+    routes = {
+        entry["route"]: entry
+        for entry in sampled_client.get("/api/v1/admin/request-stats").json()["routes"]
+    }
+    assert routes["GET <unmatched>"]["count"] == 3
+    assert not any("/missing/" in route for route in routes)
+
+    metrics = RequestMetrics(sample_rate=1, trace_allocations=False, max_routes=2)
+    sample = ResourceSample(0.0, 0.0, 0, 0, None, 0)
+    for route in ("GET /a", "GET /b", "GET /c", "GET /d", "GET /a"):
+        metrics.record(route, 200, 1.0, sample)
+    counts = {entry["route"]: entry["count"] for entry in metrics.snapshot()}
+    assert counts == {"GET /a": 2, "GET /b": 1, OVERFLOW_ROUTE: 2}
+
+
+def test_only_one_request_at_a_time_measures_the_allocation_peak() -> None:
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        metrics = RequestMetrics(sample_rate=1, trace_allocations=True)
+        first = metrics.start()
+        overlapping = metrics.start()
+        assert first is not None and overlapping is not None
+        assert first.traces_allocations
+        assert not overlapping.traces_allocations
+        assert overlapping.finish().alloc_peak_kb is None
+        metrics.release(overlapping)
+
+        assert first.finish().alloc_peak_kb is not None
+        metrics.release(first)
+        after = metrics.start()
+        assert after is not None and after.traces_allocations
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
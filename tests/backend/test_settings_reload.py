@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import signal
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core import config
+from backend.app.core.config import Settings, get_settings
+from backend.app.core.settings_provider import SettingsProvider
+from backend.app.main import create_app
+
+RELOAD_PATH = "/api/v1/admin/settings/reload"
+
+
+@pytest.fixture
+def env_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    # A private ownership record, so the project's own .env stays untouched.
+    monkeypatch.setattr(config, "_env_file_values", {})
+    for key in ("LOG_LEVEL", "CORS_ORIGINS", "APP_ENV", "LOG_RETENTION_DAYS"):
+        monkeypatch.setenv(key, "")
+        monkeypatch.delenv(key)
+    return tmp_path / "runtime.env"
+
+
+def test_reload_swaps_snapshot_and_notifies_interested_subscribers(
+    env_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env_file.write_text(
+        "LOG_LEVEL=INFO\nCORS_ORIGINS=http://a.test\nAPP_ENV=production\n"
+        "REQUEST_BODY_MAX_BYTES=2048\n"
+    )
+    monkeypatch.setenv("APP_ENV", "staging")
+    monkeypatch.delenv("REQUEST_BODY_MAX_BYTES", raising=False)
+    provider = SettingsProvider(get_settings(), env_file=env_file)
+    provider.mark_reloadable(("log_level",))
+    original = provider.current
+    calls: list[tuple[str, str]] = []
+
+    def on_cors(previous: Settings, current: Settings) -> None:
+        calls.append(("cors", ",".join(current.cors_origins)))
+
+    def on_math(previous: Settings, current: Settings) -> None:
+        calls.append(("math", str(current.math_eval_cache_size)))
+
+    provider.subscribe(on_cors, fields=("cors_origins",))
+    provider.subscribe(on_math, fields=("math_eval_cache_size",))
+    result = provider.reload("test")
+
+    assert set(result.changed) == {"log_level", "cors_origins"}
+    assert result.requires_restart == ("request_body_max_bytes",)
+    assert provider.current.request_body_max_bytes == 1048576
+    assert result.version == provider.version == 2
+    assert provider.current is get_settings()
+    assert provider.current.log_level == "INFO"
+    assert provider.current.app_env == "staging"  # the process environment wins
+    assert original.log_level == "DEBUG"  # old snapshots never change
+    assert calls == [("cors", "http://a.test")]
+
+    env_file.write_text("CORS_ORIGINS=http://a.test\n")
+    assert provider.reload("test").changed == ("log_level",)
+    assert get_settings().log_level == "DEBUG"
+
+    env_file.write_text("LOG_RETENTION_DAYS=soon\n")
+    with pytest.raises(ValueError):
+        provider.reload("test")
+    assert provider.version == 3
+    assert get_settings() is provider.current
+    # A rejected file leaves the environment as the last good load left it.
+    assert "LOG_RETENTION_DAYS" not in os.environ
+    assert os.environ["CORS_ORIGINS"] == "http://a.test"
+
+
+def test_admin_reload_reapplies_logging_cors_and_retention_in_place(
+    isolated_runtime: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    with TestClient(create_app()) as client:
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        monkeypatch.setenv("LOG_LEVEL", "warning")
+        monkeypatch.setenv("CORS_ORIGINS", "http://new.test")
+        monkeypatch.setenv("LOG_RETENTION_DAYS", "7")
+        monkeypatch.setenv("LOG_FILE_PATH", str(tmp_path / "moved" / "backend.log"))
+        monkeypatch.setenv("REQUEST_BODY_MAX_BYTES", "2048")
+
+        response = client.post(RELOAD_PATH)
+        logging.getLogger("backend.app").warning("settings.test.after_reload")
+        cors = client.get(
+            "/api/v1/health", headers={"Origin": "http://new.test"}
+        ).headers.get("access-control-allow-origin")
+        retention = client.app.state.log_retention  # type: ignore[attr-defined]
+
+        assert response.status_code == 200
+        assert set(response.json()["changed"]) == {
+            "log_level",
+            "cors_origins",
+            "log_retention_days",
+            "log_file_path",
+        }
+        assert response.json()["requires_restart"] == ["request_body_max_bytes"]
+        assert root.level == logging.WARNING
+        assert root.handlers == handlers
+        assert cors == "http://new.test"
+        assert retention.retention_days == 7
+
+        assert client.post(RELOAD_PATH).json()["changed"] == []
+
+    moved = list((tmp_path / "moved").glob("backend-*.log"))
+    assert len(moved) == 1
+    assert "settings.test.after_reload" in moved[0].read_text(encoding="utf-8")
+
+
+def test_admin_reload_rejects_invalid_values_and_keeps_snapshot(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("REQUEST_BODY_MAX_BYTES", "lots")
+
+    response = client.post(RELOAD_PATH)
+
+    assert response.status_code == 422
+    assert client.app.state.settings.version == 1  # type: ignore[attr-defined]
+    assert get_settings().request_body_max_bytes == 1048576
+
+
+def test_admin_reload_is_refused_outside_development(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("APP_ENV", "production")
+
+    with TestClient(create_app()) as client:
+        monkeypatch.setenv("LOG_LEVEL", "WARNING")
+        response = client.post(RELOAD_PATH)
+
+        assert response.status_code == 403
+        assert client.app.state.settings.version == 1  # type: ignore[attr-defined]
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="POSIX signal")
+def test_sighup_and_file_changes_trigger_reloads(
+    env_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env_file.write_text("LOG_LEVEL=DEBUG\n")
+    provider = SettingsProvider(get_settings(), env_file=env_file)
+    provider.mark_reloadable(("app_env", "log_level"))
+
+    async def scenario() -> None:
+        assert provider.install_signal_handler("SIGHUP")
+        watcher = asyncio.create_task(provider.watch(0.01))
+        try:
+            monkeypatch.setenv("APP_ENV", "signalled")
+            signal.raise_signal(signal.SIGHUP)
+            await asyncio.sleep(0.05)
+            assert provider.current.app_env == "signalled"
+            assert provider.last_reload is not None
+            assert provider.last_reload.reason == "signal"
+
+            env_file.write_text("LOG_LEVEL=ERROR\n# changed\n")
+            await asyncio.sleep(0.1)
+            assert provider.current.log_level == "ERROR"
+            assert provider.last_reload.reason == "file"
+        finally:
+            watcher.cancel()
+            provider.remove_signal_handler()
+
+    asyncio.run(scenario())
@@ -0,0 +1,121 @@
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.histograms import LatencyHistogram
+from backend.app.main import create_app
+
+TELEMETRY_PATH = "/api/v1/telemetry/frontend"
+
+
+def _batch(**overrides: Any) -> dict[str, Any]:
+    batch: dict[str, Any] = {
+        "page_path": "/pages/health.html",
+        "navigation": {"ttfb": 12.5, "dom_content_loaded": 180.0, "load": 240.0},
+        "resources": [["script", 8.0], ["css", 3.5], ["beacon", 1.0]],
+        "api": [
+            ["GET", "/api/v1/health", 200, 14.0],
+            ["GET", "/api/v1/health", 503, 9.0],
+        ],
+    }
+    batch.update(overrides)
+    return batch
+
+
+def _post(client: TestClient, batch: dict[str, Any]) -> Any:
+    # Sent like the browser does: JSON in a text/plain body, no preflight.
+    return client.post(
+        TELEMETRY_PATH,
+        content=json.dumps(batch),
+        headers={"Content-Type": "text/plain;charset=UTF-8"},
+    )
+
+
+def test_batches_are_aggregated_per_page_and_endpoint(client: TestClient) -> None:
+    response = _post(client, _batch())
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "accepted", "recorded": 8}
+
+    summary = client.get(TELEMETRY_PATH).json()
+    assert summary["batches"] == 1
+    [page] = summary["pages"]
+    assert page["page"] == "/pages/health.html"
+    assert sorted(page["metrics"]) == [
+        "dom_content_loaded",
+        "load",
+        "resource.css",
+        "resource.other",
+        "resource.script",
+        "ttfb",
+    ]
+    assert page["metrics"]["ttfb"]["count"] == 1
+    [endpoint] = summary["endpoints"]
+    assert endpoint["endpoint"] == "GET /api/v1/health"
+    assert endpoint["errors"] == 1
+    assert endpoint["client"]["count"] == 2
+    assert endpoint["client"]["max_ms"] == 14.0
+    assert endpoint["server"] is None
+
+
+def test_invalid_batches_are_rejected(client: TestClient) -> None:
+    negative = _batch(api=[["GET", "/api/v1/health", 200, -1]])
+    assert _post(client, negative).status_code == 422
+    assert _post(client, _batch(unknown=True)).status_code == 422
+    response = client.post(
+        TELEMETRY_PATH, content=b"not json", headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 422
+    assert client.get(TELEMETRY_PATH).json()["batches"] == 0
+
+
+def test_key_count_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLIENT_TELEMETRY_MAX_PAGES", "1")
+    monkeypatch.setenv("CLIENT_TELEMETRY_MAX_ENDPOINTS", "2")
+    client = TestClient(create_app())
+
+    for index in range(5):
+        _post(
+            client,
+            _batch(
+                page_path=f"/pages/{index}.html",
+                api=[["GET", f"/api/v1/route-{index}", 200, 10.0]],
+            ),
+        )
+
+    summary = client.get(TELEMETRY_PATH).json()
+    assert [page["page"] for page in summary["pages"]] == ["(other)", "/pages/0.html"]
+    endpoints = {entry["endpoint"]: entry for entry in summary["endpoints"]}
+    assert sorted(endpoints) == [
+        "(other)",
+        "GET /api/v1/route-0",
+        "GET /api/v1/route-1",
+    ]
+    assert endpoints["(other)"]["client"]["count"] == 3
+
+
+def test_server_side_latency_is_shown_next_to_client(client: TestClient) -> None:
+    # Resource sampling is off by default; latency is still recorded.
+    client.get("/api/v1/health")
+
+    _post(client, _batch(api=[["GET", "/api/v1/health", 200, 30.0]]))
+
+    [endpoint] = client.get(TELEMETRY_PATH).json()["endpoints"]
+    assert endpoint["server"]["count"] == 1
+    assert endpoint["server"]["p95_ms"] is not None
+    assert client.get("/api/v1/admin/request-stats").json()["routes"] == []
+
+
+def test_histogram_percentiles_stay_within_one_bucket() -> None:
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.add(float(value))
+
+    p50 = histogram.percentile(0.5)
+    p95 = histogram.percentile(0.95)
+    assert p50 is not None and 500 <= p50 <= 500 * 1.19
+    assert p95 is not None and 950 <= p95 <= 950 * 1.19
+    assert histogram.percentile(1.0) == 1000.0
+    assert LatencyHistogram().percentile(0.95) is None
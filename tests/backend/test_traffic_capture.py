@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.traffic_capture import (
+    REDACTED,
+    CapturedRequest,
+    decode_record,
+    encode_record,
+    read_captures,
+    response_digest,
+)
+from backend.app.main import create_app
+
+
+def test_record_round_trips_through_binary_encoding() -> None:
+    record = CapturedRequest(
+        arrival=1_700_000_000.25,
+        duration_ms=1.5,
+        status=201,
+        method="POST",
+        path="/api/v1/echo",
+        query="a=1&b=2",
+        headers=(("content-type", "application/json"),),
+        body=b'{"message":"hi"}',
+        response_digest=response_digest(b"ok"),
+        response_body=b"ok",
+    )
+
+    encoded = encode_record(record)
+
+    assert decode_record(encoded[4:]) == record
+
+
+def test_capture_mode_records_redacted_requests_and_responses(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("TRAFFIC_CAPTURE_PATH", str(tmp_path / "traffic.ftcap"))
+    monkeypatch.setenv("TRAFFIC_CAPTURE_REDACT_FIELDS", "message,echoed")
+
+    with TestClient(create_app()) as client:
+        client.get(
+            "/api/v1/math/add",
+            params={"a": 1, "b": 2},
+            headers={"Authorization": "Bearer secret"},
+        )
+        echo = client.post("/api/v1/echo", json={"message": "private"})
+
+    records = read_captures(tmp_path.glob("traffic-*.ftcap"))
+
+    assert [record.path for record in records] == ["/api/v1/math/add", "/api/v1/echo"]
+    math_record, echo_record = records
+    assert math_record.query == "a=1&b=2"
+    assert math_record.status == 200
+    assert dict(math_record.headers)["authorization"] == REDACTED
+    assert json.loads(echo_record.body) == {"message": REDACTED}
+    assert json.loads(echo_record.response_body) == {"echoed": REDACTED, "length": 7}
+    assert echo_record.response_digest == response_digest(echo.content)
+    assert math_record.arrival <= echo_record.arrival
+
+
+def test_capture_is_disabled_by_default(client: TestClient, tmp_path: Path) -> None:
+    client.get("/api/v1/health")
+
+    assert client.app.state.traffic_capture is None  # type: ignore[attr-defined]
+    assert not list(tmp_path.rglob("*.ftcap"))
+
+
+def test_query_form_and_uninspectable_bodies_are_redacted(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("TRAFFIC_CAPTURE_PATH", str(tmp_path / "traffic.ftcap"))
+    monkeypatch.setenv("TRAFFIC_CAPTURE_REDACT_FIELDS", "token,message")
+    monkeypatch.setenv("TRAFFIC_CAPTURE_MAX_BODY_BYTES", "32")
+
+    with TestClient(create_app()) as client:
+        client.get("/api/v1/health", params={"token": "secret", "page": "2"})
+        client.post(
+            "/api/v1/echo",
+            content=b"token=secret&page=2",
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        client.post("/api/v1/echo", json={"message": "x" * 64})
+        client.post(
+            "/api/v1/echo",
+            content=b'{"message": "secret"',
+            headers={"Content-Type": "application/json"},
+        )
+
+    query, form, truncated, unparseable = read_captures(
+        tmp_path.glob("traffic-*.ftcap")
+    )
+
+    assert query.query == "token=[REDACTED]&page=2"
+    assert form.body == b"token=[REDACTED]&page=2"
+    assert truncated.body == REDACTED.encode()
+    assert unparseable.body == REDACTED.encode()
+    assert truncated.response_body == REDACTED.encode()
+    assert b"secret" not in b"".join(
+        record.query.encode() + record.body + record.response_body
+        for record in (query, form, truncated, unparseable)
+    )
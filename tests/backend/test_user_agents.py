@@ -0,0 +1,99 @@
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core.user_agents import (
+    UserAgentInfo,
+    UserAgentParser,
+    parse_user_agent,
+)
+
+CHROME_WINDOWS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+@pytest.mark.parametrize(
+    ("user_agent", "expected"),
+    [
+        (CHROME_WINDOWS, UserAgentInfo("Chrome", "124", "Windows 10", "desktop")),
+        (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36 Edg/124.0.2478.51",
+            UserAgentInfo("Edge", "124", "Windows 10", "desktop"),
+        ),
+        (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+            "(KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+            UserAgentInfo("Safari", "17", "macOS 10", "desktop"),
+        ),
+        (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Mobile/15E148 "
+            "Safari/604.1",
+            UserAgentInfo("Safari", "17", "iOS 17", "mobile"),
+        ),
+        (
+            "Mozilla/5.0 (Linux; Android 14; SM-X710) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) SamsungBrowser/24.0 Chrome/117.0.0.0 Safari/537.36",
+            UserAgentInfo("Samsung Internet", "24", "Android 14", "tablet"),
+        ),
+        (
+            "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
+            UserAgentInfo("Firefox", "125", "Linux", "desktop"),
+        ),
+        (
+            "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+            UserAgentInfo("unknown", "", "unknown", "bot"),
+        ),
+        ("pytest-agent", UserAgentInfo("unknown", "", "unknown", "unknown")),
+        ("", UserAgentInfo("unknown", "", "unknown", "unknown")),
+    ],
+)
+def test_user_agents_are_classified(user_agent: str, expected: UserAgentInfo) -> None:
+    assert parse_user_agent(user_agent) == expected
+
+
+def test_parser_cache_is_bounded_and_reports_hit_rate() -> None:
+    parser = UserAgentParser(maxsize=2)
+    for user_agent in (CHROME_WINDOWS, CHROME_WINDOWS, "a", "b", CHROME_WINDOWS):
+        parser.parse(user_agent)
+
+    assert parser.snapshot() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 1,
+        "misses": 4,
+        "hit_rate": 0.2,
+    }
+
+
+def test_frontend_events_are_enriched_and_cache_stats_exposed(
+    client: TestClient,
+    frontend_log_payload: dict[str, Any],
+    mock_frontend_logger: Any,
+) -> None:
+    payload = {**frontend_log_payload, "user_agent": CHROME_WINDOWS}
+    for _ in range(3):
+        assert client.post("/api/v1/logs/frontend", json=payload).status_code == 200
+    without_agent = {**frontend_log_payload, "user_agent": None}
+    client.post(
+        "/api/v1/logs/frontend",
+        json=without_agent,
+        headers={"User-Agent": "curl/8.5.0"},
+    )
+
+    events = [
+        call
+        for call in mock_frontend_logger.calls
+        if call["event"].startswith("frontend.log.event")
+    ]
+    assert events[0]["args"][-4:] == ("Chrome", "124", "Windows 10", "desktop")
+    assert events[-1]["args"][-4:] == ("HTTP client", "8", "unknown", "bot")
+
+    stats = client.get("/api/v1/admin/user-agent-cache").json()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5